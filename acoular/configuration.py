@@ -13,7 +13,7 @@
 """
 
 from os import path, mkdir
-from traits.api import Trait, Bool, Str, Property, HasStrictTraits
+from traits.api import Trait, Bool, Str, Int, Property, HasStrictTraits
 
 class Config(HasStrictTraits):
     """
@@ -54,6 +54,17 @@ class Config(HasStrictTraits):
     h5library = Property()
     
     _h5library = Trait('pytables','h5py')
+
+    #: Defines how cache files are stored, defaults to 'hdf5'.
+    #:
+    #: * 'hdf5': one compressed .h5 file per cache file, written with :attr:`h5library`.
+    #:   Cache files must not be written by more than one process at a time.
+    #: * 'directory': one directory per cache file, containing an uncompressed 
+    #:   .npy file per array. Several processes can use the same cache at once, 
+    #:   e.g. to calculate different frequencies of a beamformer result.
+    cache_backend = Property()
+
+    _cache_backend = Trait('hdf5','directory')
     
     #: Defines the path to the directory containing Acoulars cache files.
     #: If the specified :attr:`cache_dir` directory does not exist,
@@ -74,6 +85,23 @@ class Config(HasStrictTraits):
     use_traitsui = Property()
     
     _use_traitsui = Bool(False)
+
+    #: Maximum amount of memory in bytes that is used to keep transfer 
+    #: matrices and steering vectors in memory for reuse, 
+    #: see :class:`~acoular.fbeamform.SteeringVector`. 
+    #: Least recently used data is discarded first. Setting this to 0 
+    #: disables the in-memory cache. Defaults to 256 MiB.
+    steer_cache_size = Property()
+
+    _steer_cache_size = Int(2**28)
+
+    #: Maximum total size in bytes of the cache files in :attr:`cache_dir`.
+    #: If the cache grows larger, the least recently used cache files that 
+    #: are not open are deleted, see :meth:`~acoular.h5cache.H5cache_class.enforce_cache_size`.
+    #: Defaults to 0 (no limit).
+    cache_size_limit = Property()
+
+    _cache_size_limit = Int(0)
     
     
     def _get_global_caching(self):
@@ -82,6 +110,24 @@ class Config(HasStrictTraits):
     def _set_global_caching(self,globalCachingValue):
         self._global_caching = globalCachingValue
         
+    def _get_steer_cache_size(self):
+        return self._steer_cache_size
+
+    def _set_steer_cache_size(self, size):
+        self._steer_cache_size = max(0, size)
+
+    def _get_cache_size_limit(self):
+        return self._cache_size_limit
+
+    def _set_cache_size_limit(self, size):
+        self._cache_size_limit = max(0, size)
+
+    def _get_cache_backend(self):
+        return self._cache_backend
+
+    def _set_cache_backend(self, backend):
+        self._cache_backend = backend
+
     def _get_h5library(self):
         return self._h5library
     
@@ -143,12 +189,25 @@ by :attr:`h5library`:
   * 'pytables': Use 'tables' (or 'pytables', depending on python distribution).
   * 'h5py': Use 'h5py'.
 
+The way cache files are stored can be specified by :attr:`cache_backend`:
+  * 'hdf5': compressed .h5 files, only one process at a time may write to them.
+  * 'directory': a directory of uncompressed arrays per cache file that 
+    several processes can read and write at the same time.
+
 Some Acoular classes support GUI elements for usage with tools from the TraitsUI package.
 If desired, this package has to be installed manually, as it is not a prerequisite for
 installing Acoular.
 To enable the functionality, the flag attribute :attr:`use_traitsui` has to be set to True (default: False).
 Note: this is independent from the GUI tools implemented in the spectAcoular package.
 
+Transfer matrices and steering vectors are kept in memory for reuse. The 
+amount of memory used for this can be limited by :attr:`steer_cache_size` 
+(in bytes, default: 256 MiB, 0 disables the in-memory cache).
+
+The total size of the cache files can be limited by :attr:`cache_size_limit`
+(in bytes, default: 0, no limit). Least recently used cache files are deleted
+first.
+
 
 Example: 
     For using Acoular with h5py package and overwrite existing cache:
@@ -58,6 +58,16 @@ def beamformerFreq(steerVecType, boolRemovedDiagOfCSM, normFactor, inputTupleSte
     """ Conventional beamformer in frequency domain. Use either a predefined
     steering vector formulation (see Sarradj 2012) or pass your own
     steering vector.
+    
+    The beamformer is either evaluated for a single frequency or for a whole 
+    batch of frequencies in one call. In the latter case, all frequency 
+    dependent inputs carry an additional leading dimension of size nFreqs 
+    and the calculation is parallelized over both frequencies and gridpoints.
+    
+    If the csm (or the eigenvectors) are passed in single precision 
+    (complex64), the calculation is done by single precision kernels and the 
+    results are float32. Custom steering vectors and eigenvalues are then 
+    converted to single precision as well.
 
     Parameters
     ----------
@@ -76,30 +86,31 @@ def beamformerFreq(steerVecType, boolRemovedDiagOfCSM, normFactor, inputTupleSte
                     Distance of all gridpoints to the center of sensor array
                 distGridToAllMics : float64[nGridpoints, nMics]
                     Distance of all gridpoints to all sensors of array
-                waveNumber : float64
+                waveNumber : float64 (or float64[nFreqs] for a batch)
                     The wave number
         steerVecType == 'custom' :
             inputTupleSteer = steeringVector    , with
-                steeringVector : complex128[nGridPoints, nMics]
+                steeringVector : complex128/complex64[nGridPoints, nMics] (or complex128/complex64[nFreqs, nGridPoints, nMics])
                     The steering vector of each gridpoint for the same frequency as the CSM
     inputTupleCsm : contains the data of measurement as a tuple. There are 2 cases:
         perform standard CSM-beamformer:
             inputTupleCsm = csm
-                csm : complex128[ nMics, nMics]
-                    The cross spectral matrix for one frequency
+                csm : complex128/complex64[ nMics, nMics] (or complex128/complex64[nFreqs, nMics, nMics])
+                    The cross spectral matrix for one frequency (or for a batch of frequencies)
         perform beamformer on eigenvalue decomposition of csm:
             inputTupleCsm = (eigValues, eigVectors)    , with
-                eigValues : float64[nEV]
+                eigValues : float64/float32[nEV] (or float64/float32[nFreqs, nEV])
                     nEV is the number of eigenvalues which should be taken into account. 
                     All passed eigenvalues will be evaluated.
-                eigVectors : complex128[nMics, nEV]
+                eigVectors : complex128/complex64[nMics, nEV] (or complex128/complex64[nFreqs, nMics, nEV])
                     Eigen vectors corresponding to eigValues. All passed eigenvector slices will be evaluated.
 
     Returns
     -------
-    *Autopower spectrum beamforming map [nGridPoints] 
+    *Autopower spectrum beamforming map [nGridPoints] (or [nFreqs, nGridPoints] for a batch),
+    float32 for single precision input, else float64
          
-    *steer normalization factor [nGridPoints]... contains the values the autopower needs to be multiplied with, in order to 
+    *steer normalization factor [nGridPoints] (or [nFreqs, nGridPoints])... contains the values the autopower needs to be multiplied with, in order to 
     fullfill 'steer^H * steer = 1' as needed for functional beamforming. 
     
     Some Notes on the optimization of all subroutines
@@ -159,49 +170,64 @@ def beamformerFreq(steerVecType, boolRemovedDiagOfCSM, normFactor, inputTupleSte
                       (True, 'custom', True) : _freqBeamformer_EigValProb_SpecificSteerVec_CsmRemovedDiag}
     coreFunc = beamformerDict[(boolIsEigValProb, steerVecType, boolRemovedDiagOfCSM)]
 
-   
-    # prepare Input
-    if steerVecType == 'custom':  # beamformer with custom steering vector
-        steerVec = inputTupleSteer
-        #nFreqs, nGridPoints = steerVec.shape[0], steerVec.shape[1]
-        nGridPoints = steerVec.shape[0]
-    else:  # predefined beamformers (Formulation I - IV)
-        distGridToArrayCenter, distGridToAllMics, waveNumber = inputTupleSteer#[0], inputTupleSteer[1], inputTupleSteer[2]
-        if not isinstance(waveNumber, np.ndarray): waveNumber = np.array([waveNumber])
-        #nFreqs, nGridPoints = waveNumber.shape[0], distGridToAllMics.shape[0]
-        nGridPoints = distGridToAllMics.shape[0]
+
+    # prepare Input: all inputs are brought to the batched form with a leading 
+    # frequency dimension, a single frequency is handled as a batch of size 1
     if boolIsEigValProb:
         eigVal, eigVec = inputTupleCsm#[0], inputTupleCsm[1]
+        boolIsSingle = eigVec.dtype == np.complex64
+        if boolIsSingle:
+            eigVal = np.asarray(eigVal, dtype=np.float32)
+        boolIsBatch = eigVal.ndim == 2
+        if not boolIsBatch:
+            eigVal, eigVec = eigVal[np.newaxis], eigVec[np.newaxis]
+        nFreqs = eigVal.shape[0]
     else:
         csm = inputTupleCsm
+        boolIsSingle = csm.dtype == np.complex64
+        boolIsBatch = csm.ndim == 3
+        if not boolIsBatch:
+            csm = csm[np.newaxis]
+        nFreqs = csm.shape[0]
+    if steerVecType == 'custom':  # beamformer with custom steering vector
+        steerVec = np.asarray(inputTupleSteer, dtype=np.complex64 if boolIsSingle else np.complex128)
+        if not boolIsBatch:
+            steerVec = steerVec[np.newaxis]
+        nGridPoints = steerVec.shape[1]
+    else:  # predefined beamformers (Formulation I - IV)
+        distGridToArrayCenter, distGridToAllMics, waveNumber = inputTupleSteer#[0], inputTupleSteer[1], inputTupleSteer[2]
+        waveNumber = np.array(waveNumber, dtype=np.float64).reshape((nFreqs, 1))
+        nGridPoints = distGridToAllMics.shape[0]
     
-    # beamformer routine: parallelized over Gridpoints
-    beamformOutput = np.zeros(nGridPoints, np.float64)
-    steerNormalizeOutput = np.zeros_like(beamformOutput)
-    result = np.zeros(nGridPoints, np.float64)
+    # beamformer routine: parallelized over frequencies and gridpoints, the 
+    # frequency axis of the csm data is broadcasted against the gridpoints
+    result = np.zeros((nFreqs, nGridPoints), np.float32 if boolIsSingle else np.float64)
     normalHelp = np.zeros_like(result)
     if steerVecType == 'custom':  # beamformer with custom steering vector
         if boolIsEigValProb:
-            coreFunc(eigVal, eigVec, steerVec, normFactor, result, normalHelp)
+            coreFunc(eigVal[:, np.newaxis], eigVec[:, np.newaxis], steerVec, normFactor, result, normalHelp)
         else:
-            coreFunc(csm, steerVec, normFactor, result, normalHelp)
+            coreFunc(csm[:, np.newaxis], steerVec, normFactor, result, normalHelp)
     else:  # predefined beamformers (Formulation I - IV)
         if boolIsEigValProb:
-            coreFunc(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, normFactor, result, normalHelp)
+            coreFunc(eigVal[:, np.newaxis], eigVec[:, np.newaxis], distGridToArrayCenter, distGridToAllMics, waveNumber, normFactor, result, normalHelp)
         else:
-            coreFunc(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, normFactor, result, normalHelp)
+            coreFunc(csm[:, np.newaxis], distGridToArrayCenter, distGridToAllMics, waveNumber, normFactor, result, normalHelp)
+    if not boolIsBatch:
+        result, normalHelp = result[0], normalHelp[0]
     beamformOutput = result
     steerNormalizeOutput = normalHelp 
     return beamformOutput, steerNormalizeOutput 
 
 
 #%% beamformers - steer * CSM * steer
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation1AkaClassic_FullCSM(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     for cntMics in range(nMics):
@@ -221,12 +247,13 @@ def _freqBeamformer_Formulation1AkaClassic_FullCSM(csm, distGridToArrayCenter, d
     result[0] = scalarProd / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation1AkaClassic_CsmRemovedDiag(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     for cntMics in range(nMics):
@@ -245,12 +272,13 @@ def _freqBeamformer_Formulation1AkaClassic_CsmRemovedDiag(csm, distGridToArrayCe
     result[0] = scalarProd / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation2AkaInverse_FullCSM(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -273,12 +301,13 @@ def _freqBeamformer_Formulation2AkaInverse_FullCSM(csm, distGridToArrayCenter, d
     result[0] = scalarProd / normalizeFactorSquared * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation2AkaInverse_CsmRemovedDiag(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -300,12 +329,13 @@ def _freqBeamformer_Formulation2AkaInverse_CsmRemovedDiag(csm, distGridToArrayCe
     result[0] = scalarProd / normalizeFactorSquared * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation3AkaTrueLevel_FullCSM(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -327,12 +357,13 @@ def _freqBeamformer_Formulation3AkaTrueLevel_FullCSM(csm, distGridToArrayCenter,
     result[0] = scalarProd / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation3AkaTrueLevel_CsmRemovedDiag(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -353,12 +384,13 @@ def _freqBeamformer_Formulation3AkaTrueLevel_CsmRemovedDiag(csm, distGridToArray
     result[0] = scalarProd / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation4AkaTrueLocation_FullCSM(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -380,12 +412,13 @@ def _freqBeamformer_Formulation4AkaTrueLocation_FullCSM(csm, distGridToArrayCent
     result[0] = scalarProd / normalizeFactor * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(m,m),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_Formulation4AkaTrueLocation_CsmRemovedDiag(csm, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = csm.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), csm.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -406,7 +439,8 @@ def _freqBeamformer_Formulation4AkaTrueLocation_CsmRemovedDiag(csm, distGridToAr
     result[0] = scalarProd / normalizeFactor * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:])], 
+@nb.guvectorize([(nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.complex64[:], nb.float64[:], nb.float32[:], nb.float32[:])], 
                 '(m,m),(m),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_SpecificSteerVec_FullCSM(csm, steerVec, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
@@ -426,7 +460,8 @@ def _freqBeamformer_SpecificSteerVec_FullCSM(csm, steerVec, signalLossNormalizat
     result[0] = scalarProd * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:])], 
+@nb.guvectorize([(nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.complex64[:,:], nb.complex64[:], nb.float64[:], nb.float32[:], nb.float32[:])], 
                 '(m,m),(m),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_SpecificSteerVec_CsmRemovedDiag(csm, steerVec, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
@@ -447,12 +482,13 @@ def _freqBeamformer_SpecificSteerVec_CsmRemovedDiag(csm, steerVec, signalLossNor
 
 #%% beamformers - Eigenvalue Problem
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation1AkaClassic_FullCSM(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     for cntMics in range(nMics):
@@ -472,12 +508,13 @@ def _freqBeamformer_EigValProb_Formulation1AkaClassic_FullCSM(eigVal, eigVec, di
     result[0] = scalarProdFullCSM / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation1AkaClassic_CsmRemovedDiag(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     for cntMics in range(nMics):
@@ -500,12 +537,13 @@ def _freqBeamformer_EigValProb_Formulation1AkaClassic_CsmRemovedDiag(eigVal, eig
     result[0] = scalarProdReducedCSM / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation2AkaInverse_FullCSM(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -528,12 +566,13 @@ def _freqBeamformer_EigValProb_Formulation2AkaInverse_FullCSM(eigVal, eigVec, di
     result[0] = scalarProdFullCSM / normalizeFactorSquared * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation2AkaInverse_CsmRemovedDiag(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -559,12 +598,13 @@ def _freqBeamformer_EigValProb_Formulation2AkaInverse_CsmRemovedDiag(eigVal, eig
     result[0] = scalarProdReducedCSM / normalizeFactorSquared * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation3AkaTrueLevel_FullCSM(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -586,12 +626,13 @@ def _freqBeamformer_EigValProb_Formulation3AkaTrueLevel_FullCSM(eigVal, eigVec,
     result[0] = scalarProdFullCSM / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation3AkaTrueLevel_CsmRemovedDiag(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -616,12 +657,13 @@ def _freqBeamformer_EigValProb_Formulation3AkaTrueLevel_CsmRemovedDiag(eigVal, e
     result[0] = scalarProdReducedCSM / (normalizeFactor * normalizeFactor) * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation4AkaTrueLocation_FullCSM(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -643,12 +685,13 @@ def _freqBeamformer_EigValProb_Formulation4AkaTrueLocation_FullCSM(eigVal, eigVe
     result[0] = scalarProdFullCSM / normalizeFactor * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(),(m),(),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_Formulation4AkaTrueLocation_CsmRemovedDiag(eigVal, eigVec, distGridToArrayCenter, distGridToAllMics, waveNumber, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
     nMics = distGridToAllMics.shape[0]
-    steerVec = np.zeros((nMics), np.complex128)
+    steerVec = np.zeros((nMics), eigVec.dtype)
 
     # building steering vector: in order to save some operation -> some normalization steps are applied after mat-vec-multipl.
     helpNormalize = 0.0
@@ -673,7 +716,8 @@ def _freqBeamformer_EigValProb_Formulation4AkaTrueLocation_CsmRemovedDiag(eigVal
     result[0] = scalarProdReducedCSM / normalizeFactor * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.complex64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(m),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_SpecificSteerVec_FullCSM(eigVal, eigVec, steerVec, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
@@ -696,7 +740,8 @@ def _freqBeamformer_EigValProb_SpecificSteerVec_FullCSM(eigVal, eigVec, steerVec
     result[0] = scalarProdFullCSM * signalLossNormalization[0]
 
 
-@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:])],
+@nb.guvectorize([(nb.float64[:], nb.complex128[:,:], nb.complex128[:], nb.float64[:], nb.float64[:], nb.float64[:]),
+                 (nb.float32[:], nb.complex64[:,:], nb.complex64[:], nb.float64[:], nb.float32[:], nb.float32[:])],
                  '(e),(m,e),(m),()->(),()', nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _freqBeamformer_EigValProb_SpecificSteerVec_CsmRemovedDiag(eigVal, eigVec, steerVec, signalLossNormalization, result, normalizeSteer):
     # see bottom of information header of 'beamformerFreq' for information on which steps are taken, in order to gain speed improvements.
@@ -928,8 +973,320 @@ def damasSolverGaussSeidel(A, dirtyMap, nIterations, relax, damasSolution):
                 damasSolution[cntGrid] = 0.0
 
 
+#%% Damas - Block Gauss Seidel
+@nb.njit(cache=cachedOption, parallel=True, fastmath=fastOption)
+def damasSolverBlockGaussSeidel(A, dirtyMap, nIterations, relax, tolerance, damasSolution, blockSize=64):
+    """ Solves the DAMAS inverse problem via modified gauss seidel, with the 
+    work of each sweep distributed over all cores.
+    The gridpoints are processed in contiguous blocks. For all gridpoints of 
+    a block, the contributions of the gridpoints outside of the block are 
+    summed up in parallel, using the values already updated in the current 
+    sweep for the preceding blocks. Then the gridpoints of the block are 
+    updated one after another. The result is that of 
+    :func:`damasSolverGaussSeidel`, apart from rounding.
+    
+    Parameters
+    ----------
+    A : float32/float64[nGridpoints, nGridpoints]
+        The PSF build matrix (see :ref:`Brooks and Humphreys, 2006<BrooksHumphreys2006>`)
+    dirtyMap : float32/float64[nGridpoints]
+        The conventional beamformer map
+    nIterations : int64[scalar] 
+        maximum number of Iterations the damas solver has to go through
+    relax : float64[scalar] 
+        relaxation parameter (=1.0 in :ref:`Brooks and Humphreys, 2006<BrooksHumphreys2006>`)
+    tolerance : float64[scalar]
+        the iterations stop if the largest change of the solution in one 
+        iteration is smaller than tolerance times the largest value of the 
+        solution. If 0, all nIterations iterations are done.
+    damasSolution : float32/float64[nGridpoints]
+        starting solution
+    blockSize : int64[scalar]
+        number of gridpoints in one block, defaults to 64
+    
+    Returns
+    -------
+    int64[scalar] : the number of iterations done. damasSolution is 
+    overwritten with end result of the damas iterative solver.
+    """
+    nGridPoints = len(dirtyMap)
+    outerSum = np.zeros(blockSize)
+    cntIter = 0
+    while cntIter < nIterations:
+        cntIter += 1
+        change = 0.0
+        for start in range(0, nGridPoints, blockSize):
+            stop = min(start + blockSize, nGridPoints)
+            for cntHelp in nb.prange(stop - start):  # sums outside of the block
+                cntGrid = start + cntHelp
+                solHelp = 0.0
+                for cntGridHelp in range(start):
+                    solHelp += A[cntGrid, cntGridHelp] * damasSolution[cntGridHelp]
+                for cntGridHelp in range(stop, nGridPoints):
+                    solHelp += A[cntGrid, cntGridHelp] * damasSolution[cntGridHelp]
+                outerSum[cntHelp] = solHelp
+            for cntGrid in range(start, stop):  # gauss seidel within the block
+                solHelp = outerSum[cntGrid - start]
+                for cntGridHelp in range(start, stop):
+                    if cntGridHelp != cntGrid:
+                        solHelp += A[cntGrid, cntGridHelp] * damasSolution[cntGridHelp]
+                solHelp = (1 - relax) * damasSolution[cntGrid] + relax * (dirtyMap[cntGrid] - solHelp)
+                if solHelp < 0.0:
+                    solHelp = 0.0
+                change = max(change, abs(solHelp - damasSolution[cntGrid]))
+                damasSolution[cntGrid] = solHelp
+        if tolerance > 0.0 and change <= tolerance * np.abs(damasSolution).max():
+            break
+    return cntIter
+
+
+#%% CMF - FISTA
+@nb.njit(cache=cachedOption, parallel=True, fastmath=fastOption)
+def _cmfWeightedResidual(transfer, sourcePower, weight, csm, residual):
+    """ Calculates the weighted difference between the csm modelled by 
+    uncorrelated sources with powers sourcePower at all gridpoints and the 
+    measured csm. Gridpoints without source power are skipped. 
+    """
+    nGridPoints, nMics = transfer.shape
+    for cntMic in nb.prange(nMics):
+        for cntMicHelp in range(nMics):
+            model = 0.0 + 0.0j
+            for cntGrid in range(nGridPoints):
+                if sourcePower[cntGrid] != 0.0:
+                    model += sourcePower[cntGrid] * transfer[cntGrid, cntMic] * transfer[cntGrid, cntMicHelp].conjugate()
+            residual[cntMic, cntMicHelp] = weight[cntMic, cntMicHelp] * (model - csm[cntMic, cntMicHelp])
+
+
+@nb.njit(cache=cachedOption, parallel=True, fastmath=fastOption)
+def _cmfGradient(transfer, residual, gradient):
+    """ Calculates h^H * residual * h for the transfer vectors h of all gridpoints.
+    """
+    nGridPoints, nMics = transfer.shape
+    for cntGrid in nb.prange(nGridPoints):
+        result = 0.0
+        for cntMic in range(nMics):
+            temp = 0.0 + 0.0j
+            for cntMicHelp in range(nMics):
+                temp += residual[cntMic, cntMicHelp] * transfer[cntGrid, cntMicHelp]
+            result += (transfer[cntGrid, cntMic].conjugate() * temp).real
+        gradient[cntGrid] = result
+
+
+@nb.njit(cache=cachedOption, fastmath=fastOption)
+def cmfSolverFISTA(transfer, csm, weight, alpha, nIterations, tolerance, sourcePower):
+    """ Solves the covariance matrix fitting (CMF) problem with non-negative 
+    source powers via accelerated proximal gradient (FISTA) iterations.
+    Minimizes 1/2 * sum(weight * |C(x) - csm|^2) + alpha * sum(x) for x >= 0,
+    where C(x) is the csm of uncorrelated sources with powers x at the 
+    gridpoints. Unlike the usual formulation, the (reduced) Kronecker product 
+    of the transfer vectors is never formed, all products are calculated from 
+    the transfer vectors directly with O(nGridpoints * nMics^2) operations.
+    
+    Parameters
+    ----------
+    transfer : complex128[nGridpoints, nMics]
+        The transfer functions of all gridpoints.
+    csm : complex128[nMics, nMics]
+        The cross spectral matrix.
+    weight : float64[nMics, nMics]
+        Weights of the csm entries in the fit, e.g. 0 to omit the main diagonal.
+    alpha : float64[scalar]
+        Weight of the L1 regularization.
+    nIterations : int64[scalar] 
+        maximum number of iterations.
+    tolerance : float64[scalar]
+        the iterations stop if the largest change of the solution in one 
+        iteration is smaller than tolerance times the largest value of the 
+        solution.
+    sourcePower : float64[nGridpoints]
+        starting solution (e.g. the solution of a neighbouring frequency).
+    
+    Returns
+    -------
+    int64[scalar] : the number of iterations done. sourcePower is overwritten
+    with the result.
+    """
+    nGridPoints, nMics = transfer.shape
+    residual = np.zeros((nMics, nMics), dtype=np.complex128)
+    zeroCsm = np.zeros((nMics, nMics), dtype=np.complex128)
+    gradient = np.zeros(nGridPoints)
+
+    # Lipschitz constant of the gradient by power iteration
+    vec = np.ones(nGridPoints)
+    lipschitz = 0.0
+    for cntIter in range(30):
+        _cmfWeightedResidual(transfer, vec, weight, zeroCsm, residual)
+        _cmfGradient(transfer, residual, gradient)
+        lipschitz = np.sqrt((gradient**2).sum() / (vec**2).sum())
+        if lipschitz == 0.0:
+            return 0
+        vec = gradient / np.sqrt((gradient**2).sum())
+    step = 1.0 / (1.01 * lipschitz)
+
+    solution = sourcePower.copy()
+    extrapolated = sourcePower.copy()
+    momentum = 1.0
+    cntIter = 0
+    while cntIter < nIterations:
+        cntIter += 1
+        _cmfWeightedResidual(transfer, extrapolated, weight, csm, residual)
+        _cmfGradient(transfer, residual, gradient)
+        newSolution = np.maximum(extrapolated - step * (gradient + alpha), 0.0)
+        newMomentum = (1.0 + np.sqrt(1.0 + 4.0 * momentum * momentum)) / 2.0
+        extrapolated = newSolution + (momentum - 1.0) / newMomentum * (newSolution - solution)
+        change = np.abs(newSolution - solution).max()
+        solution = newSolution
+        momentum = newMomentum
+        if change <= tolerance * solution.max():
+            break
+    sourcePower[:] = solution
+    return cntIter
+
+
+#%% SODIX
+@nb.njit(cache=cachedOption, parallel=True, fastmath=fastOption)
+def sodixCostGradient(transfer, directivity, csm, gradient):
+    """ Calculates the data term of the SODIX cost function and its derivative 
+    without (nGridpoints, nMics, nMics) temporaries. The csm modelled by the 
+    directivities is D_jm D_jn h_jm h_jn^* summed over all gridpoints j.
+    
+    Parameters
+    ----------
+    transfer : complex128[nGridpoints, nMics]
+        The transfer functions of all gridpoints.
+    directivity : float64[nGridpoints, nMics]
+        The directivity factors D of all gridpoints towards all mics.
+    csm : complex128[nMics, nMics]
+        The measured cross spectral matrix.
+    gradient : float64[nGridpoints, nMics]
+        Gets overwritten with the derivative of the data term 
+        -4 D_rl Re(h_rl^* sum_m (csm - csmModel)_lm h_rm).
+    
+    Returns
+    -------
+    float64[scalar] : the data term (sum |csm - csmModel|)^2 of the cost function.
+    """
+    nGridPoints, nMics = transfer.shape
+    residual = np.zeros((nMics, nMics), dtype=np.complex128)
+    absSum = np.zeros(nMics)
+    for cntMic in nb.prange(nMics):
+        for cntMicHelp in range(nMics):
+            model = 0.0 + 0.0j
+            for cntGrid in range(nGridPoints):
+                model += transfer[cntGrid, cntMic] * directivity[cntGrid, cntMic] * \
+                    directivity[cntGrid, cntMicHelp] * transfer[cntGrid, cntMicHelp].conjugate()
+            residual[cntMic, cntMicHelp] = csm[cntMic, cntMicHelp] - model
+            absSum[cntMic] += abs(residual[cntMic, cntMicHelp])
+    for cntGrid in nb.prange(nGridPoints):
+        for cntMic in range(nMics):
+            temp = 0.0 + 0.0j
+            for cntMicHelp in range(nMics):
+                temp += residual[cntMic, cntMicHelp] * transfer[cntGrid, cntMicHelp]
+            gradient[cntGrid, cntMic] = -4.0 * directivity[cntGrid, cntMic] * \
+                (transfer[cntGrid, cntMic].conjugate() * temp).real
+    return absSum.sum()**2
+
+
+#%% CLEAN-SC
+@nb.njit(cache=cachedOption, fastmath=fastOption)
+def cleanscCoherentVector(D1, steerVec, nIterations):
+    """ Iteratively calculates the vector of the coherent source contribution 
+    in CLEAN-SC (see :ref:`Sijtsma, 2007<Sijtsma2007>`), which accounts for 
+    the removed main diagonal of the csm.
+    
+    Parameters
+    ----------
+    D1 : complex128[nMics]
+        Product of the csm without its main diagonal and the steering vector
+        at the location of the maximum, divided by the maximum.
+    steerVec : complex128[nMics]
+        The steering vector at the location of the maximum.
+    nIterations : int64[scalar]
+        number of iterations.
+    
+    Returns
+    -------
+    complex128[nMics] : the coherent source vector.
+    """
+    nMics = len(steerVec)
+    ww = np.zeros(nMics)
+    for cntMics in range(nMics):
+        ww[cntMics] = (steerVec[cntMics].conjugate() * steerVec[cntMics]).real
+    result = steerVec.copy()
+    H = np.zeros(nMics)
+    for cntIter in range(nIterations):
+        norm = 1.0
+        for cntMics in range(nMics):
+            H[cntMics] = (result[cntMics].conjugate() * result[cntMics]).real
+            norm += ww[cntMics] * H[cntMics]
+        norm = np.sqrt(norm)
+        for cntMics in range(nMics):
+            result[cntMics] = (D1[cntMics] + H[cntMics] * steerVec[cntMics]) / norm
+    return result
+
+
+def beamformerSteerVectors(steerVecType, distGridToArrayCenter, distGridToAllMics, waveNumber):
+    """ Calculates the steering vectors of all grid points for one frequency 
+    exactly as the kernels of :func:`beamformerFreq` do, including the 
+    normalization that they apply to the result. For an eigenvalue *ev* and 
+    an eigenvector *v*, the result of :func:`beamformerFreq` with 
+    signalLossNormalization 1 is then ev * abs(h.dot(v.conj()))**2 (minus 
+    ev * (abs(h)**2).dot(abs(v)**2) if the diagonal is removed) for these 
+    steering vectors *h*, up to rounding. Used by CLEAN-SC to update the 
+    map from :func:`beamformerFreq` by matrix products.
+    
+    Parameters
+    ----------
+    steerVecType : (one of the following strings: 'classic' (I), 'inverse' (II), 'true level' (III), 'true location' (IV))
+        Formulation of the steering vectors, see :func:`beamformerFreq`.
+    distGridToArrayCenter : float64[nGridpoints]
+        Distance of all gridpoints to the center of sensor array
+    distGridToAllMics : float64[nGridpoints, nMics]
+        Distance of all gridpoints to all sensors of array
+    waveNumber : float64[scalar]
+        The wave number.
+    
+    Returns
+    -------
+    complex128[nGridPoints, nMics] : the normalized steering vectors.
+    """
+    formulation = {'classic' : 1, 'inverse' : 2, 'true level' : 3, 'true location' : 4}[steerVecType]
+    result = np.zeros(distGridToAllMics.shape, np.complex128)
+    _beamformerSteerVectorsCore(np.array([formulation]), distGridToArrayCenter, 
+                                distGridToAllMics, np.array([waveNumber], dtype=np.float64), 
+                                result)
+    return result
+
+@nb.guvectorize([(nb.int64[:], nb.float64[:], nb.float64[:], nb.float64[:], nb.complex128[:])], 
+                '(),(),(m),()->(m)', nopython=True, target=parallelOption, 
+                cache=cachedOption, fastmath=fastOption)
+def _beamformerSteerVectorsCore(formulation, distGridToArrayCenter, distGridToAllMics, waveNumber, result):
+    # same steps as in the kernels of 'beamformerFreq', see there
+    nMics = distGridToAllMics.shape[0]
+    helpNormalize = 0.0
+    for cntMics in range(nMics):
+        expArg = np.float32(waveNumber[0] * distGridToAllMics[cntMics])
+        if formulation[0] == 1:
+            result[cntMics] = (np.cos(expArg) - 1j * np.sin(expArg))
+        elif formulation[0] == 2:
+            result[cntMics] = (np.cos(expArg) - 1j * np.sin(expArg)) * distGridToAllMics[cntMics]
+        else:
+            helpNormalize += 1.0 / (distGridToAllMics[cntMics] * distGridToAllMics[cntMics])  
+            result[cntMics] = (np.cos(expArg) - 1j * np.sin(expArg)) / distGridToAllMics[cntMics]
+    if formulation[0] == 1:
+        normalizeFactor = nMics
+    elif formulation[0] == 2:
+        normalizeFactor = nMics * distGridToArrayCenter[0]
+    elif formulation[0] == 3:
+        normalizeFactor = distGridToArrayCenter[0] * helpNormalize
+    else:
+        normalizeFactor = np.sqrt(nMics * helpNormalize)
+    for cntMics in range(nMics):
+        result[cntMics] /= normalizeFactor
+
+
 #%% Transfer - Function
-def calcTransfer(distGridToArrayCenter, distGridToAllMics, waveNumber):
+def calcTransfer(distGridToArrayCenter, distGridToAllMics, waveNumber, dtype='complex128'):
     """ Calculates the transfer functions between the various mics and gridpoints.
     
     Parameters
@@ -940,18 +1297,21 @@ def calcTransfer(distGridToArrayCenter, distGridToAllMics, waveNumber):
         Distance of all gridpoints to all sensors of array
     waveNumber : complex128
         The wave number should be stored in the imag-part
+    dtype : either 'complex128' or 'complex64'
+        Determines the precision of the result.
 
     Returns
     -------
-    The Transferfunctions in format complex128[nGridPoints, nMics].
+    The Transferfunctions in format complex128/complex64[nGridPoints, nMics].
     """
     nGridPoints, nMics = distGridToAllMics.shape[0], distGridToAllMics.shape[1]
-    result = np.zeros((nGridPoints, nMics), np.complex128)
+    result = np.zeros((nGridPoints, nMics), dtype)
     # transfer routine: parallelized over Gridpoints
     _transferCoreFunc(distGridToArrayCenter, distGridToAllMics, np.array([waveNumber]), result)
     return result
 
-@nb.guvectorize([(nb.float64[:], nb.float64[:], nb.float64[:], nb.complex128[:])], '(),(m),()->(m)', 
+@nb.guvectorize([(nb.float64[:], nb.float64[:], nb.float64[:], nb.complex128[:]),
+                 (nb.float64[:], nb.float64[:], nb.float64[:], nb.complex64[:])], '(),(m),()->(m)', 
                 nopython=True, target=parallelOption, cache=cachedOption, fastmath=fastOption)
 def _transferCoreFunc(distGridToArrayCenter, distGridToAllMics, waveNumber, result):
     nMics = distGridToAllMics.shape[0]
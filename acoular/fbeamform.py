@@ -26,6 +26,7 @@
     BeamformerGIB
 
     PointSpreadFunction
+    PointSpreadFunctionOperator
     L_p
     integrate
 
@@ -35,21 +36,27 @@
 from __future__ import print_function, division
 
 import warnings
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from threading import RLock
 
 from numpy import array, ones, full, hanning, hamming, bartlett, blackman, \
 invert, dot, newaxis, zeros, empty, fft, float32, float64, complex64, linalg, \
 where, searchsorted, pi, multiply, sign, diag, arange, sqrt, exp, log10, int,\
 reshape, hstack, vstack, eye, tril, size, clip, tile, round, delete, \
 absolute, argsort, sort, sum, hsplit, fill_diagonal, zeros_like, isclose, \
-vdot, flatnonzero, einsum, ndarray, isscalar, inf, real
+vdot, flatnonzero, einsum, ndarray, isscalar, inf, real, array_split
 
 from numpy.linalg import norm
 
 from sklearn.linear_model import LassoLars, LassoLarsCV, LassoLarsIC,\
 OrthogonalMatchingPursuit, ElasticNet, OrthogonalMatchingPursuitCV, Lasso
 
-from scipy.optimize import nnls, linprog, fmin_l_bfgs_b
-from scipy.linalg import inv, eigh, eigvals, fractional_matrix_power
+from scipy.optimize import nnls, linprog, fmin_l_bfgs_b, lsq_linear
+from scipy.sparse.linalg import LinearOperator
+from scipy.linalg import inv, eigh, eigvals, fractional_matrix_power, \
+cho_factor, cho_solve, lstsq, LinAlgError
 from warnings import warn
 
 #pylops imports for CMF solvers
@@ -60,22 +67,187 @@ try:
 except:
     PYLOPS_TRUE = False
 
+#: Approximate amount of memory in bytes that the frequency dependent input 
+#: data (CSM, steering vectors) and results of one batch of frequencies may 
+#: occupy when frequency domain beamformers process several frequencies at once.
+BATCH_MEMORY = 2**27
+
+#: Number of microphones from which on :class:`BeamformerBase` with 
+#: ``engine='auto'`` evaluates the beamforming equation by matrix products 
+#: (BLAS) instead of the numba kernels.
+BLAS_NUM_MICS = 64
+
+def _beamformer_blas( steer, steer_type, f, r_diag, normFactor, csm ):
+    """
+    Evaluates the beamforming equation h^H C h for frequency `f` and all 
+    grid points by matrix products of blocks of steering vectors with the 
+    csm `csm`. The steering vectors are calculated block by block from the 
+    :class:`SteeringVector` object `steer`, for the predefined `steer_type` 
+    exactly as by :func:`~acoular.fastFuncs.beamformerFreq`, so that the 
+    steering vectors of all grid points are never held in memory at once. 
+    With `r_diag`, the contribution of the main diagonal of the csm is 
+    excluded. The block size is chosen such that the temporary arrays use 
+    about :data:`BATCH_MEMORY` bytes.
+    """
+    gs = steer.grid.size
+    nm = csm.shape[0]
+    d = csm.diagonal().real
+    result = empty(gs, dtype=d.dtype)
+    nblock = max(1, BATCH_MEMORY // (2 * nm * csm.itemsize))
+    for s in range(0, gs, nblock):
+        ind = arange(s, min(s+nblock, gs))
+        if steer_type == 'custom':
+            hb = steer.steer_vector(f, ind)
+        else:
+            hb = beamformerSteerVectors(steer_type, steer.r0[ind], steer.rm[ind], 
+                                        2*pi*f/steer.env.c)
+        hb = hb.astype(csm.dtype, copy=False)
+        res = einsum('gm,gm->g', dot(hb.conj(), csm), hb).real
+        if r_diag:
+            res -= dot((hb * hb.conj()).real, d)
+        result[ind] = res
+    return result * normFactor
+
+class _FrequencyRows:
+    """
+    Rows of frequency dependent data (e.g. cross spectral matrices or 
+    beamforming results) for some frequency indices only, as passed to the 
+    workers by :meth:`BeamformerBase._calc_parallel`. Indexing with frequency
+    indices, slices of them or sequences of them works as with the full 
+    array, as long as only the available frequencies are addressed.
+    """
+
+    def __init__( self, data, ind ):
+        self.shape = tuple(data.shape)
+        self.dtype = data.dtype
+        self.rows = array([data[i] for i in ind])
+        self._pos = {int(i) : j for j, i in enumerate(ind)}
+
+    @property
+    def ndim( self ):
+        return len(self.shape)
+
+    def __len__( self ):
+        return self.shape[0]
+
+    def __getitem__( self, key ):
+        if isinstance(key, tuple):
+            key, rest = key[0], key[1:]
+        else:
+            rest = ()
+        if isinstance(key, slice):
+            key = range(*key.indices(self.shape[0]))
+        if isscalar(key):
+            rows = self.rows[self._pos[int(key)]]
+        else:
+            rows = self.rows[[self._pos[int(i)] for i in key]]
+        return rows[rest]
+
+class _BeamformerInputs:
+    """
+    Frequency dependent inputs of :meth:`BeamformerBase.calc` as taken from 
+    the beamformer `obj`: cross spectral matrix, eigenvalues and 
+    eigenvectors of its :attr:`~BeamformerBase.freq_data` and the result of 
+    its :attr:`~BeamformerDamas.beamformer`. The names of the inputs that are
+    used are recorded in :attr:`used`.
+    """
+
+    def __init__( self, obj ):
+        self.obj = obj
+        self.used = set()
+
+    @property
+    def csm( self ):
+        self.used.add('csm')
+        return self.obj.freq_data.csm
+
+    @property
+    def eva( self ):
+        self.used.add('eva')
+        return self.obj.freq_data.eva
+
+    @property
+    def eve( self ):
+        self.used.add('eve')
+        return self.obj.freq_data.eve
+
+    @property
+    def result( self ):
+        self.used.add('result')
+        return self.obj.beamformer.result
+
+    def top_ev( self, k ):
+        self.used.add(k)
+        return self.obj.freq_data.top_ev(k)
+
+class _FrequencyInputs:
+    """
+    In-memory copies of the rows for the frequency indices `ind` of the 
+    inputs that were used from `inputs` (see :class:`_BeamformerInputs`), 
+    with the same interface. Passed to the workers by 
+    :meth:`BeamformerBase._calc_parallel`.
+    """
+
+    def __init__( self, inputs, ind ):
+        self._top_ev = {}
+        for name in inputs.used:
+            if isinstance(name, int):
+                (eva, eve) = inputs.top_ev(name)
+                self._top_ev[name] = (_FrequencyRows(eva, ind), _FrequencyRows(eve, ind))
+                continue
+            value = getattr(inputs, name)
+            if isinstance(value, PackedCSM):
+                value = PackedCSM(_FrequencyRows(value.data, ind), value.numchannels)
+            else:
+                value = _FrequencyRows(value, ind)
+            setattr(self, name, value)
+
+    def top_ev( self, k ):
+        return self._top_ev[k]
+
+def _calc_partition( h5library, obj, inputs, shm_name, shape, dtype, k, ind ):
+    """
+    Calculates the results of beamformer `obj` for the frequency indices `ind`
+    from the rows of the inputs `inputs` (see :class:`_FrequencyInputs`) and 
+    writes them to the corresponding rows of the `k`-th result array in 
+    shared memory block `shm_name`. Runs in a worker process, see 
+    :meth:`BeamformerBase._calc_parallel`.
+    """
+    config.h5library = h5library
+    config.global_caching = 'none' # cache files are only written by the main process
+    shm = SharedMemory(name=shm_name)
+    try:
+        ac = ndarray(shape, dtype, buffer=shm.buf)
+        obj._calc_rows(ac[k], ind, inputs)
+        del ac
+    finally:
+        shm.close()
+
 from traits.api import HasPrivateTraits, Float, Int, ListInt, ListFloat, \
 CArray, Property, Instance, Trait, Bool, Range, Delegate, Enum, Any, \
 cached_property, on_trait_change, property_depends_on
 from traits.trait_errors import TraitError
 
 from .fastFuncs import beamformerFreq, calcTransfer, calcPointSpreadFunction, \
-damasSolverGaussSeidel
+damasSolverGaussSeidel, damasSolverBlockGaussSeidel, cmfSolverFISTA, sodixCostGradient, \
+cleanscCoherentVector, beamformerSteerVectors
 
 from .h5cache import H5cache
 from .h5files import H5CacheFileBase
-from .internal import digest
-from .grids import Grid, Sector
+from .internal import digest, LRUCache
+from .grids import Grid, Sector, RectGrid, RectGrid3D
 from .microphones import MicGeom
 from .configuration import config
 from .environments import Environment
-from .spectra import PowerSpectra
+from .spectra import PowerSpectra, PackedCSM
+
+# in-memory cache for transfer matrices and steering vectors shared by all 
+# SteeringVector objects, the size is limited by config.steer_cache_size
+_steer_cache = LRUCache()
+
+# serializes the access to cache files by the threads of 
+# BeamformerBase._calc_parallel, HDF5 libraries are not thread-safe
+_h5_lock = RLock()
 
 class SteeringVector( HasPrivateTraits ):
     """ 
@@ -99,14 +271,27 @@ class SteeringVector( HasPrivateTraits ):
     #: Defaults to standard :class:`~acoular.environments.Environment` object.
     env = Instance(Environment(), Environment)
     
-    # TODO: add caching capability for transfer function
-    # Flag, if "True" (not default), the transfer function is 
-    # cached in h5 files and does not have to be recomputed during subsequent 
-    # program runs. 
-    # Be aware that setting this to "True" may result in high memory usage.
-    #cached = Bool(False, 
-    #              desc="cache flag for transfer function")    
-    
+    #: Flag, if "True" (not default), the transfer function is
+    #: cached in h5 files and does not have to be recomputed during subsequent
+    #: program runs. Independent of this flag, recently used transfer matrices
+    #: and steering vectors are kept in memory, see
+    #: :attr:`~acoular.configuration.Config.steer_cache_size`.
+    #: Be aware that setting this to "True" may result in large cache files.
+    cached = Bool(False,
+                  desc="cache flag for transfer function")
+
+    #: Floating point precision of the transfer matrices and steering vectors. 
+    #: Corresponding to numpy dtypes. Default = 128 Bit.
+    precision = Trait('complex128', 'complex64', 
+                      desc="precision of transfer matrices and steering vectors")
+
+    # precision part of the digest, empty for the default precision such
+    # that existing cache files remain valid
+    _digest_precision = Property(depends_on = ['precision'])
+
+    # hdf5 cache file
+    h5f = Instance( H5CacheFileBase, transient = True )
+
     
     # Sound travel distances from microphone array center to grid 
     # points or reference position (readonly). Feature may change.
@@ -150,11 +335,13 @@ class SteeringVector( HasPrivateTraits ):
     
     # internal identifier
     digest = Property( 
-        depends_on = ['steer_type', 'env.digest', 'grid.digest', 'mics.digest', '_ref'])
+        depends_on = ['steer_type', 'env.digest', 'grid.digest', 'mics.digest', '_ref', 
+                      '_digest_precision'])
     
     # internal identifier, use for inverse methods, excluding steering vector type
     inv_digest = Property( 
-        depends_on = ['env.digest', 'grid.digest', 'mics.digest', '_ref'])
+        depends_on = ['env.digest', 'grid.digest', 'mics.digest', '_ref', 
+                      '_digest_precision'])
         
     @property_depends_on('grid.digest, env.digest, _ref')
     def _get_r0 ( self ):
@@ -170,6 +357,11 @@ class SteeringVector( HasPrivateTraits ):
     def _get_rm ( self ):
         return self.env._r(self.grid.pos(), self.mics.mpos)
  
+    def _get__digest_precision( self ):
+        if self.precision == 'complex128':
+            return ''
+        return self.precision
+
     @cached_property
     def _get_digest( self ):
         return digest( self )
@@ -193,21 +385,64 @@ class SteeringVector( HasPrivateTraits ):
         
         Returns
         -------
-        array of complex128
-            array of shape (ngridpts, nmics) containing the transfer matrix for the given frequency
+        array of complex128 (or complex64, see :attr:`precision`)
+            array of shape (ngridpts, nmics) containing the transfer matrix for the given frequency.
+            If `ind` is not set, the array is shared with later calls and therefore read-only.
         """
-        #if self.cached:
-        #    warn('Caching of transfer function is not yet supported!', Warning)
-        #    self.cached = False
-        
+        key = (self.digest, 'transfer', float(f))
         if ind is None:
-            trans = calcTransfer(self.r0, self.rm, array(2*pi*f/self.env.c))
-        elif not isinstance(ind,ndarray):
-            trans = calcTransfer(self.r0[ind], self.rm[ind, :][newaxis], array(2*pi*f/self.env.c))#[0, :]
+            trans = _steer_cache.get(key)
+            if trans is None:
+                if (config.global_caching == 'none' or
+                    (config.global_caching == 'individual' and not self.cached)):
+                    trans = self._calc_transfer(f)
+                else:
+                    with _h5_lock:
+                        trans = self._get_filecache(f)
+                _steer_cache.put(key, trans, config.steer_cache_size)
+            return trans
+        # reuse the full transfer matrix if it is already at hand
+        trans = _steer_cache.get(key)
+        if trans is not None:
+            if not isinstance(ind,ndarray):
+                return trans[ind][newaxis]
+            return trans[ind]
+        if not isinstance(ind,ndarray):
+            trans = calcTransfer(self.r0[ind], self.rm[ind, :][newaxis], array(2*pi*f/self.env.c), self.precision)#[0, :]
         else:
-            trans = calcTransfer(self.r0[ind], self.rm[ind, :], array(2*pi*f/self.env.c))
+            trans = calcTransfer(self.r0[ind], self.rm[ind, :], array(2*pi*f/self.env.c), self.precision)
         return trans
-    
+
+    def _calc_transfer(self, f):
+        """
+        Calculates the full transfer matrix for frequency `f`.
+        """
+        return calcTransfer(self.r0, self.rm, array(2*pi*f/self.env.c), self.precision)
+
+    def _get_filecache(self, f):
+        """
+        function collects the transfer matrix for frequency `f` from file
+        depending on global/local caching behaviour. The transfer matrix is
+        calculated and written to file if it is not yet cached.
+        """
+        filename = 'transfer' + self.digest
+        nodename = ('Hz_%.2f' % f).replace('.', '_')
+        H5cache.get_cache_file( self, filename )
+        if not self.h5f: # only happens in case of global caching readonly
+            return self._calc_transfer(f)
+
+        if config.global_caching == 'overwrite' and self.h5f.is_cached(nodename):
+            self.h5f.remove_data(nodename) # remove old data before writing in overwrite mode
+
+        if self.h5f.is_cached(nodename):
+            return self.h5f.get_data_by_reference(nodename)[:]
+        trans = self._calc_transfer(f)
+        if not config.global_caching == 'readonly':
+            self.h5f.create_compressible_array(nodename, trans.shape, self.precision)
+            self.h5f.get_data_by_reference(nodename)[:] = trans
+            self.h5f.flush()
+        return trans
+
     def steer_vector(self, f, ind=None):
         """
         Calculates the steering vectors based on the transfer function
@@ -224,15 +459,23 @@ class SteeringVector( HasPrivateTraits ):
         
         Returns
         -------
-        array of complex128
-            array of shape (ngridpts, nmics) containing the steering vectors for the given frequency
+        array of complex128 (or complex64, see :attr:`precision`)
+            array of shape (ngridpts, nmics) containing the steering vectors for the given frequency.
+            If `ind` is not set, the array is shared with later calls and therefore read-only.
         """
         func = {'classic' : lambda x: x / absolute(x) / x.shape[-1],
                 'inverse' : lambda x: 1. / x.conj() / x.shape[-1],
                 'true level' : lambda x: x / einsum('ij,ij->i',x,x.conj())[:,newaxis],
                 'true location' : lambda x: x / sqrt(einsum('ij,ij->i',x,x.conj()) * x.shape[-1])[:,newaxis]
                 }[self.steer_type]
-        return func(self.transfer(f, ind))
+        if ind is not None:
+            return func(self.transfer(f, ind))
+        key = (self.digest, 'steer', float(f))
+        steer = _steer_cache.get(key)
+        if steer is None:
+            steer = func(self.transfer(f))
+            _steer_cache.put(key, steer, config.steer_cache_size)
+        return steer
     
     
 class BeamformerBase( HasPrivateTraits ):
@@ -352,12 +595,50 @@ class BeamformerBase( HasPrivateTraits ):
                         "Internally, the default is: num_mics / (num_mics - 1).") 
     
     #: Floating point precision of property result. Corresponding to numpy dtypes. Default = 64 Bit.
+    #: With 'float32', the csm and the eigenvectors are processed in single 
+    #: precision as well.
     precision = Trait('float64', 'float32',
             desc="precision (32/64 Bit) of result, corresponding to numpy dtypes")
+
+    # complex precision of csm and eigenvectors used in the calculation,
+    # follows precision
+    _complex_precision = Property(depends_on = ['precision'])
     
     #: Boolean flag, if 'True' (default), the result is cached in h5 files.
     cached = Bool(True, 
         desc="cached flag")
+
+    #: How to distribute the calculation of the frequencies, defaults to 
+    #: 'serial'. With 'thread' or 'process', the missing frequencies are 
+    #: split between :attr:`num_workers` threads or worker processes that 
+    #: calculate them independently. Threads are useful if the calculation 
+    #: mostly happens in numpy or scipy routines that release the GIL, 
+    #: processes otherwise (e.g. for :class:`BeamformerCMF`). 
+    #: The workers get in-memory copies of the inputs (cross spectral 
+    #: matrix, eigenvalues and eigenvectors, result of the beamformer to 
+    #: deconvolve) for their frequencies, which are evaluated beforehand. 
+    #: Threads share the beamformer, worker processes get a copy of it, are 
+    #: spawned and write their results to shared memory. Scripts using 
+    #: 'process' must guard their main code with 
+    #: ``if __name__ == '__main__':``.
+    executor = Trait('serial', 'thread', 'process',
+        desc="execution of the frequency calculations")
+
+    #: Number of threads or worker processes used if :attr:`executor` is 
+    #: not 'serial', defaults to 1.
+    num_workers = Int(1,
+        desc="number of workers for frequency calculations")
+
+    #: How the delay-and-sum beamforming equation is evaluated: 'numba' 
+    #: calculates the steering vector of each grid point on the fly in 
+    #: parallelized kernels, 'blas' uses matrix products of blocks of 
+    #: steering vectors with the csm, which is faster for large numbers of 
+    #: microphones. The blocks of steering vectors are calculated as needed, 
+    #: so 'blas' does not hold the steering vectors of all grid points in 
+    #: memory. Defaults to 'auto', which uses 'blas' if there are at 
+    #: least :data:`BLAS_NUM_MICS` microphones.
+    engine = Trait('auto', 'numba', 'blas',
+        desc="evaluation of the beamforming equation")
                   
     # hdf5 cache file
     h5f = Instance( H5CacheFileBase, transient = True )
@@ -384,6 +665,9 @@ class BeamformerBase( HasPrivateTraits ):
     @cached_property
     def _get_ext_digest( self ):
         return digest( self, 'ext_digest' )
+
+    def _get__complex_precision( self ):
+        return {'float64' : 'complex128', 'float32' : 'complex64'}[self.precision]
     
     def _get_filecache( self ):
         """
@@ -414,15 +698,123 @@ class BeamformerBase( HasPrivateTraits ):
                 self.h5f.create_compressible_array('result',
                                       (numfreq, self.steer.grid.size),
                                       self.precision,
-                                      group)
+                                      group,
+                                      chunkshape=(1, self.steer.grid.size))
                 self.h5f.create_compressible_array('freqs',
                                       (numfreq, ),
                                       'int8',#'bool', 
                                       group)
+                self.h5f.complete_group(group)
         ac = self.h5f.get_data_by_reference('result','/'+nodename)
         fr = self.h5f.get_data_by_reference('freqs','/'+nodename)
         return (ac,fr)        
 
+    def _readonly_copy( self, ac, fr ):
+        """
+        Returns in-memory copies of the cached result `ac` and the flags `fr`
+        for calculation of missing frequencies in readonly mode. Only the
+        cached frequencies between :attr:`~acoular.spectra.PowerSpectra.ind_low`
+        and :attr:`~acoular.spectra.PowerSpectra.ind_high` are read, the
+        others are left empty and marked as not calculated.
+        """
+        f = self.freq_data
+        ind = slice(f.ind_low, f.ind_high)
+        fr_copy = zeros(fr.shape, dtype='int8')
+        fr_copy[ind] = fr[ind]
+        ac_copy = zeros(ac.shape, dtype=self.precision)
+        ac_copy[ind] = ac[ind]
+        return (ac_copy, fr_copy)
+
+    def _calc_frequencies( self, ac, fr ):
+        """
+        Calls :meth:`calc` for all missing frequencies, either directly or 
+        distributed over several workers, depending on :attr:`executor`.
+        """
+        ind = [i for i in self.freq_data.indices if not fr[i]]
+        if self.executor == 'serial' or self.num_workers < 2 or len(ind) < 3:
+            self.calc(ac, fr)
+            return
+        # the first frequency is calculated here, so that inputs shared by all 
+        # frequencies (cross spectral matrix, results of other beamformers) 
+        # are evaluated only once and not concurrently by the workers, and 
+        # to find out which inputs are used
+        inputs = _BeamformerInputs(self)
+        frp = ones(fr.shape, dtype='int8')
+        frp[ind[0]] = 0
+        self.calc(ac, frp, inputs)
+        fr[ind[0]] = 1
+        self._calc_parallel(ac, fr, ind[1:], inputs)
+
+    def _calc_rows( self, ac, ind, inputs ):
+        """
+        Calculates the results for the frequency indices `ind` from the rows 
+        of the inputs `inputs` (see :class:`_FrequencyInputs`) into the 
+        corresponding rows of `ac`. The other rows of `ac` are left untouched.
+        """
+        fr = ones(ac.shape[0], dtype='int8')
+        fr[ind] = 0
+        self.calc(ac, fr, inputs)
+
+    def _calc_parallel( self, ac, fr, ind, inputs ):
+        """
+        Calculates the frequencies with indices `ind` with :attr:`num_workers` 
+        workers. Each of the workers gets the rows of the inputs used from 
+        `inputs` (see :class:`_BeamformerInputs`) for its own frequencies and 
+        calculates these frequencies into a result array of its own. Threads 
+        share the beamformer, worker processes get a copy of it. 
+        Frequencies that were calculated before are copied to the result 
+        arrays, so that solvers can start from the result of the neighbouring
+        frequency, the other rows are zero. The rows of the workers are 
+        copied to `ac` afterwards.
+        """
+        n = min(self.num_workers, len(ind))
+        parts = array_split(ind, n) # consecutive frequencies for batched calc
+        shape = tuple(ac.shape)
+        dtype = ac.dtype
+        def init( buf, part ):
+            buf[:] = 0
+            for i in part:
+                if i > 0 and fr[i-1] and i-1 not in part:
+                    buf[i-1] = ac[i-1]
+        if self.executor == 'process':
+            shm = SharedMemory(create=True, 
+                               size=n*shape[0]*shape[1]*zeros(0, dtype).itemsize)
+            try:
+                bufs = ndarray((n,)+shape, dtype, buffer=shm.buf)
+                with ProcessPoolExecutor(n, mp_context=get_context('spawn')) as pool:
+                    futures = []
+                    for k, part in enumerate(parts):
+                        init(bufs[k], part)
+                        futures.append(pool.submit(_calc_partition, config.h5library, 
+                                                   self, _FrequencyInputs(inputs, part), 
+                                                   shm.name, (n,)+shape, dtype, k, part))
+                    for future in futures:
+                        future.result()
+                for buf, part in zip(bufs, parts):
+                    for i in part:
+                        ac[i] = buf[i]
+                        fr[i] = 1
+                del bufs, buf
+            finally:
+                shm.close()
+                shm.unlink()
+        else: # 'thread'
+            # the threads only read the rows of the inputs, psfs and transfer
+            # matrices from cache files are accessed under _h5_lock
+            bufs = empty((n,)+shape, dtype=dtype)
+            with ThreadPoolExecutor(n) as pool:
+                futures = []
+                for buf, part in zip(bufs, parts):
+                    init(buf, part)
+                    futures.append(pool.submit(self._calc_rows, buf, part, 
+                                               _FrequencyInputs(inputs, part)))
+                for future in futures:
+                    future.result()
+            for buf, part in zip(bufs, parts):
+                for i in part:
+                    ac[i] = buf[i]
+                    fr[i] = 1
+
     def _assert_equal_channels(self):
         numchannels = self.freq_data.numchannels
         if  numchannels != self.steer.mics.num_mics or numchannels == 0:
@@ -446,13 +838,13 @@ class BeamformerBase( HasPrivateTraits ):
                 ):
 #                print("get filecache..")
                 (ac,fr) = self._get_filecache() 
-                if ac and fr: 
+                if ac is not None and fr is not None: 
 #                    print("cached data existent")
                     if not fr[f.ind_low:f.ind_high].all():
 #                        print("calculate missing results")                            
                         if config.global_caching == 'readonly': 
-                            (ac, fr) = (ac[:], fr[:])
-                        self.calc(ac,fr)
+                            (ac, fr) = self._readonly_copy(ac, fr)
+                        self._calc_frequencies(ac,fr)
                         self.h5f.flush()
 #                    else:
 #                        print("cached results are complete! return.")
@@ -460,12 +852,12 @@ class BeamformerBase( HasPrivateTraits ):
 #                    print("no caching, calculate result")
                     ac = zeros((numfreq, self.steer.grid.size), dtype=self.precision)
                     fr = zeros(numfreq, dtype='int8')
-                    self.calc(ac,fr)
+                    self._calc_frequencies(ac,fr)
             else:
 #                print("no caching activated, calculate result")
                 ac = zeros((numfreq, self.steer.grid.size), dtype=self.precision)
                 fr = zeros(numfreq, dtype='int8')
-                self.calc(ac,fr)
+                self._calc_frequencies(ac,fr)
         return ac
       
     def sig_loss_norm(self):
@@ -500,10 +892,46 @@ class BeamformerBase( HasPrivateTraits ):
             def param_steer_func(f): return (self.steer.r0, self.steer.rm, 2*pi*f/self.steer.env.c )
         else:
             param_type = 'custom'
-            param_steer_func = self.steer.steer_vector
+            def param_steer_func(f):
+                if isscalar(f):
+                    return self.steer.steer_vector(f)
+                # stack steering vectors for a batch of frequencies
+                return array([self.steer.steer_vector(fi) for fi in f])
         return param_type, param_steer_func
 
-    def calc(self, ac, fr):
+    def _freq_batches(self, fr):
+        """
+        Generator that yields slices of consecutive frequency indices out of
+        :attr:`freq_data.indices<acoular.spectra.PowerSpectra.indices>` for 
+        which the result has yet to be calculated.
+        
+        The number of frequencies per slice is limited such that the 
+        frequency dependent data of one batch does not use much more memory 
+        than given by :data:`BATCH_MEMORY`.
+        
+        Parameters
+        ----------
+        fr : array of booleans
+            Flags for the frequencies that have already been calculated, 
+            see :meth:`calc`.
+        """
+        nm = self.freq_data.numchannels
+        gs = self.steer.grid.size
+        isize = 8 if self.precision == 'float32' else 16
+        nbytes = isize*(nm*nm + gs) # csm / eigenvectors and results
+        if type(self.steer) != SteeringVector: # stacked custom steering vectors
+            nbytes += isize*nm*gs
+        nmax = max(1, BATCH_MEMORY // nbytes)
+        done = fr[:]
+        ind = [i for i in self.freq_data.indices if not done[i]]
+        while ind:
+            n = 1
+            while n < min(nmax, len(ind)) and ind[n] == ind[0]+n:
+                n += 1
+            yield slice(ind[0], ind[0]+n)
+            ind = ind[n:]
+
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the delay-and-sum beamforming result for the frequencies 
         defined by :attr:`freq_data`
@@ -525,25 +953,46 @@ class BeamformerBase( HasPrivateTraits ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()#[inds]
+        normFactor = self.sig_loss_norm()
         param_steer_type, steer_vector = self._beamformer_params()
-        for i in self.freq_data.indices:
-            if not fr[i]:
-                csm = array(self.freq_data.csm[i], dtype='complex128')
+        if self.engine == 'auto':
+            blas = self.freq_data.numchannels >= BLAS_NUM_MICS
+        else:
+            blas = self.engine == 'blas'
+        for ind in self._freq_batches(fr):
+            csm = array(inputs.csm[ind], dtype=self._complex_precision)
+            if blas:
+                beamformerOutput = array([_beamformer_blas(self.steer, 
+                                                           param_steer_type, fi, 
+                                                           self.r_diag, 
+                                                           normFactor, 
+                                                           csmFreq) 
+                                          for fi, csmFreq in zip(f[ind], csm)])
+            else:
                 beamformerOutput = beamformerFreq(param_steer_type, 
                                                   self.r_diag, 
-                                                  self.sig_loss_norm(), 
-                                                  steer_vector(f[i]), 
+                                                  normFactor, 
+                                                  steer_vector(f[ind]), 
                                                   csm)[0]
-                if self.r_diag:  # set (unphysical) negative output values to 0
-                    indNegSign = sign(beamformerOutput) < 0
-                    beamformerOutput[indNegSign] = 0.0
-                ac[i] = beamformerOutput
-                fr[i] = 1
+            if self.r_diag:  # set (unphysical) negative output values to 0
+                indNegSign = sign(beamformerOutput) < 0
+                beamformerOutput[indNegSign] = 0.0
+            ac[ind] = beamformerOutput
+            fr[ind] = 1
     
     def synthetic( self, f, num=0):
         """
@@ -688,7 +1137,7 @@ class BeamformerFunctional( BeamformerBase ):
     def _get_digest( self ):
         return digest( self )
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the Functional Beamformer result for the frequencies defined by :attr:`freq_data`
         
@@ -709,49 +1158,59 @@ class BeamformerFunctional( BeamformerBase ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
         normFactor = self.sig_loss_norm()
         param_steer_type, steer_vector = self._beamformer_params()
-        for i in self.freq_data.indices:
-            if not fr[i]:
-                if self.r_diag:
-                    # This case is not used at the moment (see Trait r_diag)  
-                    # It would need some testing as structural changes were not tested...
+        for ind in self._freq_batches(fr):
+            if self.r_diag:
+                # This case is not used at the moment (see Trait r_diag)  
+                # It would need some testing as structural changes were not tested...
 #==============================================================================
-#                     One cannot use spectral decomposition when diagonal of csm is removed,
-#                     as the resulting modified eigenvectors are not orthogonal to each other anymore.
-#                     Therefor potentiating cannot be applied only to the eigenvalues.
-#                     --> To avoid this the root of the csm (removed diag) is calculated directly.
-#                     WATCH OUT: This doesn't really produce good results.
+#                 One cannot use spectral decomposition when diagonal of csm is removed,
+#                 as the resulting modified eigenvectors are not orthogonal to each other anymore.
+#                 Therefor potentiating cannot be applied only to the eigenvalues.
+#                 --> To avoid this the root of the csm (removed diag) is calculated directly.
+#                 WATCH OUT: This doesn't really produce good results.
 #==============================================================================
-                    csm = self.freq_data.csm[i]
-                    fill_diagonal(csm, 0)
-                    csmRoot = fractional_matrix_power(csm, 1.0 / self.gamma)
-                    beamformerOutput, steerNorm = beamformerFreq(param_steer_type, 
-                                                                 self.r_diag, 
-                                                                 1.0, 
-                                                                 steer_vector(f[i]), 
-                                                                 csmRoot)
-                    beamformerOutput /= steerNorm  # take normalized steering vec
-                    
-                    # set (unphysical) negative output values to 0
-                    indNegSign = sign(beamformerOutput) < 0
-                    beamformerOutput[indNegSign] = 0.0
-                else:
-                    eva = array(self.freq_data.eva[i], dtype='float64') ** (1.0 / self.gamma)
-                    eve = array(self.freq_data.eve[i], dtype='complex128')
-                    beamformerOutput, steerNorm = beamformerFreq(param_steer_type, 
-                                                                 self.r_diag, 
-                                                                 1.0, 
-                                                                 steer_vector(f[i]), 
-                                                                 (eva, eve))
-                    beamformerOutput /= steerNorm  # take normalized steering vec
-                ac[i] = (beamformerOutput ** self.gamma) * steerNorm * normFactor  # the normalization must be done outside the beamformer
-                fr[i] = 1
+                csm = array(inputs.csm[ind], dtype=self._complex_precision)
+                for csmFreq in csm:
+                    fill_diagonal(csmFreq, 0)
+                csmRoot = array([fractional_matrix_power(csmFreq, 1.0 / self.gamma) for csmFreq in csm], 
+                                dtype=self._complex_precision)
+                beamformerOutput, steerNorm = beamformerFreq(param_steer_type, 
+                                                             self.r_diag, 
+                                                             1.0, 
+                                                             steer_vector(f[ind]), 
+                                                             csmRoot)
+                beamformerOutput /= steerNorm  # take normalized steering vec
+                
+                # set (unphysical) negative output values to 0
+                indNegSign = sign(beamformerOutput) < 0
+                beamformerOutput[indNegSign] = 0.0
+            else:
+                eva = array(inputs.eva[ind], dtype=self.precision) ** (1.0 / self.gamma)
+                eve = array(inputs.eve[ind], dtype=self._complex_precision)
+                beamformerOutput, steerNorm = beamformerFreq(param_steer_type, 
+                                                             self.r_diag, 
+                                                             1.0, 
+                                                             steer_vector(f[ind]), 
+                                                             (eva, eve))
+                beamformerOutput /= steerNorm  # take normalized steering vec
+            ac[ind] = (beamformerOutput ** self.gamma) * steerNorm * normFactor  # the normalization must be done outside the beamformer
+            fr[ind] = 1
             
 class BeamformerCapon( BeamformerBase ):
     """
@@ -763,7 +1222,7 @@ class BeamformerCapon( BeamformerBase ):
     r_diag = Enum(False, 
         desc="removal of diagonal")
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the Capon result for the frequencies defined by :attr:`freq_data`
         
@@ -784,24 +1243,34 @@ class BeamformerCapon( BeamformerBase ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """        
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
         nMics = self.freq_data.numchannels
         normFactor = self.sig_loss_norm() * nMics**2
         param_steer_type, steer_vector = self._beamformer_params()
-        for i in self.freq_data.indices:
-            if not fr[i]:
-                csm = array(linalg.inv(array(self.freq_data.csm[i], dtype='complex128')), order='C')
-                beamformerOutput = beamformerFreq(param_steer_type, 
-                                                  self.r_diag, 
-                                                  normFactor, 
-                                                  steer_vector(f[i]), 
-                                                  csm)[0]
-                ac[i] = 1.0 / beamformerOutput
-                fr[i] = 1
+        for ind in self._freq_batches(fr):
+            # the inverse is always calculated in double precision
+            csm = array(linalg.inv(array(inputs.csm[ind], dtype='complex128')), 
+                        dtype=self._complex_precision, order='C')
+            beamformerOutput = beamformerFreq(param_steer_type, 
+                                              self.r_diag, 
+                                              normFactor, 
+                                              steer_vector(f[ind]), 
+                                              csm)[0]
+            ac[ind] = 1.0 / beamformerOutput
+            fr[ind] = 1
 
 class BeamformerEig( BeamformerBase ):
     """
@@ -834,7 +1303,7 @@ class BeamformerEig( BeamformerBase ):
             na = max(nm + na, 0)
         return min(nm - 1, na)
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the result for the frequencies defined by :attr:`freq_data`
         
@@ -855,28 +1324,38 @@ class BeamformerEig( BeamformerBase ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
         na = int(self.na)  # eigenvalue taken into account
         normFactor = self.sig_loss_norm()
         param_steer_type, steer_vector = self._beamformer_params()
-        for i in self.freq_data.indices:
-            if not fr[i]:
-                eva = array(self.freq_data.eva[i], dtype='float64')
-                eve = array(self.freq_data.eve[i], dtype='complex128')
-                beamformerOutput = beamformerFreq(param_steer_type, 
-                                                  self.r_diag, 
-                                                  normFactor, 
-                                                  steer_vector(f[i]), 
-                                                  (eva[na:na+1], eve[:, na:na+1]))[0]
-                if self.r_diag:  # set (unphysical) negative output values to 0
-                    indNegSign = sign(beamformerOutput) < 0
-                    beamformerOutput[indNegSign] = 0
-                ac[i] = beamformerOutput
-                fr[i] = 1
+        # only the eigenvalues from na upwards are calculated, na is the first
+        (eva_top, eve_top) = inputs.top_ev(self.freq_data.numchannels - na)
+        for ind in self._freq_batches(fr):
+            eva = array(eva_top[ind], dtype=self.precision)
+            eve = array(eve_top[ind], dtype=self._complex_precision)
+            beamformerOutput = beamformerFreq(param_steer_type, 
+                                              self.r_diag, 
+                                              normFactor, 
+                                              steer_vector(f[ind]), 
+                                              (eva[:, :1], eve[:, :, :1]))[0]
+            if self.r_diag:  # set (unphysical) negative output values to 0
+                indNegSign = sign(beamformerOutput) < 0
+                beamformerOutput[indNegSign] = 0
+            ac[ind] = beamformerOutput
+            fr[ind] = 1
 
 class BeamformerMusic( BeamformerEig ):
     """
@@ -893,7 +1372,7 @@ class BeamformerMusic( BeamformerEig ):
     n = Int(1, 
         desc="assumed number of sources")
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the MUSIC result for the frequencies defined by :attr:`freq_data`
         
@@ -914,26 +1393,34 @@ class BeamformerMusic( BeamformerEig ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
         nMics = self.freq_data.numchannels
         n = int(self.steer.mics.num_mics-self.na)
         normFactor = self.sig_loss_norm() * nMics**2
         param_steer_type, steer_vector = self._beamformer_params()
-        for i in self.freq_data.indices:
-            if not fr[i]:
-                eva = array(self.freq_data.eva[i], dtype='float64')
-                eve = array(self.freq_data.eve[i], dtype='complex128')
-                beamformerOutput = beamformerFreq(param_steer_type, 
-                                                  self.r_diag, 
-                                                  normFactor, 
-                                                  steer_vector(f[i]), 
-                                                  (eva[:n], eve[:, :n]))[0]
-                ac[i] = 4e-10*beamformerOutput.min() / beamformerOutput
-                fr[i] = 1
+        for ind in self._freq_batches(fr):
+            eva = array(inputs.eva[ind], dtype=self.precision)
+            eve = array(inputs.eve[ind], dtype=self._complex_precision)
+            beamformerOutput = beamformerFreq(param_steer_type, 
+                                              self.r_diag, 
+                                              normFactor, 
+                                              steer_vector(f[ind]), 
+                                              (eva[:, :n], eve[:, :, :n]))[0]
+            ac[ind] = 4e-10*beamformerOutput.min(1)[:, newaxis] / beamformerOutput
+            fr[ind] = 1
 
 class PointSpreadFunction (HasPrivateTraits):
     """
@@ -1048,7 +1535,8 @@ class PointSpreadFunction (HasPrivateTraits):
     #: * 'full': Calculate the full PSF (for all grid points) in one go (should be used if the PSF at all grid points is needed, as with :class:`DAMAS<BeamformerDamas>`)
     #: * 'single': Calculate the PSF for the grid points defined by :attr:`grid_indices`, one by one (useful if not all PSFs are needed, as with :class:`CLEAN<BeamformerClean>`)
     #: * 'block': Calculate the PSF for the grid points defined by :attr:`grid_indices`, in one go (useful if not all PSFs are needed, as with :class:`CLEAN<BeamformerClean>`)
-    #: * 'readonly': Do not attempt to calculate the PSF since it should already be cached (useful if multiple processes have to access the cache file)
+    #: * 'readonly': Do not attempt to calculate the PSF since it should already be cached (useful if multiple processes have to access the cache file).
+    #:   With ``config.cache_backend = 'directory'``, several processes can also calculate and cache PSFs at the same time.
     calcmode = Trait('single', 'block', 'full', 'readonly',
                      desc="mode of calculation / storage")
               
@@ -1106,6 +1594,7 @@ class PointSpreadFunction (HasPrivateTraits):
                                       (gs,),
                                       'int8',#'bool', 
                                       group)
+                self.h5f.complete_group(group)
         ac = self.h5f.get_data_by_reference('result','/'+nodename)
         gp = self.h5f.get_data_by_reference('gridpts','/'+nodename)
         return (ac,gp)        
@@ -1121,29 +1610,30 @@ class PointSpreadFunction (HasPrivateTraits):
 
         if not config.global_caching == 'none':
 #            print("get filecache..")
-            (ac,gp) = self._get_filecache()
-            if ac and gp: 
-#                print("cached data existent")
-                if not gp[:][self.grid_indices].all():
-#                    print("calculate missing results")                            
-                    if self.calcmode == 'readonly':
-                        raise ValueError('Cannot calculate missing PSF (points) in \'readonly\' mode.')
-                    if config.global_caching == 'readonly':
-                        (ac, gp) = (ac[:], gp[:])
-                        self.calc_psf(ac,gp)
-                        return ac[:,self.grid_indices]
-                    else:
-                        self.calc_psf(ac,gp)
-                        self.h5f.flush()
-                        return ac[:,self.grid_indices]
-#                else:
-#                    print("cached results are complete! return.")
-                return ac[:,self.grid_indices]
-            else: # no cached data/file
-#                print("no caching, calculate result")
-                ac = zeros((gs, gs), dtype=self.precision)
-                gp = zeros((gs,), dtype='int8')
-                self.calc_psf(ac,gp)
+            with _h5_lock:
+                (ac,gp) = self._get_filecache()
+                if ac is not None and gp is not None: 
+#                    print("cached data existent")
+                    if not gp[:][self.grid_indices].all():
+#                        print("calculate missing results")                            
+                        if self.calcmode == 'readonly':
+                            raise ValueError('Cannot calculate missing PSF (points) in \'readonly\' mode.')
+                        if config.global_caching == 'readonly':
+                            (ac, gp) = (ac[:], gp[:])
+                            self.calc_psf(ac,gp)
+                            return ac[:,self.grid_indices]
+                        else:
+                            self.calc_psf(ac,gp)
+                            self.h5f.flush()
+                            return ac[:,self.grid_indices]
+#                    else:
+#                        print("cached results are complete! return.")
+                    return ac[:,self.grid_indices]
+                else: # no cached data/file
+#                    print("no caching, calculate result")
+                    ac = zeros((gs, gs), dtype=self.precision)
+                    gp = zeros((gs,), dtype='int8')
+                    self.calc_psf(ac,gp)
         else: # no caching activated
 #            print("no caching activated, calculate result")
             ac = zeros((gs, gs), dtype=self.precision)
@@ -1171,14 +1661,14 @@ class PointSpreadFunction (HasPrivateTraits):
                 ac[:,ind] = self._psfCall([ind])[:,0]
                 gp[ind] = 1
         elif self.calcmode == 'full': # calculate all psfs in one go
-            gp[:] = 1
             ac[:] = self._psfCall(arange(self.steer.grid.size))
+            gp[:] = 1
         else: # 'block' # calculate selected psfs in one go
             hh = self._psfCall(g_ind_calc)
             indh = 0
             for ind in g_ind_calc:
-                gp[ind] = 1
                 ac[:,ind] = hh[:,indh]
+                gp[ind] = 1
                 indh += 1
 
     def _psfCall(self, ind):
@@ -1207,6 +1697,131 @@ class PointSpreadFunction (HasPrivateTraits):
             result = (product * product.conj()).real
         return result
 
+class PointSpreadFunctionOperator (HasPrivateTraits):
+    """
+    The point spread function as a linear operator.
+
+    Unlike :class:`PointSpreadFunction`, the PSF is never stored for all 
+    pairs of grid points, which would need [number of gridpoints]² values per
+    frequency. Instead, products of the PSF with vectors are calculated on the 
+    fly from the steering vectors and transfer functions of :attr:`steer`
+    with matrix products. Memory and computing time then scale with 
+    [number of gridpoints] x [number of mics]², which allows deconvolution on 
+    fine grids.
+    """
+
+    #: :class:`~acoular.fbeamform.SteeringVector` or derived object. 
+    #: Defaults to :class:`~acoular.fbeamform.SteeringVector` object.
+    steer = Instance(SteeringVector, ())
+
+    #: Frequency to evaluate the PSF for; defaults to 1.0. 
+    freq = Float(1.0, desc="frequency")
+
+    #: Floating point precision of the results. Corresponding to numpy dtypes. Default = 64 Bit.
+    precision = Trait('float64', 'float32',
+            desc="precision (32/64 Bit) of result, corresponding to numpy dtypes")
+
+    #: Shape (number of gridpoints, number of gridpoints) of the PSF; readonly.
+    shape = Property()
+
+    # steering vectors and transfer functions for freq
+    _vectors = Property(depends_on = ['steer.digest', 'freq'])
+
+    def _get_shape( self ):
+        gs = self.steer.grid.size
+        return (gs, gs)
+
+    @cached_property
+    def _get__vectors( self ):
+        return (self.steer.steer_vector(self.freq), self.steer.transfer(self.freq))
+
+    def matvec( self, x ):
+        """
+        Calculates the product of the PSF with a vector.
+
+        Parameters
+        ----------
+        x : array of floats
+            Source strengths at all grid points.
+
+        Returns
+        -------
+        array of floats
+            The beamforming map that the sources would produce, i.e. 
+            :math:`\\sum_s PSF_{g,s} x_s` for all grid points g.
+        """
+        (h, a) = self._vectors
+        # cross spectral matrix of the sources x
+        csm = dot(a.T * x, a.conj())
+        return einsum('gm,gm->g', dot(h.conj(), csm), h).real.astype(self.precision)
+
+    def rmatvec( self, x ):
+        """
+        Calculates the product of the transposed PSF with a vector.
+
+        Parameters
+        ----------
+        x : array of floats
+            Values at all grid points.
+
+        Returns
+        -------
+        array of floats
+            :math:`\\sum_g PSF_{g,s} x_g` for all grid points s.
+        """
+        (h, a) = self._vectors
+        hh = dot(h.T.conj() * x, h)
+        return einsum('sm,sm->s', dot(a, hh), a.conj()).real.astype(self.precision)
+
+    def psf( self, ind ):
+        """
+        Calculates the PSF for some grid points assumed to be sources.
+
+        Parameters
+        ----------
+        ind : array of ints
+            Indices of the source grid points.
+
+        Returns
+        -------
+        array of floats
+            The PSF of shape [number of gridpoints, len(ind)], same as
+            :attr:`PointSpreadFunction.psf` with :attr:`~PointSpreadFunction.grid_indices` = ind.
+        """
+        (h, a) = self._vectors
+        product = dot(h.conj(), a[ind].T)
+        return (product * product.conj()).real.astype(self.precision)
+
+    def norm( self, n_iter=20 ):
+        """
+        Estimates the spectral norm (largest singular value) of the PSF 
+        by power iteration.
+
+        Parameters
+        ----------
+        n_iter : int
+            Number of iterations, defaults to 20.
+
+        Returns
+        -------
+        float
+        """
+        v = ones(self.shape[1])
+        sigma = 0.
+        for i in range(n_iter):
+            w = self.rmatvec(self.matvec(v))
+            sigma = sqrt(norm(w) / norm(v))
+            v = w / norm(w)
+        return sigma
+
+    def aslinearoperator( self ):
+        """
+        Returns the PSF as :class:`scipy.sparse.linalg.LinearOperator`.
+        """
+        return LinearOperator(self.shape, matvec=self.matvec, 
+                              rmatvec=self.rmatvec, dtype=self.precision)
+
+
 class BeamformerDamas (BeamformerBase):
     """
     DAMAS deconvolution, see :ref:`Brooks and Humphreys, 2006<BrooksHumphreys2006>`.
@@ -1243,14 +1858,45 @@ class BeamformerDamas (BeamformerBase):
     damp = Float(1.0,
                           desc="damping factor in modified gauss-seidel-DAMAS-approach")
 
+    #: Tolerance for the 'parallel' :attr:`solver`, defaults to 0.
+    #: The iterations stop before :attr:`n_iter` is reached if the largest 
+    #: change of the result in one iteration is smaller than tol times the 
+    #: largest value of the result. With 0, all :attr:`n_iter` iterations are done.
+    tol = Float(0.0,
+                desc="relative tolerance for the parallel solver")
+
     #: Flag that defines how to calculate and store the point spread function, 
     #: defaults to 'full'. See :attr:`PointSpreadFunction.calcmode` for details.
-    calcmode = Trait('full', 'single', 'block', 'readonly',
+    #: With 'operator', the PSF is not stored at all, but applied on the fly 
+    #: by a :class:`PointSpreadFunctionOperator` (for fine grids). As single 
+    #: PSF rows are not available then, the Gauss-Seidel iterations are 
+    #: replaced by accelerated projected gradient (FISTA) iterations that 
+    #: solve the same non-negative least squares problem, with :attr:`damp` 
+    #: as relative step size.
+    calcmode = Trait('full', 'single', 'block', 'readonly', 'operator',
                      desc="mode of psf calculation / storage")
+
+    #: Solver for the DAMAS system of equations, defaults to 'gauss-seidel'.
+    #: 'parallel' does the same Gauss-Seidel iterations, but distributes the 
+    #: sums over the grid points of each sweep on all cores and stops early 
+    #: with :attr:`tol`.
+    #: With 'damas2', the PSF is assumed to be shift-invariant, see 
+    #: :ref:`Dougherty, 2005<Dougherty2005>`. Then only a single PSF for 
+    #: a source at the grid centre is calculated and the convolution with 
+    #: the source map is done by 2D FFT. This needs a planar 
+    #: :class:`~acoular.grids.RectGrid` and is a good approximation for maps 
+    #: far from the array. :attr:`calcmode` is ignored in this case.
+    solver = Trait('gauss-seidel', 'parallel', 'damas2',
+                   desc="solver for the DAMAS system of equations")
+
+    # solver identifier, empty for the Gauss-Seidel iterations so that 
+    # digests of existing results do not change
+    _solver = Property(depends_on = ['calcmode', 'solver', 'tol'])
     
     # internal identifier
     digest = Property( 
-        depends_on = ['beamformer.digest', 'n_iter', 'damp', 'psf_precision'], 
+        depends_on = ['beamformer.digest', 'n_iter', 'damp', 'psf_precision', 
+                      '_solver'], 
         )
 
     # internal identifier
@@ -1258,6 +1904,16 @@ class BeamformerDamas (BeamformerBase):
         depends_on = ['digest', 'beamformer.ext_digest'], 
         )
     
+    @cached_property
+    def _get__solver( self ):
+        if self.solver == 'damas2':
+            return 'damas2'
+        if self.calcmode == 'operator':
+            return 'operator'
+        if self.solver == 'parallel':
+            return 'parallel_%s' % self.tol
+        return ''
+
     @cached_property
     def _get_digest( self ):
         return digest( self )
@@ -1265,15 +1921,69 @@ class BeamformerDamas (BeamformerBase):
     @cached_property
     def _get_ext_digest( self ):
         return digest( self, 'ext_digest' )
-    
-    def calc(self, ac, fr):
+
+    def _get_psf_object( self ):
+        if self.calcmode == 'operator':
+            return PointSpreadFunctionOperator(steer=self.steer, precision=self.psf_precision)
+        return PointSpreadFunction(steer=self.steer, calcmode=self.calcmode, precision=self.psf_precision)
+
+    def _solve_operator( self, op, y ):
+        """
+        Solves PSF * x = y for x >= 0 in the least squares sense with
+        :attr:`n_iter` FISTA iterations, using only products with the PSF.
+        """
+        step = self.damp / op.norm()**2
+        x = clip(y, 0, None)
+        z = x.copy()
+        t = 1.
+        for i in range(self.n_iter):
+            x_new = clip(z - step * op.rmatvec(op.matvec(z) - y), 0, None)
+            t_new = (1 + sqrt(1 + 4 * t * t)) / 2
+            z = x_new + (t - 1) / t_new * (x_new - x)
+            (x, t) = (x_new, t_new)
+        return x
+
+    def _psf_kernel( self, f ):
+        """
+        Calculates the PSF of a source at the grid centre as 2D map.
+        Only this single PSF column is evaluated and it is not cached, so 
+        that no [number of gridpoints]² array is needed.
+        """
+        g = self.steer.grid
+        (nx, ny) = g.shape
+        p = PointSpreadFunction(steer=self.steer, precision=self.psf_precision, 
+                                freq=f)
+        return p._psfCall(array([(nx//2)*ny + ny//2]))[:, 0].reshape(nx, ny)
+
+    def _solve_damas2( self, kernel, y ):
+        """
+        DAMAS2 iterations for a shift-invariant PSF given by *kernel*, the 
+        PSF of a source at the grid centre. The convolution of the source map 
+        with the kernel is done by 2D FFT with zero padding, so that there is 
+        no wrap-around at the grid borders.
+        """
+        (nx, ny) = kernel.shape
+        s = (2*nx, 2*ny)
+        kf = fft.rfft2(kernel, s)
+        a = abs(kernel).sum()
+        y = y.reshape(nx, ny)
+        x = zeros((nx, ny), dtype=y.dtype)
+        for i in range(self.n_iter):
+            r = fft.irfft2(fft.rfft2(x, s) * kf, s)[nx//2:nx//2+nx, ny//2:ny//2+ny]
+            x = clip(x + self.damp * (y - r) / a, 0, None)
+        return x.reshape(-1)
+    
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the DAMAS result for the frequencies defined by :attr:`freq_data`
         
         This is an internal helper function that is automatically called when 
         accessing the beamformer's :attr:`~BeamformerBase.result` or calling
         its :meth:`~BeamformerBase.synthetic` method.        
-        A Gauss-Seidel algorithm implemented in C is used for computing the result.
+        A Gauss-Seidel algorithm implemented in C is used for computing the result
+        (running on all cores if :attr:`solver` is 'parallel', FISTA 
+        iterations if :attr:`calcmode` is 'operator', FFT-based DAMAS2 
+        iterations if :attr:`solver` is 'damas2').
         
         Parameters
         ----------
@@ -1288,19 +1998,43 @@ class BeamformerDamas (BeamformerBase):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
-        p = PointSpreadFunction(steer=self.steer, calcmode=self.calcmode, precision=self.psf_precision)
+        if self.solver == 'damas2':
+            g = self.steer.grid
+            if not isinstance(g, RectGrid) or isinstance(g, RectGrid3D):
+                raise ValueError("Solver 'damas2' needs a planar RectGrid, "
+                                 "got %s." % type(g).__name__)
+        else:
+            p = self._get_psf_object()
         for i in self.freq_data.indices:
             if not fr[i]:
-                y = array(self.beamformer.result[i])
-                x = y.copy()
-                p.freq = f[i]
-                psf = p.psf[:]
-                damasSolverGaussSeidel(psf, y, self.n_iter, self.damp, x)
+                y = array(inputs.result[i])
+                if self.solver == 'damas2':
+                    x = self._solve_damas2(self._psf_kernel(f[i]), y)
+                elif self.calcmode == 'operator':
+                    p.freq = f[i]
+                    x = self._solve_operator(p, y)
+                else:
+                    x = y.copy()
+                    p.freq = f[i]
+                    psf = p.psf[:]
+                    if self.solver == 'parallel':
+                        damasSolverBlockGaussSeidel(psf, y, self.n_iter, self.damp, self.tol, x)
+                    else:
+                        damasSolverGaussSeidel(psf, y, self.n_iter, self.damp, x)
                 ac[i] = x
                 fr[i] = 1
 
@@ -1343,7 +2077,7 @@ class BeamformerDamasPlus (BeamformerDamas):
     # internal identifier
     digest = Property( 
         depends_on = ['beamformer.digest','alpha', 'method', 
-                      'max_iter', 'unit_mult'], 
+                      'max_iter', 'unit_mult', '_solver'], 
         )
 
     # internal identifier
@@ -1359,7 +2093,7 @@ class BeamformerDamasPlus (BeamformerDamas):
     def _get_ext_digest( self ):
         return digest( self, 'ext_digest' )
     
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the DAMAS result for the frequencies defined by :attr:`freq_data`
         
@@ -1380,17 +2114,36 @@ class BeamformerDamasPlus (BeamformerDamas):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
-        p = PointSpreadFunction(steer=self.steer, calcmode=self.calcmode, precision=self.psf_precision)
+        if self.calcmode == 'operator' and self.method != 'NNLS':
+            raise ValueError("Method '%s' needs the full PSF and can not be "
+                             "used with calcmode 'operator'." % self.method)
+        p = self._get_psf_object()
         unit = self.unit_mult
         for i in self.freq_data.indices:
             if not fr[i]:
-                y = self.beamformer.result[i] * unit
+                y = inputs.result[i] * unit
                 p.freq = f[i]
+
+                if self.calcmode == 'operator': # NNLS with matrix-free solver
+                    resopt = lsq_linear(p.aslinearoperator(), y, bounds=(0, inf),
+                                        lsq_solver='lsmr', max_iter=self.max_iter).x
+                    ac[i] = resopt / unit
+                    fr[i] = 1
+                    continue
                 psf = p.psf[:]
 
                 if self.method == 'NNLS':
@@ -1472,6 +2225,14 @@ class BeamformerOrth (BeamformerBase):
         """ sets the list of eigenvalues to consider """
         self.eva_list = arange(-1, -1-self.n, -1)
 
+    def _calc_frequencies( self, ac, fr ):
+        """
+        Calls :meth:`calc` for all missing frequencies. They are always 
+        calculated serially, regardless of :attr:`executor`, as the 
+        eigenvalue beamformer is modified during the calculation.
+        """
+        self.calc(ac, fr)
+
     def calc(self, ac, fr):
         """
         Calculates the Orthogonal Beamforming result for the frequencies 
@@ -1505,10 +2266,13 @@ class BeamformerOrth (BeamformerBase):
                 ii.append(i)
         numchannels = self.freq_data.numchannels
         e = self.beamformer
+        # only the largest eigenvalues down to the smallest in eva_list are needed
+        k = numchannels - min((n % numchannels for n in self.eva_list), default=numchannels)
+        eva = e.freq_data.top_ev(k)[0]
         for n in self.eva_list:
             e.n = n
             for i in ii:
-                ac[i, e.result[i].argmax()]+=e.freq_data.eva[i, n]/numchannels
+                ac[i, e.result[i].argmax()]+=eva[i, n % numchannels - numchannels + k]/numchannels
         for i in ii:
             fr[i] = 1
     
@@ -1542,7 +2306,7 @@ class BeamformerCleansc( BeamformerBase ):
     def _get_digest( self ):
         return digest( self )
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the CLEAN-SC result for the frequencies defined by :attr:`freq_data`
         
@@ -1563,10 +2327,19 @@ class BeamformerCleansc( BeamformerBase ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
 
         # prepare calculation
         normFactor = self.sig_loss_norm()
@@ -1583,13 +2356,20 @@ class BeamformerCleansc( BeamformerBase ):
         param_steer_type, steer_vector = self._beamformer_params()
         for i in self.freq_data.indices:
             if not fr[i]:
-                csm = array(self.freq_data.csm[i], dtype='complex128', copy=1)
+                csm = array(inputs.csm[i], dtype='complex128', copy=1)
                 #h = self.steer._beamformerCall(f[i], self.r_diag, normFactor, (csm,))[0]
                 h = beamformerFreq(param_steer_type, 
                                    self.r_diag, 
                                    normFactor, 
                                    steer_vector(f[i]), 
                                    csm)[0]
+                # steering vectors of all grid points as used by beamformerFreq 
+                # for h, calculated once per frequency
+                if param_steer_type == 'custom':
+                    W = array(steer_vector(f[i]), dtype='complex128')
+                else:
+                    W = beamformerSteerVectors(param_steer_type, *steer_vector(f[i]))
+                W2 = (W*W.conj()).real
                 # CLEANSC Iteration
                 result *= 0.0
                 for j in range(J):
@@ -1598,24 +2378,17 @@ class BeamformerCleansc( BeamformerBase ):
                     result[xi_max] += self.damp * hmax
                     if  j > self.stopn and hmax > powers[j-self.stopn]:
                         break
-                    wmax = self.steer.steer_vector(f[i],xi_max) * sqrt(normFac)
-                    wmax = wmax[0].conj()  # as old code worked with conjugated csm..should be updated
-                    hh = wmax.copy()
+                    wmax = self.steer.steer_vector(f[i], xi_max)[0] * sqrt(normFac)
+                    wmax = wmax.conj()  # as old code worked with conjugated csm..should be updated
                     D1 = dot(csm.T - diag(diag(csm)), wmax)/hmax
-                    ww = wmax.conj()*wmax
-                    for m in range(20):
-                        H = hh.conj()*hh
-                        hh = (D1+H*wmax)/sqrt(1+dot(ww, H))
-                    hh = hh[:, newaxis]
-                    csm1 = hmax*(hh*hh.conj().T)
-                    
-                    #h1 = self.steer._beamformerCall(f[i], self.r_diag, normFactor, (array((hmax, ))[newaxis, :], hh[newaxis, :].conjugate()))[0]
-                    h1 = beamformerFreq(param_steer_type, 
-                                        self.r_diag, 
-                                        normFactor, 
-                                        steer_vector(f[i]), 
-                                        (array((hmax, )), hh.conj()))[0]
-                    h -= self.damp * h1
+                    hh = cleanscCoherentVector(D1, wmax, 20)
+                    csm1 = hmax*(hh[:, newaxis]*hh.conj())
+                    # beamforming map of the coherent source, a rank-one update 
+                    # (same as beamformerFreq with eigenvalue hmax and eigenvector hh*)
+                    h1 = absolute(dot(W, hh))**2
+                    if self.r_diag:
+                        h1 -= dot(W2, (hh*hh.conj()).real)
+                    h -= self.damp * (h1 * hmax * normFactor)
                     csm -= self.damp * csm1.T#transpose(0,2,1)
                 ac[i] = result
                 fr[i] = 1
@@ -1655,8 +2428,9 @@ class BeamformerClean (BeamformerBase):
     n_iter = Int(100, 
         desc="maximum number of iterations")
 
-    # how to calculate and store the psf
-    calcmode = Trait('block', 'full', 'single', 'readonly',
+    # how to calculate and store the psf, 'operator' calculates the needed 
+    # psfs on the fly without storing them (see PointSpreadFunctionOperator)
+    calcmode = Trait('block', 'full', 'single', 'readonly', 'operator',
                      desc="mode of psf calculation / storage")
                      
     # internal identifier
@@ -1677,7 +2451,7 @@ class BeamformerClean (BeamformerBase):
     def _get_ext_digest( self ):
         return digest( self, 'ext_digest' )
     
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the CLEAN result for the frequencies defined by :attr:`freq_data`
         
@@ -1698,21 +2472,33 @@ class BeamformerClean (BeamformerBase):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         f = self.freq_data.fftfreq()
         gs = self.steer.grid.size
         
         if self.calcmode == 'full':
             warn("calcmode = 'full', possibly slow CLEAN performance. "
                  "Better use 'block' or 'single'.", Warning, stacklevel = 2)
-        p = PointSpreadFunction(steer=self.steer, calcmode=self.calcmode, precision=self.psf_precision)
+        if self.calcmode == 'operator':
+            p = PointSpreadFunctionOperator(steer=self.steer, precision=self.psf_precision)
+        else:
+            p = PointSpreadFunction(steer=self.steer, calcmode=self.calcmode, precision=self.psf_precision)
         for i in self.freq_data.indices:
             if not fr[i]:
                 p.freq = f[i]
-                dirty = self.beamformer.result[i].copy()
+                dirty = inputs.result[i].copy()
                 clean = zeros(gs, dtype=dirty.dtype)
                 
                 i_iter = 0
@@ -1721,8 +2507,11 @@ class BeamformerClean (BeamformerBase):
                     # TODO: negative werte!!!
                     dirty_sum = abs(dirty).sum(0)
                     next_max = dirty.argmax(0)
-                    p.grid_indices = array([next_max])
-                    psf = p.psf.reshape(gs,)
+                    if self.calcmode == 'operator':
+                        psf = p.psf([next_max]).reshape(gs,)
+                    else:
+                        p.grid_indices = array([next_max])
+                        psf = p.psf.reshape(gs,)
                     new_amp = self.damp * dirty[next_max] #/ psf[next_max]
                     clean[next_max] += new_amp
                     dirty -= psf * new_amp
@@ -1745,8 +2534,15 @@ class BeamformerCMF ( BeamformerBase ):
     #: These methods are implemented in 
     #: the `scikit-learn <http://scikit-learn.org/stable/user_guide.html>`_ 
     #: module.
+    #: 'FISTA_numba' uses a FISTA solver with non-negativity constraint
+    #: and :attr:`alpha` as L1 weight, that works directly on the transfer 
+    #: functions instead of their Kronecker products (see 
+    #: :func:`~acoular.fastFuncs.cmfSolverFISTA`). It is started from the 
+    #: result for the previous frequency, if available, and stops early if 
+    #: the result does not change anymore.
     method = Trait('LassoLars', 'LassoLarsBIC',  \
-        'OMPCV', 'NNLS','fmin_l_bfgs_b','Split_Bregman','FISTA', desc="fit method used")
+        'OMPCV', 'NNLS','fmin_l_bfgs_b','Split_Bregman','FISTA', 'FISTA_numba',
+        desc="fit method used")
         
     #: Weight factor for LassoLars method,
     #: defaults to 0.0.
@@ -1783,7 +2579,7 @@ class BeamformerCMF ( BeamformerBase ):
         return digest( self )
    
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the CMF result for the frequencies defined by :attr:`freq_data`
         
@@ -1804,10 +2600,19 @@ class BeamformerCMF ( BeamformerBase ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         
         # function to repack complex matrices to deal with them in real number space
         def realify(M):
@@ -1823,7 +2628,12 @@ class BeamformerCMF ( BeamformerBase ):
 
         for i in self.freq_data.indices:        
             if not fr[i]:
-                csm = array(self.freq_data.csm[i], dtype='complex128',copy=1)
+                csm = array(inputs.csm[i], dtype='complex128',copy=1)
+
+                if self.method == 'FISTA_numba':
+                    ac[i] = self._fista_numba(ac, fr, i, csm)
+                    fr[i] = 1
+                    continue
 
                 h = self.steer.transfer(f[i]).T
                 
@@ -1916,6 +2726,26 @@ class BeamformerCMF ( BeamformerBase ):
                         model.fit(A,R[:,0])
                     ac[i] = model.coef_[:] / unit
                 fr[i] = 1
+
+    def _fista_numba(self, ac, fr, i, csm):
+        """
+        Returns the CMF result for frequency index `i` from the numba FISTA 
+        solver, warm-started with the result at index i-1 if that is available.
+        """
+        unit = self.unit_mult
+        h = array(self.steer.transfer(self.freq_data.fftfreq()[i]), dtype='complex128')
+        nc = h.shape[1]
+        # entries of the upper triangular csm enter the fit once, so weight 
+        # the full off-diagonal part by 0.5
+        weight = full((nc, nc), 0.5)
+        fill_diagonal(weight, 0.0 if self.r_diag else 1.0)
+        if i > 0 and fr[i-1]:
+            x = array(ac[i-1], dtype='float64') * unit
+        else:
+            x = zeros(h.shape[0])
+        cmfSolverFISTA(h, csm * unit, weight, self.alpha * unit, 
+                       self.max_iter, 1e-10, x)
+        return x / unit
                 
 
 
@@ -1995,11 +2825,13 @@ class BeamformerSODIX( BeamformerBase ):
                     self.h5f.create_compressible_array('result',
                                           (numfreq, self.steer.grid.size*self.steer.mics.num_mics),
                                           self.precision,
-                                          group)
+                                          group,
+                                          chunkshape=(1, self.steer.grid.size*self.steer.mics.num_mics))
                     self.h5f.create_compressible_array('freqs',
                                           (numfreq, ),
                                           'int8',#'bool', 
                                           group)
+                    self.h5f.complete_group(group)
             ac = self.h5f.get_data_by_reference('result','/'+nodename)
             fr = self.h5f.get_data_by_reference('freqs','/'+nodename)
             return (ac,fr)    
@@ -2021,21 +2853,21 @@ class BeamformerSODIX( BeamformerBase ):
                     (config.global_caching == 'individual' and self.cached == False)
                 ):
                 (ac,fr) = self._get_filecache() 
-                if ac and fr: 
+                if ac is not None and fr is not None: 
                     if not fr[f.ind_low:f.ind_high].all():                       
                         if config.global_caching == 'readonly': 
-                            (ac, fr) = (ac[:], fr[:])
-                        self.calc(ac,fr)
+                            (ac, fr) = self._readonly_copy(ac, fr)
+                        self._calc_frequencies(ac,fr)
                         self.h5f.flush()
 
                 else:
                     ac = zeros((numfreq, self.steer.grid.size*self.steer.mics.num_mics), dtype=self.precision)
                     fr = zeros(numfreq, dtype='int8')
-                    self.calc(ac,fr)
+                    self._calc_frequencies(ac,fr)
             else:
                 ac = zeros((numfreq, self.steer.grid.size*self.steer.mics.num_mics), dtype=self.precision)
                 fr = zeros(numfreq, dtype='int8')
-                self.calc(ac,fr)
+                self._calc_frequencies(ac,fr)
         return ac
     
     def synthetic( self, f, num=0):
@@ -2118,7 +2950,7 @@ class BeamformerSODIX( BeamformerBase ):
         return h.reshape([self.steer.grid.size,self.steer.mics.num_mics])
    
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         """
         Calculates the SODIX result for the frequencies defined by :attr:`freq_data`
         
@@ -2139,10 +2971,19 @@ class BeamformerSODIX( BeamformerBase ):
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
         """
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         
         # prepare calculation
         i = self.freq_data.indices
@@ -2155,11 +2996,12 @@ class BeamformerSODIX( BeamformerBase ):
             if not fr[i]:
                 
                 #measured csm
-                csm = array(self.freq_data.csm[i], dtype='complex128',copy=1) 
+                csm = array(inputs.csm[i], dtype='complex128',copy=1) 
                 #transfer function
-                h = self.steer.transfer(f[i]).T           
+                h = array(self.steer.transfer(f[i]), dtype='complex128')
                    
                 if self.method == 'fmin_l_bfgs_b':
+                    derdrl = zeros((numpoints, num_mics))
                     #function to minimize
                     def function(D): 
                         '''
@@ -2176,16 +3018,16 @@ class BeamformerSODIX( BeamformerBase ):
                             [num_mics*numpoints].
 
                         '''           
-                        #### the sodix function ####
-                        Djm = D.reshape([numpoints,num_mics])                           
-                        csmmod = einsum('jm,jm,jn,jn->mn',h.T,Djm,Djm,h.T.conj() )        
-                        func = sum(absolute((csm - csmmod)))**2 + self.alpha*norm(Djm,self.pnorm)
-                        ####the sodix  derivitaive ####
-                        inner = csm - einsum('jl,jl,jm,jm->lm',h.T,Djm,Djm,h.T.conj() )      
-                        derdrl = -4 *  Djm * real(einsum('rm,rl,lm->rl',h.T,h.T.conj(),inner)) + \
+                        #### the sodix function and derivative ####
+                        Djm = D.reshape([numpoints,num_mics])
+                        # data term, computed in O(numpoints*num_mics) memory
+                        func = sodixCostGradient(h, Djm, csm, derdrl)
+                        #### regularization ####
+                        func += self.alpha*norm(Djm,self.pnorm)
+                        der = derdrl + \
                             self.alpha * (abs(Djm)/norm(Djm,self.pnorm))**(1-self.pnorm)*sign(Djm)
 
-                        return  func, derdrl[:].flatten()  #func[0]
+                        return  func, der.flatten()  #func[0]
                     
                     ##### initial guess #### 
                     if all(ac[(i-1)]==0):
@@ -2265,13 +3107,23 @@ class BeamformerGIB(BeamformerEig):  #BeamformerEig #BeamformerBase
                       desc = "First eigenvalue to consider")
     
     
+    # revision of the 'Suzuki' and 'InverseIRLS' calculation, so that results
+    # cached by former versions are not used, empty for the other methods
+    _revision = Property(depends_on = ['method'])
+
     # internal identifier++++++++++++++++++++++++++++++++++++++++++++++++++
     digest = Property( 
         depends_on = ['steer.inv_digest', 'freq_data.digest', \
             'alpha', 'method', 'max_iter', 'unit_mult', 'eps_perc',\
-            'pnorm', 'beta','n', 'm'], 
+            'pnorm', 'beta','n', 'm', '_revision'], 
         )
 
+    @cached_property
+    def _get__revision( self ):
+        if self.method in ('Suzuki', 'InverseIRLS'):
+            return 'r2'
+        return ''
+
     @cached_property
     def _get_digest( self ):
         return digest( self )
@@ -2284,7 +3136,7 @@ class BeamformerGIB(BeamformerEig):  #BeamformerEig #BeamformerBase
             na = max(nm + na, 0)
         return min(nm - 1, na)
 
-    def calc(self, ac, fr):
+    def calc(self, ac, fr, inputs=None):
         
         """
         Calculates the result for the frequencies defined by :attr:`freq_data`
@@ -2306,114 +3158,167 @@ class BeamformerGIB(BeamformerEig):  #BeamformerEig #BeamformerBase
             After the calculation at a certain frequency the value will be set
             to 'True'
         
+        inputs : (optional) object
+            Provides the frequency dependent inputs (cross spectral matrix, 
+            eigenvalues and eigenvectors, result of :attr:`beamformer`), 
+            which are taken from :attr:`freq_data` or :attr:`beamformer` if 
+            not set. Set by :meth:`_calc_frequencies` for the calculation 
+            with several workers.
+        
         Returns
         -------
         This method only returns values through the *ac* and *fr* parameters
 
         """        
+        if inputs is None:
+            inputs = _BeamformerInputs(self)
         # prepare calculation
         f = self.freq_data.fftfreq()
         n = int(self.na)   #number of eigenvalues
         m = int(self.m)    #number of first eigenvalue
-        numchannels = self.freq_data.numchannels   #number of channels
         numpoints = self.steer.grid.size
-        hh = zeros((1, numpoints, numchannels), dtype='D')
+        (eva_top, eve_top) = inputs.top_ev(n+m)
         
         #Generate a cross spectral matrix, and perform the eigenvalue decomposition
         for i in self.freq_data.indices:        
             if not fr[i]:
                 #for monopole and source strenght Q needs to define density
                 #calculate a transfer matrix A 
-                hh = self.steer.transfer(f[i])
-                A=hh.T                 
-                #eigenvalues and vectors               
-                csm = array(self.freq_data.csm[i], dtype='complex128',copy=1)
-                eva,eve=eigh(csm)
-                eva = eva[::-1]
-                eve = eve[:, ::-1] 
+                A = self.steer.transfer(f[i]).T
+                #eigenvalues and vectors, only the n+m largest are needed
+                eva = array(eva_top[i], dtype='float64')[::-1]
+                eve = array(eve_top[i], dtype='complex128')[:, ::-1]
                 eva[eva < max(eva)/1e12] = 0 #set small values zo 0, lowers numerical errors in simulated data
                 #init sources    
                 qi=zeros([n+m,numpoints], dtype='complex128')
+                locpoints=arange(numpoints)
                 #Select the number of coherent modes to be processed referring to the eigenvalue distribution.
-                #for s in arange(n):  
+                modes = []
                 for s in list(range(m,n+m)):
                     if eva[s] > 0:                    
-                        #Generate the corresponding eigenmodes
-                        emode=array(sqrt(eva[s])*eve[:,s], dtype='complex128')
-                        # choose method for computation
-                        if self.method == 'Suzuki':
-                            leftpoints=numpoints
-                            locpoints=arange(numpoints)         
-                            weights=diag(ones(numpoints))             
-                            epsilon=arange(self.max_iter)              
-                            for it in arange(self.max_iter): 
-                                if numchannels<=leftpoints:
-                                    AWA= dot(dot(A[:,locpoints],weights),A[:,locpoints].conj().T)
-                                    epsilon[it] = max(absolute(eigvals(AWA)))*self.eps_perc
-                                    qi[s,locpoints]=dot(dot(dot(weights,A[:,locpoints].conj().T),inv(AWA+eye(numchannels)*epsilon[it])),emode)
-                                elif numchannels>leftpoints:
-                                    AA=dot(A[:,locpoints].conj().T,A[:,locpoints])
-                                    epsilon[it] = max(absolute(eigvals(AA)))*self.eps_perc
-                                    qi[s,locpoints]=dot(dot(inv(AA+inv(weights)*epsilon[it]),A[:,locpoints].conj().T),emode)                                                       
-                                if self.beta < 1 and it > 1:   
-                                    #Reorder from the greatest to smallest magnitude to define a reduced-point source distribution , and reform a reduced transfer matrix 
-                                    leftpoints=int(round(numpoints*self.beta**(it+1)))                                                                                          
-                                    idx = argsort(abs(qi[s,locpoints]))[::-1]   
-                                    #print(it, leftpoints, locpoints, idx )
-                                    locpoints= delete(locpoints,[idx[leftpoints::]])             
-                                    qix=zeros([n+m,leftpoints], dtype='complex128')                      
-                                    qix[s,:]=qi[s,locpoints]
-                                    #calc weights for next iteration 
-                                    weights=diag(absolute(qix[s,:])**(2-self.pnorm))    
-                                else:                          
-                                    weights=diag((absolute(qi[s,:])**(2-self.pnorm)))    
-                             
-                        elif self.method == 'InverseIRLS':                         
-                            weights=eye(numpoints)
-                            locpoints=arange(numpoints)
-                            for it in arange(self.max_iter): 
-                                if numchannels<=numpoints: 
-                                    wtwi=inv(dot(weights.T,weights))  
-                                    aH=A.conj().T                       
-                                    qi[s,:]=dot(dot(wtwi,aH),dot(inv(dot(A,dot(wtwi,aH))),emode))                            
-                                    weights=diag(absolute(qi[s,:])**((2-self.pnorm)/2))
-                                    weights=weights/sum(absolute(weights))                                 
-                                elif numchannels>numpoints:
-                                    wtw=dot(weights.T,weights)
-                                    qi[s,:]= dot(dot(inv(dot(dot(A.conj.T,wtw),A)),dot( A.conj().T,wtw)) ,emode)
-                                    weights=diag(absolute(qi[s,:])**((2-self.pnorm)/2))
-                                    weights=weights/sum(absolute(weights))                  
-                        else:
-                            locpoints=arange(numpoints) 
-                            unit = self.unit_mult
-                            AB = vstack([hstack([A.real,-A.imag]),hstack([A.imag,A.real])])
-                            R  = hstack([emode.real.T,emode.imag.T]) * unit
-                            if self.method == 'LassoLars':
-                                model = LassoLars(alpha=self.alpha * unit,max_iter=self.max_iter)
-                            elif self.method == 'LassoLarsBIC':
-                                model = LassoLarsIC(criterion='bic',max_iter=self.max_iter)
-                            elif self.method == 'OMPCV':
-                                model = OrthogonalMatchingPursuitCV()
-                            elif self.method == 'LassoLarsCV':
-                                model = LassoLarsCV()                        
-                            if self.method == 'NNLS':
-                                x , zz = nnls(AB,R)
-                                qi_real,qi_imag = hsplit(x/unit, 2) 
-                            else:
-                                with warnings.catch_warnings():
-                                    warnings.simplefilter("ignore", category=FutureWarning)
-                                    model.fit(AB,R)
-                                qi_real,qi_imag = hsplit(model.coef_[:]/unit, 2)
-                            #print(s,qi.size)    
-                            qi[s,locpoints] = qi_real+qi_imag*1j
+                        modes.append(s)
                     else:
                         warn('Eigenvalue %g <= 0 for frequency index %g. Will not be calculated!' % (s, i),Warning, stacklevel = 2)
-                    #Generate source maps of all selected eigenmodes, and superpose source intensity for each source type.
+                #Generate the corresponding eigenmodes, the modes are independent 
+                #and are processed in parallel
+                emodes = [array(sqrt(eva[s])*eve[:,s], dtype='complex128') for s in modes]
+                with ThreadPoolExecutor(max(1, min(len(modes), cpu_count()))) as pool:
+                    results = list(pool.map(lambda emode: self._calc_mode(A, emode), emodes))
+                for s, (q, locpoints) in zip(modes, results):
+                    qi[s] = q
+                #Generate source maps of all selected eigenmodes, and superpose source intensity for each source type.
                 temp = zeros(numpoints)
                 temp[locpoints] = sum(absolute(qi[:,locpoints])**2,axis=0)
                 ac[i] = temp
                 fr[i] = 1    
 
+    def _calc_mode(self, A, emode):
+        """
+        Calculates the source distribution for one eigenmode `emode` with 
+        transfer matrix `A` (shape [number of channels, number of gridpoints]). 
+        Returns the source distribution and the indices of the gridpoints 
+        that are kept as sources.
+        """
+        numchannels, numpoints = A.shape
+        qi = zeros(numpoints, dtype='complex128')
+        locpoints = arange(numpoints)
+        # weights are kept as vectors, i.e. diagonals of the weight matrices
+        if self.method == 'Suzuki':
+            leftpoints=numpoints
+            weights=ones(numpoints)
+            for it in arange(self.max_iter): 
+                Al = A[:,locpoints]
+                AlH = Al.conj().T
+                if numchannels<=leftpoints:
+                    AWA = dot(Al*weights,AlH)
+                    epsilon = _max_eigenvalue(AWA)*self.eps_perc
+                    qi[locpoints] = weights*dot(AlH,_solve_hpd(AWA, epsilon, emode))
+                elif numchannels>leftpoints:
+                    # (AA + eps*inv(W))^-1 = sW (sW*AA*sW + eps*I)^-1 sW with 
+                    # sW = sqrt(W), so that zero weights need no inversion
+                    AA = dot(AlH,Al)
+                    epsilon = _max_eigenvalue(AA)*self.eps_perc
+                    sw = sqrt(weights)
+                    qi[locpoints] = sw*_solve_hpd(sw[:,newaxis]*AA*sw, epsilon, sw*dot(AlH,emode))
+                if self.beta < 1 and it > 1:   
+                    #Reorder from the greatest to smallest magnitude to define a reduced-point source distribution , and reform a reduced transfer matrix 
+                    leftpoints=int(round(numpoints*self.beta**(it+1)))                                                                                          
+                    idx = argsort(abs(qi[locpoints]))[::-1]   
+                    locpoints= delete(locpoints,[idx[leftpoints::]])             
+                    #calc weights for next iteration 
+                    weights=absolute(qi[locpoints])**(2-self.pnorm)
+                else:                          
+                    weights=absolute(qi)**(2-self.pnorm)
+                             
+        elif self.method == 'InverseIRLS':                         
+            weights=ones(numpoints)
+            aH=A.conj().T
+            for it in arange(self.max_iter): 
+                if numchannels<=numpoints: 
+                    wtwi=1/weights**2
+                    qi[:]=wtwi*dot(aH,_solve_hpd(dot(A*wtwi,aH),0.,emode))
+                elif numchannels>numpoints:
+                    # weighted least squares solution q = W*y of A*W*y = emode
+                    wtw=weights**2
+                    AW=A*wtw
+                    AWH=AW.conj().T
+                    qi[:]=wtw*_solve_hpd(dot(AWH,AW),0.,dot(AWH,emode))
+                weights=absolute(qi)**((2-self.pnorm)/2)
+                weights=weights/sum(weights)
+        else:
+            unit = self.unit_mult
+            AB = vstack([hstack([A.real,-A.imag]),hstack([A.imag,A.real])])
+            R  = hstack([emode.real.T,emode.imag.T]) * unit
+            if self.method == 'LassoLars':
+                model = LassoLars(alpha=self.alpha * unit,max_iter=self.max_iter)
+            elif self.method == 'LassoLarsBIC':
+                model = LassoLarsIC(criterion='bic',max_iter=self.max_iter)
+            elif self.method == 'OMPCV':
+                model = OrthogonalMatchingPursuitCV()
+            elif self.method == 'LassoLarsCV':
+                model = LassoLarsCV()                        
+            if self.method == 'NNLS':
+                x , zz = nnls(AB,R)
+                qi_real,qi_imag = hsplit(x/unit, 2) 
+            else:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=FutureWarning)
+                    model.fit(AB,R)
+                qi_real,qi_imag = hsplit(model.coef_[:]/unit, 2)
+            qi[:] = qi_real+qi_imag*1j
+        return qi, locpoints
+
+
+def _max_eigenvalue( M, n_iter=100, tol=1e-6 ):
+    """
+    Estimates the largest eigenvalue of the hermitian, positive semidefinite 
+    matrix `M` by power iteration.
+    """
+    v = ones(M.shape[0], dtype=M.dtype)
+    lam = 0.
+    for i in range(n_iter):
+        w = dot(M, v)
+        lam_new = norm(w) / norm(v)
+        if lam_new == 0:
+            return 0.
+        v = w / norm(w)
+        if abs(lam_new - lam) <= tol * lam_new:
+            return lam_new
+        lam = lam_new
+    return lam
+
+def _solve_hpd( M, epsilon, b ):
+    """
+    Solves (M + epsilon*I) x = b for hermitian, positive (semi)definite `M` 
+    by Cholesky decomposition. Falls back to a least squares solution if 
+    the matrix is singular.
+    """
+    Me = M + epsilon*eye(M.shape[0])
+    try:
+        return cho_solve(cho_factor(Me), b)
+    except LinAlgError:
+        return lstsq(Me, b)[0]
+
 def L_p ( x ):
     """
     Calculates the sound pressure level from the squared sound pressure.
@@ -6,40 +6,88 @@
 
 # imports from other packages
 from __future__ import print_function
-from traits.api import HasPrivateTraits, Bool, Str, Dict, Instance, Delegate
-from os import path, mkdir, environ, listdir
-from weakref import WeakValueDictionary
-import gc
+from traits.api import HasPrivateTraits, Dict, Instance, Delegate, Any, Int
+from os import path, listdir, walk, remove, utime, stat, fstat
+from shutil import rmtree
+from collections import deque
+from threading import RLock
+from weakref import WeakKeyDictionary, finalize
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 from .configuration import Config, config
 from .h5files import _get_cachefile_class
 
 class H5cache_class(HasPrivateTraits):
     """
-    Cache class that handles opening and closing 'tables.File' objects
+    Cache class that handles opening and closing 'tables.File' objects.
+
+    Each cache file is opened only once and shared by all objects that use 
+    it. The number of objects referring to a file is counted; if an object 
+    switches to another file or is garbage collected, the count is decreased
+    and the file is closed as soon as no object refers to it any more.
+
+    The total size of the cache directory is limited by 
+    :attr:`~acoular.configuration.Config.cache_size_limit`. The modification 
+    time of a cache file is updated whenever it is requested and serves as its
+    last access time, least recently used files are deleted first. While a 
+    cache file is open, a shared lock on its lock file (the name of the cache 
+    file with extension '.lock') is held, so that it is not deleted by other 
+    processes (only on platforms that support `fcntl`). The lock file is 
+    deleted when the last process closes the cache file.
     """
 
     config = Instance(Config)
 
     cache_dir = Delegate('config')    
 
-    busy = Bool(False)
-    
-    open_files = WeakValueDictionary()
-    
-    openFileReferenceCount = dict()
-    
-    def _idle_if_busy(self):
-        while self.busy:
-            pass
+    # open cache files by name
+    open_files = Dict()
+
+    # number of objects that refer to the open cache files, by name
+    openFileReferenceCount = Dict()
+
+    # lock that guards the bookkeeping of open files
+    _lock = Any()
+
+    # finalizers of the objects that refer to a cache file
+    _finalizers = Instance(WeakKeyDictionary, ())
+
+    # names of files released by garbage collected objects, the reference 
+    # counters are decreased on the next call of get_cache_file
+    _released = Instance(deque, ())
+
+    #: Number of requested cache files that did / did not exist before.
+    hits = Int(0)
+    misses = Int(0)
+
+    #: Number of cache files deleted to keep the cache size within its limit.
+    evictions = Int(0)
+
+    # node lookup statistics of closed cache files, by name
+    _node_stats = Dict()
+
+    # locked lock files of the open cache files, by name
+    _leases = Dict()
+
+    def __init__(self, **traits):
+        HasPrivateTraits.__init__(self, **traits)
+        self._lock = RLock()
 
     def open_cachefile(self,cacheFileName,mode):
         File = _get_cachefile_class()
         return File(path.join(self.cache_dir, cacheFileName), mode)
     
     def close_cachefile(self,cachefile):
-        self.openFileReferenceCount.pop(get_basename(cachefile))
+        name = get_basename(cachefile)
+        self.openFileReferenceCount.pop(name)
+        self.open_files.pop(name)
+        hits, misses = self._node_stats.get(name, (0, 0))
+        self._node_stats[name] = (hits + cachefile.hits, misses + cachefile.misses)
         cachefile.close()
+        self._release_lease(name)
         
     def get_filename(self,file):
         File = _get_cachefile_class()
@@ -49,41 +97,172 @@ class H5cache_class(HasPrivateTraits):
             return 0
 
     def get_open_cachefiles(self):
-        try:
-            return self.open_files.itervalues()
-        except AttributeError:
-            return iter(self.open_files.values())
+        return iter(list(self.open_files.values()))
 
     def close_unreferenced_cachefiles(self):
-        for openCacheFile in self.get_open_cachefiles():
-            if not self.is_reference_existent(openCacheFile):
-#                print("close unreferenced File:",get_basename(openCacheFile))
-                self.close_cachefile(openCacheFile)
+        with self._lock:
+            while self._released:
+                self._decrease_file_reference_counter(self._released.popleft())
+            closed = False
+            for openCacheFile in self.get_open_cachefiles():
+                if not self.is_reference_existent(openCacheFile):
+    #                print("close unreferenced File:",get_basename(openCacheFile))
+                    self.close_cachefile(openCacheFile)
+                    closed = True
+            if closed: # closed files may have grown
+                self.enforce_cache_size()
+
+    def get_cache_entries(self):
+        '''
+        returns list of (last access time, size in bytes, name) of all cache 
+        files in the cache directory
+        '''
+        entries = []
+        for name in listdir(self.cache_dir):
+            filename = path.join(self.cache_dir, name)
+            try:
+                if path.isdir(filename):
+                    if not name.endswith('_cache'): 
+                        continue
+                    size = sum(path.getsize(path.join(root, f)) 
+                               for root, dirs, files in walk(filename) for f in files)
+                elif name.endswith('_cache.h5'):
+                    size = path.getsize(filename)
+                else:
+                    continue
+                entries.append((path.getmtime(filename), size, name))
+            except OSError: # removed by another process meanwhile
+                pass
+        return entries
+
+    def enforce_cache_size(self):
+        '''
+        deletes least recently used cache files that are not open until the 
+        cache size is within :attr:`~acoular.configuration.Config.cache_size_limit`
+        '''
+        limit = config.cache_size_limit
+        if not limit or config.global_caching == 'readonly':
+            return
+        with self._lock:
+            entries = self.get_cache_entries()
+            total = sum(size for t, size, name in entries)
+            for t, size, name in sorted(entries):
+                if total <= limit:
+                    break
+                if name in self.open_files or not self._remove_entry(name):
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def _remove_entry(self, name):
+        '''
+        deletes the cache file `name`, returns False if it is in use by 
+        another process
+        '''
+        filename = path.join(self.cache_dir, name)
+        lock = None
+        if fcntl:
+            try:
+                lock = open(filename + '.lock', 'a')
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError: # locked by another process
+                if lock:
+                    lock.close()
+                return False
+        try:
+            if path.isdir(filename):
+                rmtree(filename)
+            else:
+                remove(filename)
+        except OSError: # removed by another process meanwhile
+            pass
+        if lock:
+            try:
+                remove(filename + '.lock')
+            except OSError:
+                pass
+            lock.close()
+        return True
+
+    def _acquire_lease(self, cacheFileName):
+        # holds a shared lock on the lock file of a cache file while it is 
+        # open, waits if another process is just deleting the cache file
+        if not fcntl or cacheFileName in self._leases:
+            return
+        lockname = path.join(self.cache_dir, cacheFileName + '.lock')
+        while True:
+            try:
+                lock = open(lockname, 'a')
+            except OSError: # e.g. read-only cache directory
+                return
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            try:
+                # the lock file may have been deleted before it was locked
+                if path.samestat(fstat(lock.fileno()), stat(lockname)):
+                    break
+            except OSError:
+                pass
+            lock.close()
+        self._leases[cacheFileName] = lock
+
+    def _release_lease(self, cacheFileName):
+        # deletes the lock file if no other process holds a lease, processes
+        # that just opened it notice this in _acquire_lease
+        lock = self._leases.pop(cacheFileName, None)
+        if lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                remove(lock.name)
+            except OSError: # locked by another process
+                pass
+            lock.close()
+
+    def get_statistics(self):
+        '''
+        returns dictionary with the hits and misses of cache file requests 
+        and node lookups, the number of evicted files and the current and 
+        maximum size of the cache directory
+        '''
+        with self._lock:
+            node_stats = dict(self._node_stats)
+            for name, f in self.open_files.items():
+                hits, misses = node_stats.get(name, (0, 0))
+                node_stats[name] = (hits + f.hits, misses + f.misses)
+            return {
+                'file_hits' : self.hits,
+                'file_misses' : self.misses,
+                'node_hits' : sum(h for h, m in node_stats.values()),
+                'node_misses' : sum(m for h, m in node_stats.values()),
+                'nodes' : node_stats,
+                'evictions' : self.evictions,
+                'size' : sum(size for t, size, name in self.get_cache_entries()),
+                'size_limit' : config.cache_size_limit,
+                }
 
     def is_reference_existent(self,file):
-        existFlag = False
-        # inspect all refererres to the file object
-        gc.collect() #clear garbage before collecting referrers
-        for ref in gc.get_referrers(file):
-            # does the file object have a referrer that has a 'h5f' 
-            # attribute?
-            if isinstance(ref,dict) and 'h5f' in ref:
-                # file is still referred, must not be closed
-                existFlag = True
-                break
-        return existFlag
+        return self.openFileReferenceCount.get(get_basename(file), 0) > 0
 
     def is_cachefile_existent(self,cacheFileName):
-        if cacheFileName in listdir(self.cache_dir):
-            return True
-        else:
-            return False
+        return path.exists(path.join(self.cache_dir, cacheFileName))
 
     def _increase_file_reference_counter(self, cacheFileName):
         self.openFileReferenceCount[cacheFileName] = self.openFileReferenceCount.get(cacheFileName, 0) + 1
 
     def _decrease_file_reference_counter(self, cacheFileName):
-        self.openFileReferenceCount[cacheFileName] = self.openFileReferenceCount[cacheFileName] - 1
+        if cacheFileName in self.openFileReferenceCount:
+            self.openFileReferenceCount[cacheFileName] = self.openFileReferenceCount[cacheFileName] - 1
+
+    def _release_file(self, cacheFileName):
+        # called by finalizers, may run at any time during garbage collection,
+        # so only remember the file here
+        self._released.append(cacheFileName)
+
+    def _touch(self, cacheFileName):
+        # the modification time serves as last access time for the eviction
+        try:
+            utime(path.join(self.cache_dir, cacheFileName))
+        except OSError:
+            pass
 
     def _print_open_files(self):
         print(list(self.openFileReferenceCount.items()))
@@ -92,42 +271,51 @@ class H5cache_class(HasPrivateTraits):
         '''
         returns pytables .h5 file to h5f trait of calling object for caching
         '''        
-        
-        self._idle_if_busy() # 
-        self.busy = True
+        cacheFileName = basename + '_cache' + _get_cachefile_class().extension
+        with self._lock:
+            objFileName = self.get_filename(obj.h5f)
+            fin = self._finalizers.get(obj)
+            if fin is not None:
+                if objFileName == cacheFileName and cacheFileName in self.open_files:
+                    self.close_unreferenced_cachefiles()
+                    return
+                # in case the base name has changed ( different source ) 
+                self._finalizers.pop(obj)
+                info = fin.detach()
+                if info:
+                    self._decrease_file_reference_counter(info[2][0])
 
-        cacheFileName = basename + '_cache.h5'
-        objFileName = self.get_filename(obj.h5f)
-        
-        if objFileName:
-            if objFileName == cacheFileName: 
-                self.busy = False
-                return
-            else: # in case the base name has changed ( different source ) 
-                self._decrease_file_reference_counter(objFileName)
-
-        if cacheFileName not in self.open_files: # or tables.file._open_files.filenames
-            if (
-                config.global_caching == 'readonly' 
-                and not self.is_cachefile_existent(cacheFileName)
-                ): # condition ensures that cachefile is not created in readonly mode
-                obj.h5f = None
-                self.busy = False
-#                self._print_open_files()   
-                return
-            else:
-                if config.global_caching == 'readonly': mode = 'r'
-                f = self.open_cachefile(cacheFileName,mode)
-                self.open_files[cacheFileName] = f
-        
-        obj.h5f = self.open_files[cacheFileName]
-        self._increase_file_reference_counter(cacheFileName)
-        
-        # garbage collection
-        self.close_unreferenced_cachefiles()
-        
-        self.busy = False
-        self._print_open_files()   
+            if cacheFileName not in self.open_files: # or tables.file._open_files.filenames
+                if (
+                    config.global_caching == 'readonly' 
+                    and not self.is_cachefile_existent(cacheFileName)
+                    ): # condition ensures that cachefile is not created in readonly mode
+                    obj.h5f = None
+                    self.close_unreferenced_cachefiles()
+                    return
+                else:
+                    if self.is_cachefile_existent(cacheFileName):
+                        self.hits += 1
+                    else:
+                        self.misses += 1
+                    if config.global_caching == 'readonly': mode = 'r'
+                    self._acquire_lease(cacheFileName)
+                    try:
+                        f = self.open_cachefile(cacheFileName,mode)
+                    except:
+                        self._release_lease(cacheFileName)
+                        raise
+                    self.open_files[cacheFileName] = f
+                    self.enforce_cache_size()
+            
+            obj.h5f = self.open_files[cacheFileName]
+            if config.global_caching != 'readonly':
+                self._touch(cacheFileName)
+            self._increase_file_reference_counter(cacheFileName)
+            self._finalizers[obj] = finalize(obj, self._release_file, cacheFileName)
+            
+            # close files that are not used any more
+            self.close_unreferenced_cachefiles()
 
 H5cache = H5cache_class(config=config)
 
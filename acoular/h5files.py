@@ -16,6 +16,19 @@ try:
 except:
     is_h5py = False
 
+import json
+from io import BytesIO
+from os import path, makedirs, link, remove, rename, replace, getpid
+from shutil import rmtree
+from threading import get_ident
+
+from numpy import ndarray, dtype, load, memmap, empty, asarray, prod
+from numpy.lib import format as npy_format
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 from .configuration import config
 
 
@@ -57,13 +70,40 @@ class H5CacheFileBase(object):
     
     compressionFilter = None
 
+    #: Extension of the file name.
+    extension = '.h5'
+
+    #: Number of lookups of nodes that were / were not found in the file.
+    hits = 0
+    misses = 0
     
     def is_cached(self,nodename,group=None):
         pass
+
+    def _count(self, cached):
+        if cached:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return cached
         
-    def create_compressible_array(self,nodename,shape,precision,group=None):
+    def create_compressible_array(self,nodename,shape,precision,group=None,chunkshape=None):
+        '''
+        Creates a compressed array node. `chunkshape` is the shape of the 
+        chunks in which the data is stored and read, e.g. (1,)+shape[1:] for 
+        frequency dependent data that is accessed frequency by frequency. 
+        It is chosen automatically if not given. 
+        '''
         pass    
 
+    def complete_group(self,group):
+        '''
+        Marks the group `group` created by :meth:`create_new_group` as 
+        complete after all of its nodes were created. Until then, other 
+        processes do not see the group (directory backend only).
+        '''
+        pass
+
 
 if is_tables:
     
@@ -116,16 +156,14 @@ if is_tables:
         
         def is_cached(self,nodename,group=None):
             if not group: group = self.root
-            if nodename in group: 
-                return True
-            else:
-                return False
+            return self._count(nodename in group)
             
-        def create_compressible_array(self,nodename,shape,precision,group=None):
+        def create_compressible_array(self,nodename,shape,precision,group=None,chunkshape=None):
             if not group: group = self.root
             atom = precision_to_atom[precision]
             self.create_carray(group, nodename, atom, shape, 
-                                        filters=self.compressionFilter)
+                                        filters=self.compressionFilter,
+                                        chunkshape=chunkshape)
 
     
 
@@ -182,17 +220,207 @@ if is_h5py:
     
         def is_cached(self,nodename,group=None):
             if not group: group = '/'
-            if group+nodename in self: 
-                return True
-            else:
-                return False
+            return self._count(group+nodename in self)
             
-        def create_compressible_array(self,nodename,shape,precision,group=None):
+        def create_compressible_array(self,nodename,shape,precision,group=None,chunkshape=None):
             in_file_path = self._get_in_file_path(nodename,group)
             self.create_dataset(in_file_path, dtype=precision, shape=shape, 
                                         compression=self.compressionFilter,
-                                        chunks=True)        
+                                        chunks=chunkshape or True)        
+
+
+
+class _DirectoryNode(ndarray):
+    """
+    Array that refers to a node of a :class:`H5CacheDirectory`.
+    """
+    
+    def __array_finalize__(self, obj):
+        self.filename = getattr(obj, 'filename', None)
+
+    @property
+    def attrs(self):
+        return _read_attrs(self.filename)
+
 
+def _read_attrs(filename):
+    try:
+        with open(filename + '.json') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class _NodeLock(object):
+    """
+    Context manager for an exclusive lock on a node file that is shared 
+    between processes (no locking if fcntl is not available).
+    """
+
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+
+    def __enter__(self):
+        if fcntl:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        self.file.close() # also releases the lock
+
+
+class H5CacheDirectory(H5CacheFileBase):
+    '''
+    Cache "file" that is a directory with one file per node, for use by 
+    several processes at once.
+
+    Arrays are stored as .npy files and accessed as memory maps, so that 
+    data written by one process (e.g. results for some frequencies) is 
+    immediately visible to all other processes using the same node. New
+    nodes are created atomically. Attributes are kept in .json files next to
+    the nodes. Groups are subdirectories. Data is not compressed.
+    '''
+
+    extension = ''
+
+    def __init__(self, filename, mode='a'):
+        self.filename = filename
+        self.mode = mode
+        if mode != 'r':
+            makedirs(filename, exist_ok=True)
+
+    def _get_path(self, nodename, group=None):
+        if not group: group = '/'
+        return path.join(self.filename, *group.strip('/').split('/'), nodename)
+
+    def _node_file(self, nodename, group=None):
+        filename = self._get_path(nodename, group)
+        for ext in ('.npy', '.dat'):
+            if path.isfile(filename + ext):
+                return filename + ext
+        return None
+
+    def _create_node_file(self, filename, data, size=0):
+        # write to a temporary file first and then link it to its name, this 
+        # fails if another process was faster and the node already exists
+        tmpname = '%s.%d.%d.tmp' % (filename, getpid(), get_ident())
+        with open(tmpname, 'wb') as f:
+            f.write(data)
+            if size > len(data):
+                f.truncate(size) # zeros
+        try:
+            link(tmpname, filename)
+        except FileExistsError:
+            pass
+        finally:
+            remove(tmpname)
+
+    def is_cached(self, nodename, group=None):
+        filename = self._get_path(nodename, group)
+        return self._count(path.isdir(filename) 
+                           or self._node_file(nodename, group) is not None)
+
+    def create_new_group(self, name, group=None):
+        # the group is built in a temporary directory that is renamed by 
+        # complete_group, so that other processes only see complete groups
+        if not group: group = '/'
+        tmpname = '%s.%d.%d.tmp' % (name, getpid(), get_ident())
+        makedirs(self._get_path(tmpname, group), exist_ok=True)
+        return group.rstrip('/') + '/' + tmpname
+
+    def complete_group(self, group):
+        parent, tmpname = group.rsplit('/', 1)
+        tmpdir = self._get_path(tmpname, parent)
+        try:
+            rename(tmpdir, self._get_path(tmpname.rsplit('.', 3)[0], parent))
+        except OSError: # another process was faster and the group exists
+            rmtree(tmpdir)
+
+    def create_compressible_array(self, nodename, shape, precision, group=None, chunkshape=None):
+        # rows are contiguous in the .npy file, there are no chunks
+        filename = self._get_path(nodename, group) + '.npy'
+        buf = BytesIO()
+        npy_format.write_array_header_1_0(buf, {
+            'descr': npy_format.dtype_to_descr(dtype(precision)),
+            'fortran_order': False, 
+            'shape': tuple(shape)})
+        size = buf.tell() + dtype(precision).itemsize*int(prod(shape))
+        self._create_node_file(filename, buf.getvalue(), size)
+
+    def create_extendable_array(self, nodename, shape, precision, group=None):
+        filename = self._get_path(nodename, group) + '.dat'
+        self._create_node_file(filename, b'')
+        self._write_attrs(filename, {'_dtype': precision, '_shape': list(shape[1:])})
+
+    def get_data_by_reference(self, nodename, group=None):
+        filename = self._node_file(nodename, group)
+        mode = 'r' if self.mode == 'r' else 'r+'
+        if filename.endswith('.npy'):
+            data = load(filename, mmap_mode=mode)
+        else:
+            attrs = _read_attrs(filename)
+            dt = dtype(attrs['_dtype'])
+            rowshape = tuple(attrs['_shape'])
+            rowsize = dt.itemsize*int(prod(rowshape))
+            if rowsize:
+                nrows = path.getsize(filename)//rowsize
+            else: # rows without elements, see append_data
+                nrows = attrs.get('_nrows', 0)
+            if nrows and rowsize:
+                data = memmap(filename, dt, mode, shape=(nrows,)+rowshape)
+            else:
+                data = empty((nrows,)+rowshape, dtype=dt)
+        node = data.view(_DirectoryNode)
+        node.filename = filename
+        return node
+
+    def append_data(self, node, data):
+        attrs = _read_attrs(node.filename)
+        data = asarray(data, dtype=attrs['_dtype'])
+        with _NodeLock(node.filename):
+            if prod(attrs['_shape']) == 0:
+                # rows without elements take no space in the file, only 
+                # their number is stored
+                attrs = _read_attrs(node.filename)
+                attrs['_nrows'] = attrs.get('_nrows', 0) + len(data)
+                self._write_attrs(node.filename, attrs)
+                return
+            with open(node.filename, 'ab') as f:
+                f.write(data.tobytes())
+
+    def _write_attrs(self, filename, attrs):
+        tmpname = '%s.json.%d.%d.tmp' % (filename, getpid(), get_ident())
+        with open(tmpname, 'w') as f:
+            json.dump(attrs, f)
+        replace(tmpname, filename + '.json')
+
+    def set_node_attribute(self, node, attrname, value):
+        if hasattr(value, 'item'): # numpy scalar
+            value = value.item()
+        with _NodeLock(node.filename):
+            attrs = _read_attrs(node.filename)
+            attrs[attrname] = value
+            self._write_attrs(node.filename, attrs)
+
+    def get_node_attribute(self, node, attrname):
+        return _read_attrs(node.filename)[attrname]
+
+    def remove_data(self, nodename, group=None):
+        filename = self._get_path(nodename, group)
+        if path.isdir(filename):
+            rmtree(filename)
+        else:
+            filename = self._node_file(nodename, group)
+            remove(filename)
+            if path.isfile(filename + '.json'):
+                remove(filename + '.json')
+
+    def flush(self):
+        # memory maps share their pages with all processes
+        pass
+
+    def close(self):
+        pass
 
 
 def _get_h5file_class():
@@ -200,5 +428,6 @@ def _get_h5file_class():
     elif config.h5library == "h5py": return H5FileH5py    
 
 def _get_cachefile_class():
+    if config.cache_backend == "directory": return H5CacheDirectory
     if config.h5library == "pytables": return H5CacheFileTables
     elif config.h5library == "h5py": return H5CacheFileH5py
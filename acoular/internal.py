@@ -3,7 +3,9 @@
 # Copyright (c) Acoular Development Team.
 #------------------------------------------------------------------------------
 
+from collections import OrderedDict
 from hashlib import md5
+from threading import Lock
 
 def digest( obj, name='digest'):
     str_ = [str(obj.__class__).encode("UTF-8")]
@@ -16,3 +18,62 @@ def digest( obj, name='digest'):
         except:
             pass
     return '_' + md5(''.encode("UTF-8").join(str_)).hexdigest()
+
+
+class LRUCache(object):
+    """
+    Thread-safe in-memory cache for numpy arrays with a limited size in bytes.
+
+    If storing a new array exceeds the size limit, the least recently used 
+    arrays are discarded. Arrays are stored read-only, because they are shared 
+    between all callers that request the same key.
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = Lock()
+        #: Current size of all stored arrays in bytes.
+        self.nbytes = 0
+        #: Number of successful lookups.
+        self.hits = 0
+        #: Number of failed lookups.
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns the array stored under `key` or None if there is none. 
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key, value, max_bytes):
+        """
+        Stores the array `value` under `key` and discards least recently used 
+        arrays until the size of the cache does not exceed `max_bytes`. Arrays 
+        larger than `max_bytes` are not stored at all.
+        """
+        if value.nbytes > max_bytes:
+            return
+        value.flags.writeable = False
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._data[key] = value
+            self.nbytes += value.nbytes
+            while self.nbytes > max_bytes:
+                self.nbytes -= self._data.popitem(last=False)[1].nbytes
+
+    def clear(self):
+        """
+        Removes all arrays from the cache.
+        """
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
@@ -19,11 +19,13 @@
 
 # imports from other packages
 from __future__ import print_function, division
-from numpy import pi, arange, sin, sqrt, repeat, tile, log, zeros, array
+from numpy import pi, arange, sin, sqrt, repeat, tile, log, zeros, array, \
+concatenate, empty
 from numpy.random import RandomState
 from traits.api import HasPrivateTraits, Trait, Float, Int, CLong, Bool, \
 Property, cached_property, Delegate, CArray
-from scipy.signal import resample, sosfilt, tf2sos
+from scipy.signal import resample, sosfilt, tf2sos, firwin, upfirdn
+from itertools import chain
 from warnings import warn
 
 # acoular imports
@@ -81,6 +83,70 @@ class SignalGenerator( HasPrivateTraits ):
         """
         return resample(self.signal(), factor*self.numsamples)
 
+    def result(self, num=128):
+        """
+        Python generator that yields the signal block-wise.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 128
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Blocks of the signal as arrays of length num. 
+            The last block may be shorter than num.
+        """
+        signal = self.signal()
+        for i in range(0, self.numsamples, num):
+            yield signal[i:i+num]
+
+    def uresult(self, factor, num=128):
+        """
+        Python generator that yields the signal resampled with a multiple of 
+        the sampling freq block-wise.
+        
+        Other than :meth:`usignal`, this uses a polyphase FIR filter for 
+        resampling, as :func:`scipy.signal.resample_poly` does. The filter is
+        applied to the blocks from :meth:`result` and its state is carried 
+        over from block to block, such that the whole signal is never held 
+        in memory.
+        
+        Parameters
+        ----------
+        factor : integer
+            The factor defines how many times the new sampling frequency is
+            larger than :attr:`sample_freq`.
+        num : integer, defaults to 128
+            Number of samples per block of the original signal.
+        
+        Returns
+        -------
+        Blocks of the resampled signal. Blocks are yielded as soon as they 
+            are complete, so the length of a block may differ from 
+            `factor` * num. The total length is `factor` * :attr:`numsamples`.
+        """
+        if factor == 1:
+            yield from self.result(num)
+            return
+        half_len = 10*factor # filter delay in resampled samples
+        h = firwin(2*half_len+1, 1./factor, window=('kaiser', 5.0))*factor
+        npre = 20 # number of previous samples needed, 2*half_len/factor
+        x = zeros(npre) # zeros before the start of the signal
+        nskip = half_len
+        nout = factor*self.numsamples
+        # append zeros to get the samples delayed by the filter at the end
+        for block in chain(self.result(num), [zeros(half_len//factor)]):
+            x = concatenate((x[-npre:], block))
+            y = upfirdn(h, x, factor)[npre*factor:len(x)*factor]
+            skip = min(nskip, len(y))
+            y = y[skip:nout+skip]
+            nskip -= skip
+            nout -= len(y)
+            if len(y) > 0:
+                yield y
+
 class WNoiseGenerator( SignalGenerator ):
     """
     White noise signal generator. 
@@ -113,6 +179,27 @@ class WNoiseGenerator( SignalGenerator ):
         """
         rnd_gen = RandomState(self.seed)
         return self.rms*rnd_gen.standard_normal(self.numsamples)
+
+    def result(self, num=128):
+        """
+        Python generator that yields the signal block-wise. The random 
+        number generator proceeds from block to block, the blocks are 
+        identical to those of :meth:`signal`.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 128
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Blocks of the signal as arrays of length num. 
+            The last block may be shorter than num.
+        """
+        rnd_gen = RandomState(self.seed)
+        for i in range(0, self.numsamples, num):
+            yield self.rms*rnd_gen.standard_normal(min(num, self.numsamples-i))
     
 
 class PNoiseGenerator( SignalGenerator ):
@@ -150,16 +237,19 @@ class PNoiseGenerator( SignalGenerator ):
     def _get_digest( self ):
         return digest(self)
 
-    def signal(self):
-        nums = self.numsamples
+    def _get_depth(self):
         depth = self.depth
         # maximum depth depending on number of samples
-        max_depth = int( log(nums) / log(2) )
+        max_depth = int( log(self.numsamples) / log(2) )
         
         if depth > max_depth:
             depth = max_depth
             print("Pink noise filter depth set to maximum possible value of %d." % max_depth)
-        
+        return depth
+
+    def signal(self):
+        nums = self.numsamples
+        depth = self._get_depth()
         rnd_gen = RandomState(self.seed)
         s = rnd_gen.standard_normal(nums)
         for _ in range(depth):
@@ -170,6 +260,60 @@ class PNoiseGenerator( SignalGenerator ):
         # divide by sqrt(depth+1.5) to get same overall level as white noise
         return self.rms/sqrt(depth+1.5) * s
 
+    def result(self, num=128):
+        """
+        Python generator that yields the signal block-wise, the blocks are 
+        identical to those of :meth:`signal`.
+        
+        The random numbers of each octave follow on those of the white noise 
+        and of the previous octaves in the same random sequence. Here, each 
+        octave gets a random number generator of its own, that is set to the 
+        state at the start of its numbers, and then proceeds from block to 
+        block.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 128
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Blocks of the signal as arrays of length num. 
+            The last block may be shorter than num.
+        """
+        nums = self.numsamples
+        depth = self._get_depth()
+        rnd_gen = RandomState(self.seed)
+        octave_gens = []
+        nskip = nums
+        for _ in range(depth):
+            # skip the random numbers used before, in blocks
+            for i in range(0, nskip, 4096):
+                rnd_gen.standard_normal(min(4096, nskip-i))
+            octave_gen = RandomState()
+            octave_gen.set_state(rnd_gen.get_state())
+            octave_gens.append(octave_gen)
+            nskip = nums // 2**(_+1) + 1
+        rnd_gen = RandomState(self.seed)
+        ndrawn = zeros(depth, dtype=int) # random numbers drawn per octave
+        last = empty(depth) # last random number drawn per octave
+        for i in range(0, nums, num):
+            s = rnd_gen.standard_normal(min(num, nums-i))
+            for _, octave_gen in enumerate(octave_gens):
+                ind = max(2**_-1, i)
+                dind = 2**(_+1)
+                # indices of the random numbers for the samples from ind on
+                k = (arange(ind, i+len(s)) - 2**_ + 1) // dind
+                if len(k) == 0:
+                    continue
+                new = octave_gen.standard_normal(k[-1] + 1 - ndrawn[_])
+                rnd = concatenate((last[_:_+1], new))
+                s[ind-i:] += rnd[k - ndrawn[_] + 1]
+                ndrawn[_] += len(new)
+                last[_] = rnd[-1]
+            yield self.rms/sqrt(depth+1.5) * s
+
 
 class FiltWNoiseGenerator(WNoiseGenerator):
     """
@@ -226,6 +370,37 @@ class FiltWNoiseGenerator(WNoiseGenerator):
         wnoise = self.rms*rnd_gen.standard_normal(self.numsamples+sdelay) # create longer signal to compensate delay
         return sosfilt(sos, x=wnoise)[sdelay:]
 
+    def result(self, num=128):
+        """
+        Python generator that yields the signal block-wise. The filter state
+        and the random number generator proceed from block to block, the 
+        blocks are identical to those of :meth:`signal`.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 128
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Blocks of the signal as arrays of length num. 
+            The last block may be shorter than num.
+        """
+        rnd_gen = RandomState(self.seed)
+        ma = self.handle_empty_coefficients(self.ma)
+        ar = self.handle_empty_coefficients(self.ar)
+        sos = tf2sos(ma, ar)
+        ntaps = ma.shape[0]
+        sdelay = round(0.5*(ntaps-1))
+        zi = zeros((sos.shape[0], 2))
+        if sdelay > 0: # filter the leading samples to compensate delay
+            _, zi = sosfilt(sos, x=self.rms*rnd_gen.standard_normal(sdelay), zi=zi)
+        for i in range(0, self.numsamples, num):
+            wnoise = self.rms*rnd_gen.standard_normal(min(num, self.numsamples-i))
+            y, zi = sosfilt(sos, x=wnoise, zi=zi)
+            yield y
+
 
 class SineGenerator( SignalGenerator ):
     """
@@ -290,6 +465,25 @@ class SineGenerator( SignalGenerator ):
         t = arange(self.numsamples, dtype=float)/self.sample_freq
         return self.amplitude * sin(2*pi*self.freq * t + self.phase)
 
+    def result(self, num=128):
+        """
+        Python generator that yields the signal block-wise.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 128
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Blocks of the signal as arrays of length num. 
+            The last block may be shorter than num.
+        """
+        for i in range(0, self.numsamples, num):
+            t = arange(i, min(i+num, self.numsamples), dtype=float)/self.sample_freq
+            yield self.amplitude * sin(2*pi*self.freq * t + self.phase)
+
 
 class GenericSignalGenerator( SignalGenerator ):
     """
@@ -366,4 +560,44 @@ class GenericSignalGenerator( SignalGenerator ):
         
         # The rms value is just an amplification here
         return self.rms*track
+
+    def result(self, num=128):
+        """
+        Python generator that yields the signal block-wise. If the signal 
+        is repeated, :attr:`source` is read again.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 128
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Blocks of the signal as arrays of length num. 
+            The last block may be shorter than num.
+        """
+        if self.source.numchannels > 1:
+            warn("Signal source has more than one channel. Only channel 0 will be used for signal.", Warning, stacklevel = 2)
+        nums = self.numsamples
+        track = empty(0)
+        i = 0
+        while i < nums:
+            nread = 0
+            for temp in self.source.result(num):
+                temp = temp[:nums-i, 0]
+                nread += len(temp)
+                i += len(temp)
+                track = concatenate((track, temp))
+                while len(track) >= num:
+                    # The rms value is just an amplification here
+                    yield self.rms*track[:num]
+                    track = track[num:]
+                if i >= nums:
+                    break
+            if not self.loop_signal or nread == 0:
+                break
+        track = concatenate((track, zeros(nums-i)))
+        for j in range(0, len(track), num):
+            yield self.rms*track[j:j+num]
     
\ No newline at end of file
@@ -24,8 +24,7 @@
 # imports from other packages
 
 from numpy import array, sqrt, ones, empty, newaxis, uint32, arange, dot, int64 ,real, pi, tile,\
-cross, zeros, ceil
-from numpy import min as npmin
+cross, zeros, full, searchsorted, concatenate, floor, sinc, i0
 from numpy import any as npany
 
 from numpy.fft import ifft, fft
@@ -51,23 +50,6 @@ from .h5files import H5FileBase, _get_h5file_class
 from .tools import get_modes
 
 
-@nb.njit(cache=True, error_model="numpy") # jit with nopython        
-def _fill_mic_signal_block(out,signal,rm,ind,blocksize,numchannels,up,prepadding):
-    if prepadding:
-        for b in range(blocksize):
-            for m in range(numchannels):
-                if ind[0,m]<0:
-                    out[b,m] = 0
-                else:
-                    out[b,m] = signal[int(0.5+ind[0,m])]/rm[0,m]
-            ind += up
-    else:
-        for b in range(blocksize):
-            for m in range(numchannels):
-                out[b,m] = signal[int(0.5+ind[0,m])]/rm[0,m]
-            ind += up
-    return out
-
 
 class TimeSamples( SamplesGenerator ):
     """
@@ -331,6 +313,224 @@ class MaskedTimeSamples( TimeSamples ):
             i += num
 
 
+@nb.njit(cache=True)
+def _bspline_point(tk, ck, k, x, d, out):
+    """
+    Evaluates the 3D B-spline with knots `tk`, coefficients `ck` (shape (3, n))
+    and degree `k` at `x` with de Boor's algorithm and writes the position to
+    `out`. Outside of the base interval, the polynomials of the first or last
+    knot interval are extrapolated (same as `scipy.interpolate.splev`). 
+    `d` is a work array of shape (k+1, 3).
+    """
+    n = tk.shape[0] - k - 1
+    l = searchsorted(tk, x, side='right') - 1
+    if l < k:
+        l = k
+    elif l > n-1:
+        l = n-1
+    for j in range(k+1):
+        for i in range(3):
+            d[j, i] = ck[i, j+l-k]
+    for r in range(1, k+1):
+        for j in range(k, r-1, -1):
+            alpha = (x - tk[j+l-k]) / (tk[j+1+l-r] - tk[j+l-k])
+            for i in range(3):
+                d[j, i] = (1.0-alpha) * d[j-1, i] + alpha * d[j, i]
+    for i in range(3):
+        out[i] = d[k, i]
+
+@nb.njit(cache=True, parallel=True, error_model="numpy")
+def _emission_times(tk, ck, k, tkd, ckd, mpos, t, seed, offset, c0, epslim, te, rm, Mr):
+    """
+    Solves for the emission times `te` of a source moving along a spline 
+    trajectory (see :func:`_bspline_point`, `tkd` and `ckd` describe the 
+    derivative of the spline) for a block of receiving times `t` of shape
+    (nblock, nmics) by Newton-Raphson iterations. The source position is 
+    shifted by `offset[b]` for sample `b` of the block. The iteration for the 
+    first sample starts from `seed`, all further iterations start from the 
+    solution for the previous sample. The distances to the microphones and the 
+    radial Mach numbers are written to `rm` and `Mr`.
+    """
+    nblock, nmics = te.shape
+    for m in nb.prange(nmics):
+        d = empty((k+1, 3))
+        loc = empty(3)
+        der = empty(3)
+        tem = seed[m]
+        for b in range(nblock):
+            if b > 0:
+                tem += t[b, m] - t[b-1, m]
+            j = 0
+            while True:
+                _bspline_point(tk, ck, k, tem, d, loc)
+                r = 0.0
+                lr = 0.0
+                for i in range(3):
+                    loc[i] += offset[b, i]
+                    diff = loc[i] - mpos[i, m]
+                    r += diff * diff
+                    lr += loc[i] * loc[i]
+                r = sqrt(r) # absolute distance
+                _bspline_point(tkd, ckd, k-1, tem, d, der)
+                mr = 0.0
+                for i in range(3):
+                    mr += der[i] * loc[i]
+                mr /= sqrt(lr) * c0 # radial Mach number
+                eps = (tem + r/c0 - t[b, m]) / (1+mr) # discrepancy in time 
+                tem -= eps
+                j += 1
+                if abs(eps) <= epslim or j >= 100:
+                    break
+            te[b, m] = tem
+            rm[b, m] = r
+            Mr[b, m] = mr
+
+def _trajectory_splines(trajectory):
+    """
+    Returns knots, coefficients and degree of the spline of `trajectory` 
+    and knots and coefficients of its first derivative as needed for
+    :func:`_emission_times`.
+    """
+    tk, c, k = trajectory.tck
+    tk = array(tk, dtype=float)
+    n = len(tk) - k - 1
+    ck = array(c, dtype=float)[:, :n].copy()
+    ckd = k * (ck[:, 1:] - ck[:, :-1]) / (tk[k+1:k+n] - tk[1:n])
+    return tk, ck, k, tk[1:-1].copy(), ckd
+
+def _moving_directions(trajectory, rvec, direction, te):
+    """
+    Returns the vector `direction` in the moving coordinate system of a 
+    source at the emission times `te` as array of shape (len(te), 3), see
+    :meth:`MovingPointSourceDipole.get_moving_direction`.
+    """
+    if (rvec == 0).all(): # translation only
+        return tile(direction, (len(te), 1))
+    dx = array(trajectory.location(te, der=1)).T # direction vectors (new x-axis)
+    dy = cross(rvec, dx) # new y-axis
+    dz = cross(dx, dy) # new z-axis
+    newdir = sum(v / sqrt((v*v).sum(1))[:, newaxis] * di 
+                 for v, di in zip((dx, dy, dz), direction))
+    return cross(newdir, rvec)
+
+def _valid_samples(ind, n):
+    """
+    Returns the number of leading samples of a block for which all signal 
+    indices `ind` are valid indices of an array of length `n`.
+    """
+    valid = ((ind >= -n) & (ind < n)).reshape(ind.shape[0], -1).all(1)
+    return len(valid) if valid.all() else valid.argmin()
+
+#: Half length (in samples) of the windowed-sinc fractional delay filter.
+SINC_HALF = 8
+
+#: Number of filter coefficients tabulated per sample.
+SINC_RES = 512
+
+def _sinc_table(half, res, beta=6.0):
+    # windowed-sinc filter (Kaiser window) tabulated for fractional 
+    # positions from -half to half
+    t = arange(-half*res, half*res+1)/res
+    return sinc(t)*i0(beta*sqrt(1-(t/half)**2))/i0(beta)
+
+_SINC_TABLE = _sinc_table(SINC_HALF, SINC_RES)
+
+@nb.njit(cache=True, error_model="numpy")
+def _sinc_interpolate(signal, x, table, half, res, out):
+    # interpolates signal at positions x >= half-1 with the tabulated
+    # filter, linear interpolation between the table entries
+    for i in range(x.shape[0]):
+        for m in range(x.shape[1]):
+            k0 = int(x[i, m])
+            acc = 0.
+            for k in range(k0-half+1, k0+half+1):
+                d = (x[i, m]-k+half)*res
+                j = int(d)
+                w = d-j
+                acc += signal[k]*((1-w)*table[j]+w*table[j+1])
+            out[i, m] = acc
+
+class _SignalWindow:
+    """
+    Sliding window over the upsampled signal of a source. With the 'poly' 
+    and 'sinc' upsampling methods, blocks of the signal are generated on 
+    demand and samples before the requested indices are dropped. 'sinc' 
+    works on the signal at its original sampling rate.
+    """
+
+    def __init__(self, signal, up, upsampling, num=1024):
+        if upsampling == 'sinc':
+            up = 1
+        self.signal = signal
+        self.up = up
+        self.num = num
+        #: Length of the upsampled signal.
+        self.length = signal.numsamples*up
+        #: Index of the first sample in :attr:`data`.
+        self.start = 0
+        if upsampling == 'fft':
+            self.data = signal.usignal(up)
+            self._blocks = iter(())
+            self._tail = self.data
+        else:
+            self.data = empty(0)
+            self._blocks = signal.uresult(up, num)
+            self._tail = empty(0)
+
+    def tail(self, n):
+        """ Returns (at least) the last `n` samples of the upsampled signal."""
+        if len(self._tail) < n:
+            # separate pass over the signal, only the last samples are kept
+            tail = empty(0)
+            for block in self.signal.uresult(self.up, self.num):
+                tail = concatenate((tail[-n:], block))
+            self._tail = tail[-n:]
+        return self._tail
+
+    def get(self, ind):
+        """
+        Returns the upsampled signal at the integer indices `ind`, negative 
+        indices are taken from the end of the signal. Further calls must 
+        not request indices smaller than the minimum of `ind`.
+        """
+        lo, hi = ind.min(), ind.max()
+        while self.start + len(self.data) <= hi:
+            block = next(self._blocks, None)
+            if block is None:
+                raise IndexError("index %d is out of bounds for signal of length %d" 
+                                 % (hi, self.length))
+            self.data = concatenate((self.data, block))
+        out = empty(ind.shape)
+        neg = ind < 0
+        if neg.any():
+            out[neg] = self.tail(-lo)[ind[neg]]
+            out[~neg] = self.data[ind[~neg] - self.start]
+        else:
+            out[:] = self.data[ind - self.start]
+        if lo > self.start:
+            self.data = self.data[lo - self.start:]
+            self.start = lo
+        return out
+
+    def interpolate(self, x, loop=True):
+        """
+        Returns the signal at the fractional indices `x` by windowed-sinc 
+        interpolation. The signal is zero after its end, and before its 
+        start it is taken from the end of the signal (`loop`) or zero.
+        Further calls must not request indices smaller than the minimum of `x`.
+        """
+        lo = int(floor(x.min())) - SINC_HALF + 1
+        hi = int(floor(x.max())) + SINC_HALF
+        first = lo if loop else max(lo, 0)
+        last = min(hi, self.length-1)
+        seg = zeros(hi-lo+1)
+        if last >= first:
+            seg[first-lo:last-lo+1] = self.get(arange(first, last+1))
+        out = empty(x.shape)
+        _sinc_interpolate(seg, x-lo, _SINC_TABLE, SINC_HALF, SINC_RES, out)
+        return out
+
+
 class PointSource( SamplesGenerator ):
     """
     Class to define a fixed point source with an arbitrary signal.
@@ -408,6 +608,21 @@ class PointSource( SamplesGenerator ):
     #: Upsampling factor, internal use, defaults to 16.
     up = Int(16, 
         desc="upsampling factor")        
+
+    #: Upsampling method: 'fft' (default) resamples the whole signal at once
+    #: using the FFT. 'poly' uses a polyphase filter on signal blocks that are
+    #: generated on demand (see :meth:`~acoular.signals.SignalGenerator.uresult`),
+    #: which needs much less memory for long signals. 'sinc' does without 
+    #: upsampling and interpolates the delayed signal from the signal blocks 
+    #: with a windowed-sinc fractional delay filter, :attr:`up` is not used. 
+    #: Supported by :class:`PointSource` and :class:`MovingPointSource`, the
+    #: other sources derived from them only allow 'fft'.
+    upsampling = Trait('fft', 'poly', 'sinc', 
+        desc="upsampling method")
+
+    # upsampling part of the digest, empty for the default method such
+    # that existing cache files remain valid
+    _digest_upsampling = Property(depends_on = ['upsampling'])
     
     #: Number of samples, is set automatically / 
     #: depends on :attr:`signal`.
@@ -420,13 +635,19 @@ class PointSource( SamplesGenerator ):
     # internal identifier
     digest = Property( 
         depends_on = ['mics.digest', 'signal.digest', 'loc', \
-         'env.digest', 'start_t', 'start', 'up', 'prepadding', '__class__'], 
+         'env.digest', 'start_t', 'start', 'up', 'prepadding', \
+         '_digest_upsampling', '__class__'], 
         )
                
     @cached_property
     def _get_digest( self ):
         return digest(self)
 
+    def _get__digest_upsampling( self ):
+        if self.upsampling == 'fft':
+            return ''
+        return self.upsampling
+
     def result(self, num=128):
         """
         Python generator that yields the output at microphones block-wise.
@@ -444,46 +665,29 @@ class PointSource( SamplesGenerator ):
         """
         
         self._validate_locations()
-        N = int(ceil(self.numsamples/num)) # number of output blocks
-        signal = self.signal.usignal(self.up)
-        out = empty((num, self.numchannels))
+        signal = _SignalWindow(self.signal, self.up, self.upsampling)
         # distances
         rm = self.env._r(array(self.loc).reshape((3, 1)), self.mics.mpos).reshape(1,-1)
+        up = 1 if self.upsampling == 'sinc' else self.up
         # emission time relative to start_t (in samples) for first sample
-        ind = (-rm/self.env.c-self.start_t+self.start)*self.sample_freq*self.up
-
-        if self.prepadding == 'zeros':
-            # number of blocks where signal behaviour is amended
-            pre = -int(npmin(ind[0])//(self.up*num))
-            # amend signal for first blocks
-            # if signal stops during prepadding, terminate
-            if N <= pre:
-                for nb in range(N-1):
-                    out = _fill_mic_signal_block(out,signal,rm,ind,num,self.numchannels,self.up,True)
-                    yield out
-
-                blocksize = self.numsamples%num or num
-                out = _fill_mic_signal_block(out,signal,rm,ind,blocksize,self.numchannels,self.up,True)
-                yield out[:blocksize]
-                return
+        ind0 = (-rm/self.env.c-self.start_t+self.start)*self.sample_freq*up
+        n = self.numsamples
+        for i in range(0, n, num):
+            ind = ind0 + arange(i, min(i+num, n))[:, newaxis]*up
+            if self.upsampling == 'sinc':
+                yield signal.interpolate(ind, self.prepadding == 'loop')/rm
+                continue
+            sind = array(0.5+ind, dtype=int64)
+            if self.prepadding == 'zeros':
+                # source signal is zero for negative time indices
+                pre = ind < 0
+                sind[pre] = 0
+                out = signal.get(sind)/rm
+                out[pre] = 0
             else:
-                for nb in range(pre):
-                    out = _fill_mic_signal_block(out,signal,rm,ind,num,self.numchannels,self.up,True)
-                    yield out
-
-        else:
-            pre = 0
-
-        # main generator
-        for nb in range(N-pre-1):
-            out = _fill_mic_signal_block(out,signal,rm,ind,num,self.numchannels,self.up,False)
+                out = signal.get(sind)/rm
             yield out
 
-        # last block of variable size
-        blocksize = self.numsamples%num or num
-        out = _fill_mic_signal_block(out,signal,rm,ind,blocksize,self.numchannels,self.up,False)
-        yield out[:blocksize]
-
 
 class SphericalHarmonicSource( PointSource ):
     """
@@ -505,6 +709,9 @@ class SphericalHarmonicSource( PointSource ):
         desc="Spherical Harmonic orientation")
 
     prepadding = Enum('loop', desc="Behaviour for negative time indices.")
+
+    #: Upsampling method, only 'fft' is supported, see :attr:`PointSource.upsampling`.
+    upsampling = Enum('fft', desc="upsampling method")
     
     # internal identifier
     digest = Property( 
@@ -583,13 +790,59 @@ class MovingPointSource( PointSource ):
     # internal identifier
     digest = Property( 
         depends_on = ['mics.digest', 'signal.digest', 'loc', 'conv_amp', \
-         'env.digest', 'start_t', 'start', 'trajectory.digest', 'prepadding', '__class__'], 
+         'env.digest', 'start_t', 'start', 'trajectory.digest', 'prepadding', \
+         '_digest_upsampling', '__class__'], 
         )
                
     @cached_property
     def _get_digest( self ):
         return digest(self)
 
+    def _emission_times(self, t, seed, splines, offset=None):
+        """
+        Calculates the emission times for a block of receiving times `t` 
+        (array of shape (nblock, num_mics)). The Newton-Raphson iterations 
+        for all microphones run in compiled code, the first sample of the 
+        block starts from the emission times `seed`, every further sample 
+        from the solution for the previous sample. `splines` is the output 
+        of :func:`_trajectory_splines`, `offset` an optional (nblock, 3) 
+        array of shifts of the source position.
+        
+        Returns
+        -------
+        (te, rm, Mr) : arrays of shape (nblock, num_mics) with emission times,
+            distances to the microphones and radial Mach numbers.
+        """
+        te = empty(t.shape)
+        rm = empty(t.shape)
+        Mr = empty(t.shape)
+        if offset is None:
+            offset = zeros((t.shape[0], 3))
+        _emission_times(*splines, self.mics.mpos, t, seed, offset, self.env.c,
+                        0.1/self.up/self.sample_freq, te, rm, Mr)
+        return te, rm, Mr
+
+    def get_emission_time(self, t, direction):
+        """
+        Calculates the emission times for the receiving times `t` (one for
+        each microphone) of a source that is shifted by `direction` relative
+        to the trajectory. 
+        
+        Returns
+        -------
+        (te, rm, Mr, xs) : emission times, distances to the microphones and 
+            radial Mach numbers as arrays of shape (num_mics,) and the 
+            positions on the trajectory at the emission times.
+        """
+        nm = self.mics.num_mics
+        t = array(t, dtype=float).reshape(1, nm)
+        offset = (zeros((3, nm)) + direction)[:, 0].reshape(1, 3)
+        te, rm, Mr = self._emission_times(t, t[0], 
+                                          _trajectory_splines(self.trajectory), 
+                                          offset)
+        xs = array(self.trajectory.location(te[0]))
+        return te[0], rm[0], Mr[0], xs
+
     def result(self, num=128):
         """
         Python generator that yields the output at microphones block-wise.
@@ -608,46 +861,34 @@ class MovingPointSource( PointSource ):
         #If signal samples are needed for te < t_start, then samples are taken
         #from the end of the calculated signal.
         
-        signal = self.signal.usignal(self.up)
-        out = empty((num, self.numchannels))
+        signal = _SignalWindow(self.signal, self.up, self.upsampling)
         # shortcuts and intial values
-        m = self.mics
-        t = self.start*ones(m.num_mics)
+        nm = self.mics.num_mics
+        splines = _trajectory_splines(self.trajectory)
+        seed = full(nm, self.start) # init emission time = receiving time
         i = 0
-        epslim = 0.1/self.up/self.sample_freq
-        c0 = self.env.c
-        tr = self.trajectory
         n = self.numsamples
-        while n:
-            n -= 1
-            eps = ones(m.num_mics)
-            te = t.copy() # init emission time = receiving time
-            j = 0
-            # Newton-Rhapson iteration
-            while abs(eps).max()>epslim and j<100:
-                loc = array(tr.location(te))
-                rm = loc-m.mpos# distance vectors to microphones
-                rm = sqrt((rm*rm).sum(0))# absolute distance
-                loc /= sqrt((loc*loc).sum(0))# distance unit vector
-                der = array(tr.location(te, der=1))
-                Mr = (der*loc).sum(0)/c0# radial Mach number
-                eps = (te + rm/c0 - t)/(1+Mr)# discrepancy in time 
-                te -= eps
-                j += 1 #iteration count
-            t += 1./self.sample_freq
+        while i < n:
+            nblock = min(num, n-i)
+            t = (self.start + arange(i, i+nblock)/self.sample_freq)[:, newaxis].repeat(nm, 1)
+            te, rm, Mr = self._emission_times(t, seed, splines)
+            seed = te[-1] + 1./self.sample_freq
             # emission time relative to start time
             ind = (te-self.start_t+self.start)*self.sample_freq
             if self.conv_amp: rm *= (1-Mr)**2
-            try:
-                out[i] = signal[array(0.5+ind*self.up, dtype=int64)]/rm
-                i += 1
-                if i == num:
-                    yield out
-                    i = 0
-            except IndexError: #if no more samples available from the source 
+            if self.upsampling == 'sinc':
+                read = signal.interpolate
+                sind = array(0.5+ind, dtype=int64)
+            else:
+                read = signal.get
+                ind = sind = array(0.5+ind*self.up, dtype=int64)
+            # stop if no more samples available from the source 
+            nvalid = _valid_samples(sind, signal.length)
+            if nvalid > 0:
+                yield read(ind[:nvalid])/rm[:nvalid]
+            if nvalid < nblock:
                 break
-        if i > 0: # if there are still samples to yield
-            yield out[:i]
+            i += nblock
             
 
 class PointSourceDipole ( PointSource ):
@@ -669,6 +910,9 @@ class PointSourceDipole ( PointSource ):
         desc="dipole orientation and distance of the inversely phased monopoles")
 
     prepadding = Enum('loop', desc="Behaviour for negative time indices.")
+
+    #: Upsampling method, only 'fft' is supported, see :attr:`PointSource.upsampling`.
+    upsampling = Enum('fft', desc="upsampling method")
     
     # internal identifier
     digest = Property( 
@@ -769,27 +1013,6 @@ class MovingPointSourceDipole(PointSourceDipole, MovingPointSource):
     def _get_digest( self ):
         return digest(self)    
 
-    def get_emission_time(self,t,direction):
-        eps = ones(self.mics.num_mics)
-        epslim = 0.1/self.up/self.sample_freq
-        te = t.copy() # init emission time = receiving time
-        j = 0
-        # Newton-Rhapson iteration
-        while abs(eps).max()>epslim and j<100:
-            xs = array(self.trajectory.location(te))
-            loc = xs.copy()
-            loc += direction
-            rm = loc-self.mics.mpos# distance vectors to microphones
-            rm = sqrt((rm*rm).sum(0))# absolute distance
-            loc /= sqrt((loc*loc).sum(0))# distance unit vector
-            der = array(self.trajectory.location(te, der=1))
-            Mr = (der*loc).sum(0)/self.env.c# radial Mach number
-            eps = (te + rm/self.env.c - t)/(1+Mr)# discrepancy in time 
-            te -= eps
-            j += 1 #iteration count
-        return te, rm, Mr, xs
-           
-                
     def get_moving_direction(self,direction,time=0):
         """
         function that yields the moving coordinates along the trajectory  
@@ -840,43 +1063,45 @@ class MovingPointSourceDipole(PointSourceDipole, MovingPointSource):
         dir2 = (direc_n * dist / 2.0).reshape((3, 1))
         
         signal = self.signal.usignal(self.up)
-        out = empty((num, self.numchannels))
         # shortcuts and intial values
-        m = self.mics
-        t = self.start*ones(m.num_mics)
+        nm = self.mics.num_mics
+        splines = _trajectory_splines(self.trajectory)
+        seed = full(nm, self.start) # init emission time = receiving time
 
         i = 0
         n = self.numsamples        
-        while n:
-            n -= 1
-            te, rm, Mr, locs = self.get_emission_time(t,0)                
-            t += 1./self.sample_freq
+        while i < n:
+            nblock = min(num, n-i)
+            t = (self.start + arange(i, i+nblock)/self.sample_freq)[:, newaxis].repeat(nm, 1)
+            te, rm, Mr = self._emission_times(t, seed, splines)
+            seed = te[-1] + 1./self.sample_freq
             #location of the center
-            loc = array(self.trajectory.location(te), dtype = float)[:,0][:,newaxis] 
+            loc = array(self.trajectory.location(te[:,0]), dtype = float)
             #distance of the dipoles from the center
-            diff = self.get_moving_direction(dir2,te)
+            diff = _moving_directions(self.trajectory, self.rvec, dir2[:,0], te[:,0]).T
  
             # distance of sources
-            rm1 = self.env._r(loc + diff, mpos) 
-            rm2 = self.env._r(loc - diff, mpos)
+            rm1 = self.env._r(loc + diff, mpos).reshape(nblock, nm)
+            rm2 = self.env._r(loc - diff, mpos).reshape(nblock, nm)
                                    
             ind = (te-self.start_t+self.start)*self.sample_freq
             if self.conv_amp: 
                 rm *= (1-Mr)**2
                 rm1 *= (1-Mr)**2 # assume that Mr is the same for both poles
                 rm2 *= (1-Mr)**2
-            try:
-                # subtract the second signal b/c of phase inversion
-                out[i] = rm / dist * \
-                         (signal[array(0.5 + ind * self.up, dtype=int64)] / rm1 - \
-                          signal[array(0.5 + ind * self.up, dtype=int64)] / rm2)
-                i += 1
-                if i == num:
-                    yield out
-                    i = 0
-            except IndexError:
-                break
-        yield out[:i]        
+            ind = array(0.5 + ind * self.up, dtype=int64)
+            nvalid = _valid_samples(ind, len(signal))
+            # subtract the second signal b/c of phase inversion
+            out = rm[:nvalid] / dist * \
+                  (signal[ind[:nvalid]] / rm1[:nvalid] - \
+                   signal[ind[:nvalid]] / rm2[:nvalid])
+            if nvalid < num:
+                # last block, may be empty
+                yield out
+                return
+            yield out
+            i += nblock
+        yield empty((0, nm))        
 
 
 
@@ -904,6 +1129,9 @@ class LineSource( PointSource ):
     #:coherence
     coherence = Trait( 'coherent', 'incoherent', 
         desc="coherence mode")
+
+    #: Upsampling method, only 'fft' is supported, see :attr:`PointSource.upsampling`.
+    upsampling = Enum('fft', desc="upsampling method")
        
     # internal identifier
     digest = Property( 
@@ -1020,26 +1248,6 @@ class MovingLineSource(LineSource,MovingPointSource):
             RM /= sqrt((RM*RM).sum(0)) # column normalized
             newdir = dot(RM, direction)
             return cross(newdir[:,0].T,self.rvec.T).T
-
-    def get_emission_time(self,t,direction):
-        eps = ones(self.mics.num_mics)
-        epslim = 0.1/self.up/self.sample_freq
-        te = t.copy() # init emission time = receiving time
-        j = 0
-        # Newton-Rhapson iteration
-        while abs(eps).max()>epslim and j<100:
-            xs = array(self.trajectory.location(te))
-            loc = xs.copy()
-            loc += direction
-            rm = loc-self.mics.mpos# distance vectors to microphones
-            rm = sqrt((rm*rm).sum(0))# absolute distance
-            loc /= sqrt((loc*loc).sum(0))# distance unit vector
-            der = array(self.trajectory.location(te, der=1))
-            Mr = (der*loc).sum(0)/self.env.c# radial Mach number
-            eps = (te + rm/self.env.c - t)/(1+Mr)# discrepancy in time 
-            te -= eps
-            j += 1 #iteration count
-        return te, rm, Mr, xs
         
     def result(self, num=128):
         """
@@ -1070,12 +1278,6 @@ class MovingLineSource(LineSource,MovingPointSource):
         dist = self.length / self.num_sources 
         dir2 = (direc_n * dist).reshape((3, 1))
         
-        #blocwise output
-        out = zeros((num, self.numchannels))
-        
-        # distances from monopoles in the line to microphones
-        rms = empty(( self.numchannels,self.num_sources))
-        inds = empty((self.numchannels,self.num_sources))
         signals = empty((self.num_sources, len(self.signal.usignal(self.up))))
         #coherence
         for s in range(self.num_sources):
@@ -1087,42 +1289,49 @@ class MovingLineSource(LineSource,MovingPointSource):
         mpos = self.mics.mpos
     
         # shortcuts and intial values
-        m = self.mics
-        t = self.start*ones(m.num_mics)
+        nm = self.mics.num_mics
+        splines = _trajectory_splines(self.trajectory)
+        # init emission times = receiving times, one for the line start and 
+        # one for every source in the line
+        seed1 = full(nm, self.start + 1./self.sample_freq)
+        seeds = [seed1.copy() for s in range(self.num_sources)]
+        # distances and signal indices of the monopoles in the line
+        rms = empty((num, nm, self.num_sources))
+        inds = empty((num, nm, self.num_sources), dtype=int64)
         i = 0
         n = self.numsamples        
-        while n:
-            n -= 1                         
-            t += 1./self.sample_freq
-            te1, rm1, Mr1, locs1 = self.get_emission_time(t,0)         
-            #trajg1 = array(self.trajectory.location( te1, der=1))[:,0][:,newaxis]
+        while i < n:
+            nblock = min(num, n-i)
+            t = (self.start + arange(i+1, i+nblock+1)/self.sample_freq)[:, newaxis].repeat(nm, 1)
+            te1, rm1, Mr1 = self._emission_times(t, seed1, splines)
+            seed1 = te1[-1] + 1./self.sample_freq
             
             # get distance and ind for every source in the line
             for s in range(self.num_sources):
-                diff = self.get_moving_direction(dir2,te1)
-                te, rm, Mr, locs = self.get_emission_time(t,tile((diff*s).T,(self.numchannels,1)).T)
-                loc = array(self.trajectory.location(te), dtype = float)[:,0][:,newaxis] 
-                diff = self.get_moving_direction(dir2,te)
-                rms[:,s] = self.env._r((loc+diff*s), mpos)
-                inds[:,s] = (te-self.start_t+self.start)*self.sample_freq      
+                diff = _moving_directions(self.trajectory, self.rvec, dir2[:,0], te1[:,0])
+                te, rm, Mr = self._emission_times(t, seeds[s], splines, diff*s)
+                seeds[s] = te[-1] + 1./self.sample_freq
+                loc = array(self.trajectory.location(te[:,0]), dtype = float)
+                diff = _moving_directions(self.trajectory, self.rvec, dir2[:,0], te[:,0]).T
+                rms[:nblock,:,s] = self.env._r((loc+diff*s), mpos).reshape(nblock, nm)
+                inds[:nblock,:,s] = array(0.5 + (te-self.start_t+self.start)*self.sample_freq * self.up, 
+                                          dtype=int64)
             
             if self.conv_amp: 
                 rm *= (1-Mr)**2
-                rms[:,s] *= (1-Mr)**2 # assume that Mr is the same 
-            try:
-                # subtract the second signal b/c of phase inversion
-                for s in range(self.num_sources):
+                rms[:nblock,:,s] *= (1-Mr)**2 # assume that Mr is the same 
+            nvalid = _valid_samples(inds[:nblock], signals.shape[1])
+            out = zeros((nvalid, self.numchannels))
+            for s in range(self.num_sources):
                 # sum sources
-                    out[i] += (signals[s,array(0.5 + inds[:,s].T * self.up, dtype=int64)] / rms[:,s])
-                                    
-                i += 1
-                if i == num:
-                    yield out
-                    out = zeros((num, self.numchannels))
-                    i = 0
-            except IndexError:
-                break
-        yield out[:i]
+                out += signals[s, inds[:nvalid,:,s]] / rms[:nvalid,:,s]
+            if nvalid < num:
+                # last block, may be empty
+                yield out
+                return
+            yield out
+            i += nblock
+        yield empty((0, nm))
 
 
 class UncorrelatedNoiseSource( SamplesGenerator ):
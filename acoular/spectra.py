@@ -10,15 +10,20 @@
     :toctree: generated/
 
     PowerSpectra
+    PackedCSM
     synthetic
 """
 from warnings import warn
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
 from numpy import array, ones, hanning, hamming, bartlett, blackman, \
 dot, newaxis, zeros, empty, fft, linalg, \
-searchsorted, isscalar, fill_diagonal, arange, zeros_like, sum
+searchsorted, isscalar, fill_diagonal, arange, zeros_like, sum, linspace, \
+triu_indices, integer, asarray, flatnonzero
+from scipy.linalg import eigh
 from traits.api import HasPrivateTraits, Int, Property, Instance, Trait, \
-Range, Bool, cached_property, property_depends_on, Delegate, Float
+Range, Bool, cached_property, property_depends_on, Delegate, Float, Dict
 
 from .fastFuncs import calcCSM
 from .h5cache import H5cache
@@ -30,6 +35,155 @@ from .configuration import config
 
 
 
+def _add_cross_spectra( csmUpper, blocks, wind, block_size, overlap, start_block=0 ):
+    """
+    Adds the cross spectra of all FFT blocks in the time data yielded by the
+    generator `blocks`, starting with block number `start_block`, to the upper
+    triangular part of `csmUpper`. Returns the total number of FFT blocks.
+    """
+    bs = block_size
+    temp = empty((2*bs, csmUpper.shape[1]))
+    posinc = bs/overlap
+    pos = bs + start_block*posinc
+    nblocks = start_block
+    for data in blocks:
+        ns = data.shape[0]
+        if pos < bs+ns:
+            temp[bs:bs+ns] = data
+            while pos+bs <= bs+ns:
+                ft = fft.rfft(temp[int(pos):int(pos+bs)]*wind, None, 0).astype(csmUpper.dtype)
+                calcCSM(csmUpper, ft)  # only upper triangular part of matrix is calculated (for speed reasons)
+                pos += posinc
+                nblocks += 1
+        temp[0:bs] = temp[bs:]
+        pos -= bs
+    return nblocks
+
+#: Approximate amount of memory in bytes that the cross spectral matrices 
+#: of one batch of frequencies may occupy in the eigendecomposition.
+EIG_BATCH_MEMORY = 2**27
+
+def _eig_batches( csm, ind, eva, eve, k=None ):
+    """
+    Calculates the eigenvalues and eigenvectors of `csm` for the frequency 
+    indices `ind` and stores them in `eva` and `eve`. Full eigendecompositions
+    are calculated in batches of frequencies at once. If `k` is given, only 
+    the `k` largest eigenvalues and their eigenvectors are calculated (in 
+    ascending order, like the full decomposition).
+    """
+    ind = asarray(ind)
+    nc = csm.shape[1]
+    if k is not None:
+        for i in ind:
+            (eva[i], eve[i]) = eigh(csm[i], subset_by_index=[nc-k, nc-1])
+        return
+    nbatch = max(1, EIG_BATCH_MEMORY // (nc*nc*csm.dtype.itemsize))
+    for j in range(0, ind.size, nbatch):
+        batch = ind[j:j+nbatch]
+        (evab, eveb) = linalg.eigh(csm[batch])
+        for (i, evai, evei) in zip(batch, evab, eveb): # eva, eve may be file nodes
+            eva[i] = evai
+            eve[i] = evei
+
+def _csm_partition( h5library, name, start, stop, invalid_channels, cal_data,
+                    wind, block_size, overlap, precision ):
+    """
+    Returns the sum of the cross spectra (upper triangular part only) of all 
+    FFT blocks between samples `start` and `stop` of the time data in file 
+    `name`. Runs in a worker process, see 
+    :meth:`PowerSpectra._accumulate_csm_parallel`.
+    """
+    from .sources import MaskedTimeSamples # avoid circular import
+    config.h5library = h5library
+    t = MaskedTimeSamples(name=name, start=start, stop=stop, 
+                          invalid_channels=invalid_channels)
+    if cal_data is not None:
+        t.calib = Calib(data=cal_data, num_mics=cal_data.shape[0])
+    numfreq = int(block_size/2 + 1)
+    csmUpper = zeros((numfreq, t.numchannels, t.numchannels), dtype=precision)
+    _add_cross_spectra(csmUpper, t.result(block_size), wind, block_size, overlap)
+    t.h5f.close()
+    return csmUpper
+
+
+def _pack_csm( csm ):
+    """
+    Returns the upper triangular part (including the main diagonal) of the 
+    matrices in `csm` of shape (..., M, M) as array of shape (..., M*(M+1)/2).
+    """
+    iu = triu_indices(csm.shape[-1])
+    return csm[..., iu[0], iu[1]]
+
+def _unpack_csm( packed, numchannels, hermitian=True ):
+    """
+    Inverse of :func:`_pack_csm`. If `hermitian` is true, the lower triangular
+    part is filled with the complex conjugate of the upper triangular part, 
+    otherwise it is set to zero.
+    """
+    iu = triu_indices(numchannels)
+    csm = zeros(packed.shape[:-1]+(numchannels, numchannels), dtype=packed.dtype)
+    if hermitian:
+        csm[..., iu[1], iu[0]] = packed.conj()
+    csm[..., iu[0], iu[1]] = packed
+    return csm
+
+
+class PackedCSM:
+    """
+    Cross spectral matrix stored in packed form.
+
+    Only the upper triangular part of the Hermitian matrix, including the 
+    main diagonal, is stored for each frequency, row by row. The data may 
+    reside in memory or in a cache file. Indexing works like with an array of
+    shape (number of frequencies, numchannels, numchannels): only the 
+    frequencies selected by the first index are read and unpacked to full 
+    matrices.
+    """
+
+    def __init__( self, data, numchannels ):
+        #: Packed data, array or HDF5 node of shape 
+        #: (number of frequencies, numchannels*(numchannels+1)/2).
+        self.data = data
+        #: Number of channels.
+        self.numchannels = numchannels
+
+    @property
+    def shape( self ):
+        return (self.data.shape[0], self.numchannels, self.numchannels)
+
+    @property
+    def dtype( self ):
+        return self.data.dtype
+
+    @property
+    def ndim( self ):
+        return 3
+
+    def __len__( self ):
+        return self.data.shape[0]
+
+    def __getitem__( self, key ):
+        if isinstance(key, tuple):
+            key, rest = key[0], key[1:]
+        else:
+            rest = ()
+        if isinstance(key, (int, integer, slice)):
+            packed = asarray(self.data[key])
+        else: # sequence of frequency indices or boolean mask
+            key = asarray(key)
+            if key.dtype == bool:
+                key = flatnonzero(key)
+            packed = empty(key.shape+self.data.shape[1:], dtype=self.dtype)
+            for i, j in enumerate(key.ravel()):
+                packed.reshape(-1, self.data.shape[1])[i] = self.data[j]
+        csm = _unpack_csm(packed, self.numchannels)
+        return csm[(slice(None),)*(csm.ndim-2)+rest]
+
+    def __array__( self, dtype=None ):
+        csm = self[:]
+        return csm if dtype is None else csm.astype(dtype)
+
+
 class PowerSpectra( HasPrivateTraits ):
     """Provides the cross spectral matrix of multichannel time data
      and its eigen-decomposition.
@@ -120,6 +274,17 @@ class PowerSpectra( HasPrivateTraits ):
     cached = Bool(True, 
         desc="cached flag")   
 
+    #: Number of worker processes used for the csm calculation, defaults to 1.
+    #: If set to a larger value and the time data is read from a file by a
+    #: :class:`~acoular.sources.TimeSamples` or 
+    #: :class:`~acoular.sources.MaskedTimeSamples` object, the FFT blocks are 
+    #: split into partitions that are processed in parallel. The result only 
+    #: differs by rounding errors due to a different order of summation.
+    #: As new processes are spawned, scripts using this must guard their
+    #: main code with ``if __name__ == '__main__':``.
+    num_workers = Int(1,
+        desc="number of worker processes for csm calculation")
+
     #: Number of FFT blocks to average, readonly
     #: (set from block_size and overlap).
     num_blocks = Property(
@@ -147,9 +312,18 @@ class PowerSpectra( HasPrivateTraits ):
 
     #: The cross spectral matrix, 
     #: (number of frequencies, numchannels, numchannels) array of complex;
-    #: readonly.
+    #: readonly. If the csm is cached or :attr:`packed_csm` is set, this is a
+    #: :class:`PackedCSM` object that unpacks the full matrices of the 
+    #: requested frequencies on indexing, e.g. ``csm[i]`` or ``csm[:]``.
     csm = Property( 
         desc="cross spectral matrix")
+
+    #: Flag, if true, the csm is kept in memory in packed form (upper 
+    #: triangular part only, see :class:`PackedCSM`), which needs about 
+    #: half the memory. Defaults to False. Cached csm are always stored in
+    #: packed form.
+    packed_csm = Bool(False,
+        desc="keep csm in packed form")
     
     #: The floating-number-precision of entries of csm, eigenvalues and 
     #: eigenvectors, corresponding to numpy dtypes. Default is 64 bit.
@@ -175,6 +349,9 @@ class PowerSpectra( HasPrivateTraits ):
 
     # hdf5 cache file
     h5f = Instance( H5CacheFileBase, transient = True )
+
+    # the k largest eigenvalues and eigenvectors, by (digest, k)
+    _top_ev = Dict()
     
     @property_depends_on('time_data.numsamples, block_size, overlap')
     def _get_num_blocks ( self ):
@@ -236,13 +413,27 @@ class PowerSpectra( HasPrivateTraits ):
     def calc_csm( self ):
         """ csm calculation """
         t = self.time_data
-        wind = self.window_( self.block_size )
-        weight = dot( wind, wind )
-        wind = wind[newaxis, :].swapaxes( 0, 1 )
         numfreq = int(self.block_size/2 + 1)
         csm_shape = (numfreq, t.numchannels, t.numchannels)
         csmUpper = zeros(csm_shape, dtype=self.precision)
         #print "num blocks", self.num_blocks
+        self._accumulate_csm(csmUpper)
+        return self._normalize_csm(csmUpper)
+
+    def _accumulate_csm( self, csmUpper, start_block=0 ):
+        """
+        Adds the cross spectra of all FFT blocks of the time data, starting 
+        with block number `start_block`, to the upper triangular part of 
+        `csmUpper`. The time data is still read from the beginning, but blocks
+        before `start_block` are skipped. Returns the total number of blocks 
+        that have been added to `csmUpper` so far.
+
+        If :attr:`num_workers` is larger than 1 and the time data is read 
+        from a file, the work is distributed over several processes.
+        """
+        t = self.time_data
+        wind = self.window_( self.block_size )
+        wind = wind[newaxis, :].swapaxes( 0, 1 )
         # for backward compatibility
         if self.calib and self.calib.num_mics > 0:
             if self.calib.num_mics == t.numchannels:
@@ -251,20 +442,53 @@ class PowerSpectra( HasPrivateTraits ):
                 raise ValueError(
                         "Calibration data not compatible: %i, %i" % \
                         (self.calib.num_mics, t.numchannels))
+        from .sources import TimeSamples, MaskedTimeSamples # avoid circular import
+        total_blocks = self._total_blocks()
+        if (self.num_workers > 1 and t.__class__ in (TimeSamples, MaskedTimeSamples) and 
+            total_blocks-start_block >= 2*self.num_workers):
+            return self._accumulate_csm_parallel(csmUpper, wind, start_block, 
+                                                 total_blocks)
+        return _add_cross_spectra(csmUpper, t.result(self.block_size), wind, 
+                                  self.block_size, self.overlap_, start_block)
+
+    def _accumulate_csm_parallel( self, csmUpper, wind, start_block, total_blocks ):
+        """
+        Same as :meth:`_accumulate_csm`, but the FFT blocks are split into
+        :attr:`num_workers` partitions of consecutive blocks that are processed
+        by separate worker processes. Each worker reads its part of the 
+        time data directly from the file.
+        """
+        from .sources import MaskedTimeSamples # avoid circular import
+        t = self.time_data
         bs = self.block_size
-        temp = empty((2*bs, t.numchannels))
-        pos = bs
-        posinc = bs/self.overlap_
-        for data in t.result(bs):
-            ns = data.shape[0]
-            temp[bs:bs+ns] = data
-            while pos+bs <= bs+ns:
-                ft = fft.rfft(temp[int(pos):int(pos+bs)]*wind, None, 0).astype(self.precision)
-                calcCSM(csmUpper, ft)  # only upper triangular part of matrix is calculated (for speed reasons)
-                pos += posinc
-            temp[0:bs] = temp[bs:]
-            pos -= bs
-        
+        posinc = bs//self.overlap_
+        if isinstance(t, MaskedTimeSamples):
+            offset = slice(t.start, t.stop).indices(t.numsamples_total)[0]
+            invalid_channels = t.invalid_channels
+        else:
+            offset = 0
+            invalid_channels = []
+        cal_data = t.calib.data if t.calib else None
+        bounds = linspace(start_block, total_blocks, self.num_workers+1).astype(int)
+        ctx = get_context('spawn')
+        with ProcessPoolExecutor(self.num_workers, mp_context=ctx) as executor:
+            futures = [executor.submit(_csm_partition, 
+                                       config.h5library, t.name, 
+                                       offset+b0*posinc, offset+(b1-1)*posinc+bs, 
+                                       invalid_channels, cal_data, wind, bs, 
+                                       self.overlap_, self.precision)
+                       for b0, b1 in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                csmUpper += future.result()
+        return total_blocks
+
+    def _normalize_csm( self, csmUpper ):
+        """
+        Returns the full, normalized csm from the sum of the cross spectra 
+        in `csmUpper`.
+        """
+        wind = self.window_( self.block_size )
+        weight = dot( wind, wind )
         # create the full csm matrix via transposing and complex conj.
         csmLower = csmUpper.conj().transpose(0,2,1)
         [fill_diagonal(csmLower[cntFreq, :, :], 0) for cntFreq in range(csmLower.shape[0])]
@@ -274,6 +498,24 @@ class PowerSpectra( HasPrivateTraits ):
         csm = csm*(2.0/self.block_size/weight/self.num_blocks)
         return csm
 
+    def _normalize_csm_packed( self, csmUpper ):
+        """
+        Returns the normalized csm in packed form (see :class:`PackedCSM`) 
+        from the sum of the cross spectra in `csmUpper`.
+        """
+        wind = self.window_( self.block_size )
+        weight = dot( wind, wind )
+        # onesided spectrum: multiplication by 2.0=sqrt(2)^2
+        return _pack_csm(csmUpper)*(2.0/self.block_size/weight/self.num_blocks)
+
+    def _total_blocks( self ):
+        """ number of complete FFT blocks in the time data """
+        bs = self.block_size
+        posinc = bs//self.overlap_
+        if self.time_data.numsamples < bs:
+            return 0
+        return (self.time_data.numsamples-bs)//posinc + 1
+
     def calc_ev ( self ):
         """ eigenvalues / eigenvectors calculation """
         if self.precision == 'complex128': eva_dtype = 'float64'
@@ -282,10 +524,67 @@ class PowerSpectra( HasPrivateTraits ):
         csm_shape = self.csm.shape
         eva = empty(csm_shape[0:2], dtype=eva_dtype)
         eve = empty(csm_shape, dtype=self.precision)
-        for i in range(csm_shape[0]):
-            (eva[i], eve[i])=linalg.eigh(self.csm[i])
+        _eig_batches(self.csm, arange(csm_shape[0]), eva, eve)
         return (eva,eve)
 
+    def calc_top_ev( self, k ):
+        """ eigenvalues / eigenvectors calculation for the k largest 
+        eigenvalues only """
+        if self.precision == 'complex128': eva_dtype = 'float64'
+        elif self.precision == 'complex64': eva_dtype = 'float32'
+        csm_shape = self.csm.shape
+        eva = empty((csm_shape[0], k), dtype=eva_dtype)
+        eve = empty(csm_shape[0:2]+(k,), dtype=self.precision)
+        _eig_batches(self.csm, arange(csm_shape[0]), eva, eve, k)
+        return (eva,eve)
+
+    def top_ev( self, k ):
+        """
+        Returns the k largest eigenvalues and their eigenvectors of the cross 
+        spectral matrix for all frequencies. 
+        
+        Only these eigenpairs are calculated, which is much faster than the 
+        full eigendecomposition if k is small compared to the number of 
+        channels. The results are cached separately for each k, in memory or, 
+        depending on the caching settings, in the cache file. If the eigenpairs 
+        for a larger k or the complete :attr:`eva` and :attr:`eve` are already 
+        cached, the result is taken from them instead.
+        
+        Parameters
+        ----------
+        k : integer
+            The number of eigenvalues. If k is not smaller than the number of 
+            channels, :attr:`eva` and :attr:`eve` are returned.
+
+        Returns
+        -------
+        (eva, eve) : tuple of arrays
+            The eigenvalues, shape (number of frequencies, k), and eigenvectors, 
+            shape (number of frequencies, numchannels, k), in ascending order of 
+            the eigenvalues. They correspond to ``eva[:, -k:]`` and 
+            ``eve[:, :, -k:]``.
+        """
+        k = max(int(k), 1)
+        if k >= self.csm.shape[1]:
+            return (self.eva, self.eve)
+        if any(d != self.digest for (d, _k) in self._top_ev):
+            self._top_ev.clear() # outdated results for former digests
+        key = (self.digest, k)
+        if key not in self._top_ev:
+            larger = [_k for (d, _k) in self._top_ev if _k > k]
+            if larger: # part of the eigenpairs for a larger k
+                (eva, eve) = self._top_ev[(self.digest, min(larger))]
+                ev = (eva[:, -k:], eve[:, :, -k:])
+            elif (
+                    config.global_caching == 'none' or 
+                    (config.global_caching == 'individual' and self.cached == False)
+                ):
+                ev = self.calc_top_ev(k)
+            else:
+                ev = self._get_top_ev_filecache(k)
+            self._top_ev[key] = ev
+        return self._top_ev[key]
+
     def calc_eva( self ):
         """ calculates eigenvalues of csm """
         return self.calc_ev()[0]
@@ -317,43 +616,227 @@ class PowerSpectra( HasPrivateTraits ):
         calculation depending on global/local caching behaviour.  
         """
         if traitname == 'csm':
-            func = self.calc_csm
-            numfreq = int(self.block_size/2 + 1)
-            shape = (numfreq, self.time_data.numchannels, self.time_data.numchannels)
-            precision = self.precision
+            func = self._calc_csm_memory
         elif traitname == 'eva':
             func = self.calc_eva
-            shape = self.csm.shape[0:2]
-            if self.precision == 'complex128': precision = 'float64'
-            elif self.precision == 'complex64': precision = 'float32'
         elif traitname == 'eve':
             func = self.calc_eve
-            shape = self.csm.shape
-            precision = self.precision
 
         H5cache.get_cache_file( self, self.basename ) 
         if not self.h5f: # in case of global caching readonly
             return func() 
 
-        nodename = traitname + '_' + self.digest 
-        if config.global_caching == 'overwrite' and self.h5f.is_cached(nodename):
-            #print("remove existing node",nodename)
-            self.h5f.remove_data(nodename) # remove old data before writing in overwrite mode
-        
-        if not self.h5f.is_cached(nodename): 
+        if traitname == 'csm':
+            return self._get_csm_filecache()
+
+        # eigenvalues and eigenvectors are cached together, along with flags
+        # that mark the frequencies for which they are already calculated
+        names = ['eva_' + self.digest, 'eve_' + self.digest, 'evfreqs_' + self.digest]
+        if config.global_caching == 'overwrite':
+            for name in names:
+                if self.h5f.is_cached(name):
+                    self.h5f.remove_data(name) # remove old data before writing in overwrite mode
+
+        if not self.h5f.is_cached(names[2]):
+            if self.h5f.is_cached(traitname + '_' + self.digest):
+                # cached by older versions of Acoular without flags
+                if config.global_caching == 'readonly':
+                    return self.h5f.get_data_by_reference(traitname + '_' + self.digest)
+                for name in names[:2]:
+                    if self.h5f.is_cached(name):
+                        self.h5f.remove_data(name)
             if config.global_caching == 'readonly': 
                 return func()
-#            print("create array, data not cached for",nodename)
-            self.h5f.create_compressible_array(nodename,shape,precision)
-            
-        ac = self.h5f.get_data_by_reference(nodename)
-        if ac[:].sum() == 0: # only initialized
-#            print("write {} to:".format(traitname),nodename)
-            ac[:] = func()
+            if self.precision == 'complex128': eva_dtype = 'float64'
+            elif self.precision == 'complex64': eva_dtype = 'float32'
+            shape = self.csm.shape
+            # chunks of one frequency, as the data is read and written by frequency
+            self.h5f.create_compressible_array(names[0], shape[0:2], eva_dtype, 
+                                               chunkshape=(1,)+shape[1:2])
+            self.h5f.create_compressible_array(names[1], shape, self.precision, 
+                                               chunkshape=(1,)+shape[1:])
+            self.h5f.create_compressible_array(names[2], shape[0:1], 'int8')
+
+        (eva, eve, fr) = [self.h5f.get_data_by_reference(name) for name in names]
+        missing = flatnonzero(fr[:] == 0)
+        if missing.size:
+            if config.global_caching == 'readonly': 
+                return func()
+            _eig_batches(self.csm, missing, eva, eve)
+            for i in missing:
+                fr[i] = 1
             self.h5f.flush()
-        return ac
+        return eva if traitname == 'eva' else eve
+
+    def _top_ev_names( self, k ):
+        return ['evatop%i_' % k + self.digest, 'evetop%i_' % k + self.digest, 
+                'evtopfreqs%i_' % k + self.digest]
+
+    def _cached_top_ev_k( self ):
+        """
+        Returns the values of k for which the largest eigenpairs are stored in 
+        the cache file. They are kept as attribute of the csm sum node.
+        """
+        sumname = 'csmsum_' + self.digest
+        if not self.h5f.is_cached(sumname):
+            return []
+        try:
+            return [int(k) for k in self.h5f.get_node_attribute(
+                self.h5f.get_data_by_reference(sumname), 'top_ev_k')]
+        except (KeyError, AttributeError):
+            return []
+
+    def _get_cached_ev_subset( self, k ):
+        """
+        Returns the k largest eigenpairs from the complete full or top-k' 
+        eigendecomposition with k' > k in the cache file, or None if there 
+        is none.
+        """
+        larger = sorted(_k for _k in self._cached_top_ev_k() if _k > k)
+        for names in [self._top_ev_names(_k) for _k in larger] + \
+                [['eva_' + self.digest, 'eve_' + self.digest, 'evfreqs_' + self.digest]]:
+            if self.h5f.is_cached(names[2]) and \
+                    self.h5f.get_data_by_reference(names[2])[:].all():
+                (eva, eve) = [self.h5f.get_data_by_reference(name) for name in names[:2]]
+                return (eva[:, -k:], eve[:, :, -k:])
+        return None
+
+    def _get_top_ev_filecache( self, k ):
+        """
+        function handles caching of the k largest eigenvalues and their 
+        eigenvectors, see :meth:`top_ev`. They are cached separately for each k.
+        """
+        H5cache.get_cache_file( self, self.basename ) 
+        if not self.h5f: # in case of global caching readonly
+            return self.calc_top_ev(k)
+        names = self._top_ev_names(k)
+        if config.global_caching == 'overwrite':
+            for name in names:
+                if self.h5f.is_cached(name):
+                    self.h5f.remove_data(name) # remove old data before writing in overwrite mode
+        if not self.h5f.is_cached(names[2]):
+            ev = self._get_cached_ev_subset(k)
+            if ev is not None:
+                return ev
+            if config.global_caching == 'readonly': 
+                return self.calc_top_ev(k)
+            for name in names[:2]:
+                if self.h5f.is_cached(name):
+                    self.h5f.remove_data(name)
+            ks = self._cached_top_ev_k()
+            if k not in ks:
+                self.h5f.set_node_attribute(
+                    self.h5f.get_data_by_reference('csmsum_' + self.digest), 
+                    'top_ev_k', ks + [k])
+            if self.precision == 'complex128': eva_dtype = 'float64'
+            elif self.precision == 'complex64': eva_dtype = 'float32'
+            shape = self.csm.shape
+            self.h5f.create_compressible_array(names[0], (shape[0], k), eva_dtype, 
+                                               chunkshape=(1, k))
+            self.h5f.create_compressible_array(names[1], shape[0:2]+(k,), self.precision, 
+                                               chunkshape=(1, shape[1], k))
+            self.h5f.create_compressible_array(names[2], shape[0:1], 'int8')
+        (eva, eve, fr) = [self.h5f.get_data_by_reference(name) for name in names]
+        missing = flatnonzero(fr[:] == 0)
+        if missing.size:
+            if config.global_caching == 'readonly': 
+                return self.calc_top_ev(k)
+            _eig_batches(self.csm, missing, eva, eve, k)
+            for i in missing:
+                fr[i] = 1
+            self.h5f.flush()
+        return (eva, eve)
              
-    @property_depends_on('digest')
+    def _get_csm_filecache( self ):
+        """
+        function handles result caching of the csm. Besides the csm, the 
+        unnormalized sum of the cross spectra and the number of FFT blocks 
+        contained in it are cached. If the time data has grown since the csm 
+        was cached, only the new FFT blocks are calculated and added.
+        The number of samples the csm was normalized for is kept as well.
+        """
+        nodename = 'csm_' + self.digest
+        sumname = 'csmsum_' + self.digest
+        top_ev_k = self._cached_top_ev_k()
+        if config.global_caching == 'overwrite':
+            for name in (nodename, sumname):
+                if self.h5f.is_cached(name):
+                    self.h5f.remove_data(name) # remove old data before writing in overwrite mode
+
+        numchannels = self.time_data.numchannels
+        total_blocks = self._total_blocks()
+        if self.h5f.is_cached(sumname):
+            acsum = self.h5f.get_data_by_reference(sumname)
+            try:
+                nblocks = self.h5f.get_node_attribute(acsum, 'num_blocks')
+                numsamples = self.h5f.get_node_attribute(acsum, 'numsamples')
+            except (KeyError, AttributeError): 
+                # not yet written completely, e.g. by another process
+                (nblocks, numsamples) = (total_blocks+1, -1)
+            if numsamples == self.time_data.numsamples:
+                return PackedCSM(self.h5f.get_data_by_reference(nodename), numchannels)
+            if nblocks > total_blocks: # time data has changed, start anew
+                nblocks = 0
+                csmUpper = zeros((acsum.shape[0], numchannels, numchannels), 
+                                 dtype=self.precision)
+            else:
+                csmUpper = _unpack_csm(acsum[:], numchannels, hermitian=False)
+        else:
+            if self.h5f.is_cached(nodename):
+                # full csm cached by older versions of Acoular, without any 
+                # information whether it is complete; replaced if possible
+                if config.global_caching == 'readonly':
+                    return self.h5f.get_data_by_reference(nodename)
+                self.h5f.remove_data(nodename)
+            acsum = None
+            nblocks = 0
+            numfreq = int(self.block_size/2 + 1)
+            csmUpper = zeros((numfreq, numchannels, numchannels), 
+                             dtype=self.precision)
+
+        nblocks = self._accumulate_csm(csmUpper, nblocks)
+        csm = self._normalize_csm_packed(csmUpper)
+        if config.global_caching == 'readonly':
+            return PackedCSM(csm, numchannels) if self.packed_csm \
+                else _unpack_csm(csm, numchannels)
+
+        if acsum is None:
+            self.h5f.create_compressible_array(sumname, csm.shape, self.precision)
+            acsum = self.h5f.get_data_by_reference(sumname)
+        acsum[:] = _pack_csm(csmUpper)
+        if not self.h5f.is_cached(nodename):
+            self.h5f.create_compressible_array(nodename, csm.shape, self.precision, 
+                                               chunkshape=(1,)+csm.shape[1:])
+        ac = self.h5f.get_data_by_reference(nodename)
+        ac[:] = csm
+        # the attributes mark the csm as complete, so they are written last
+        self.h5f.set_node_attribute(acsum, 'num_blocks', nblocks)
+        self.h5f.set_node_attribute(acsum, 'numsamples', self.time_data.numsamples)
+        # eigenvalues and eigenvectors of the former csm are outdated
+        names = ['eva_' + self.digest, 'eve_' + self.digest, 'evfreqs_' + self.digest]
+        for k in top_ev_k:
+            names += self._top_ev_names(k)
+        for name in names:
+            if self.h5f.is_cached(name):
+                self.h5f.remove_data(name)
+        self.h5f.set_node_attribute(acsum, 'top_ev_k', [])
+        self._top_ev.clear()
+        self.h5f.flush()
+        return PackedCSM(ac, numchannels)
+
+    def _calc_csm_memory( self ):
+        """
+        Calculates the csm, returned in packed form if :attr:`packed_csm` is set.
+        """
+        if not self.packed_csm:
+            return self.calc_csm()
+        t = self.time_data
+        numfreq = int(self.block_size/2 + 1)
+        csmUpper = zeros((numfreq, t.numchannels, t.numchannels), dtype=self.precision)
+        self._accumulate_csm(csmUpper)
+        return PackedCSM(self._normalize_csm_packed(csmUpper), t.numchannels)
+
+    @property_depends_on('digest, packed_csm')
     def _get_csm ( self ):
         """
         Main work is done here:
@@ -365,7 +848,7 @@ class PowerSpectra( HasPrivateTraits ):
                 config.global_caching == 'none' or 
                 (config.global_caching == 'individual' and self.cached == False)
             ):
-            return self.calc_csm()
+            return self._calc_csm_memory()
         else:
             return self._get_filecache('csm')
                           
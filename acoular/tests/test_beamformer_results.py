@@ -9,6 +9,7 @@
 import unittest
 
 from os.path import join
+from tempfile import mkdtemp
 
 import numpy as np
 
@@ -20,7 +21,9 @@ from acoular import Calib, MicGeom, PowerSpectra, \
 RectGrid, BeamformerBase, BeamformerEig, BeamformerOrth, BeamformerCleansc, \
 MaskedTimeSamples, BeamformerCMF, \
 BeamformerCapon, BeamformerMusic, BeamformerDamas, BeamformerClean, \
-BeamformerFunctional, BeamformerDamasPlus, BeamformerGIB, SteeringVector,Environment
+BeamformerFunctional, BeamformerDamasPlus, BeamformerGIB, SteeringVector,Environment, \
+TimeSamples
+from acoular.fbeamform import _steer_cache
 
 # if this flag is set to True
 WRITE_NEW_REFERENCE_DATA = False
@@ -149,6 +152,202 @@ class acoular_beamformer_test(unittest.TestCase):
             b1 = BeamformerBase(freq_data=f, steer=st, r_diag=True, cached = True)
             self.assertEqual(id(b0.result),id(b1.result))
 
+    def test_beamformer_executor(self):
+        # threaded calculation of the frequencies gives the serial results
+        acoular.config.global_caching = 'none'
+        for b0,b1 in zip(fbeamformers(),fbeamformers()):
+            if b0.__class__.__name__ in ('BeamformerCMF', 'BeamformerGIB'): # slow
+                continue
+            with self.subTest(b0.__class__.__name__+" executor = thread"):
+                b1.executor = 'thread'
+                b1.num_workers = 3
+                np.testing.assert_allclose(b1.result, b0.result, rtol=1e-5, atol=1e-8)
+
+    def test_beamformer_engine(self):
+        # matrix product evaluation gives the results of the numba kernels
+        acoular.config.global_caching = 'none'
+        for steer_type in ('classic', 'inverse', 'true level', 'true location'):
+            for r_diag in (False, True):
+                with self.subTest(steer_type+" r_diag=%s" % r_diag):
+                    s = SteeringVector(grid=g, mics=m, env=env, steer_type=steer_type)
+                    b0 = BeamformerBase(freq_data=f, steer=s, r_diag=r_diag, 
+                                        engine='numba', cached=False)
+                    b1 = BeamformerBase(freq_data=f, steer=s, r_diag=r_diag, 
+                                        engine='blas', cached=False)
+                    r0 = b0.result
+                    np.testing.assert_allclose(b1.result, r0, rtol=1e-4, atol=1e-6*r0.max())
+
+    def test_beamformer_single_precision(self):
+        # single precision calculation gives results close to double precision
+        acoular.config.global_caching = 'none'
+        for b0,b1 in zip(fbeamformers()[:4],fbeamformers()[:4]):
+            with self.subTest(b0.__class__.__name__+" precision = float32"):
+                b1.precision = 'float32'
+                r0, r1 = b0.result, b1.result
+                self.assertEqual(r1.dtype, np.float32)
+                np.testing.assert_allclose(r1, r0, rtol=1e-3, atol=1e-6*r0.max())
+
+
+# in-memory time data of three correlated sources for the executor tests
+rs = np.random.RandomState(1)
+t2 = TimeSamples(data=rs.standard_normal((4096, 3)).dot(rs.standard_normal((3, 8))) +
+                 0.1*rs.standard_normal((4096, 8)),
+                 sample_freq=51200., numchannels=8, numsamples=4096)
+m2 = MicGeom(mpos_tot=rs.uniform(-0.5, 0.5, (3, 8))*[[1], [1], [0]])
+g2 = RectGrid(x_min=-0.2, x_max=0.2, y_min=-0.2, y_max=0.2, z=0.5, increment=0.1)
+st2 = SteeringVector(grid=g2, mics=m2)
+
+def memory_beamformers():
+    f2 = PowerSpectra(time_data=t2, block_size=128, cached=False)
+    bb = BeamformerBase(freq_data=f2, steer=st2, r_diag=True)
+    be = BeamformerEig(freq_data=f2, steer=st2, r_diag=True, n=7)
+    return (BeamformerBase(freq_data=f2, steer=st2),
+            BeamformerMusic(freq_data=f2, steer=st2, n=2),
+            BeamformerClean(beamformer=bb, n_iter=10),
+            BeamformerOrth(beamformer=be, eva_list=[5, 6, 7]),
+            BeamformerCleansc(freq_data=f2, steer=st2),
+            BeamformerDamas(beamformer=bb, n_iter=10),
+            BeamformerCMF(freq_data=f2, steer=st2, method='NNLS'),
+            BeamformerGIB(freq_data=f2, steer=st2, method='LassoLars', n=2))
+
+class acoular_beamformer_blas_test(unittest.TestCase):
+
+    def test_blas_steer_blocks(self):
+        # matrix product evaluation with blocks of steering vectors gives the 
+        # results of the numba kernels and does not keep the steering vectors
+        caching = acoular.config.global_caching
+        acoular.config.global_caching = 'none'
+        try:
+            f2 = PowerSpectra(time_data=t2, block_size=128, cached=False)
+            for steer_type in ('classic', 'inverse', 'true level', 'true location'):
+                for r_diag in (False, True):
+                    with self.subTest(steer_type+" r_diag=%s" % r_diag):
+                        s = SteeringVector(grid=g2, mics=m2, steer_type=steer_type)
+                        r0 = BeamformerBase(freq_data=f2, steer=s, r_diag=r_diag, 
+                                            engine='numba').result
+                        r1 = BeamformerBase(freq_data=f2, steer=s, r_diag=r_diag, 
+                                            engine='blas').result
+                        np.testing.assert_allclose(r1, r0, rtol=1e-10, atol=1e-12*r0.max())
+                        for fi in f2.fftfreq()[f2.indices]:
+                            self.assertIsNone(_steer_cache.get((s.digest, 'steer', float(fi))))
+        finally:
+            acoular.config.global_caching = caching
+
+class acoular_beamformer_executor_test(unittest.TestCase):
+
+    def setUp(self):
+        self.config = (acoular.config.global_caching, acoular.config.cache_dir)
+
+    def tearDown(self):
+        (acoular.config.global_caching, acoular.config.cache_dir) = self.config
+
+    def reference_results(self):
+        acoular.config.global_caching = 'none'
+        return [b.result[:] for b in memory_beamformers()]
+
+    def test_thread_executor(self):
+        # threads give the serial results, also if the inputs and the psfs 
+        # are cached in files
+        refs = self.reference_results()
+        for caching in ('none', 'individual'):
+            acoular.config.global_caching = caching
+            acoular.config.cache_dir = mkdtemp()
+            for b, ref in zip(memory_beamformers(), refs):
+                with self.subTest(b.__class__.__name__+" global_caching = "+caching):
+                    b.executor = 'thread'
+                    b.num_workers = 3
+                    np.testing.assert_allclose(b.result[:], ref, rtol=1e-5, atol=1e-8*ref.max())
+
+    def test_process_executor(self):
+        # worker processes give the serial results for in-memory time data
+        refs = self.reference_results()
+        for b, ref in zip(memory_beamformers(), refs):
+            if b.__class__.__name__ not in ('BeamformerBase', 'BeamformerCleansc', 
+                                            'BeamformerDamas', 'BeamformerCMF'):
+                continue # slow
+            with self.subTest(b.__class__.__name__):
+                b.executor = 'process'
+                b.num_workers = 2
+                np.testing.assert_allclose(b.result[:], ref, rtol=1e-5, atol=1e-8*ref.max())
+
+def gib_mode_dense(b, A, emode):
+    # Suzuki and InverseIRLS iterations for one eigenmode with dense weight 
+    # matrices and matrix inverses, for less channels than grid points in 
+    # the case of InverseIRLS
+    numchannels, numpoints = A.shape
+    qi = np.zeros(numpoints, dtype=complex)
+    locpoints = np.arange(numpoints)
+    if b.method == 'Suzuki':
+        leftpoints = numpoints
+        weights = np.eye(numpoints)
+        for it in range(b.max_iter):
+            Al = A[:, locpoints]
+            if numchannels <= leftpoints:
+                AWA = Al.dot(weights).dot(Al.conj().T)
+                epsilon = max(abs(np.linalg.eigvals(AWA)))*b.eps_perc
+                qi[locpoints] = weights.dot(Al.conj().T).dot(
+                    np.linalg.inv(AWA + np.eye(numchannels)*epsilon)).dot(emode)
+            else:
+                AA = Al.conj().T.dot(Al)
+                epsilon = max(abs(np.linalg.eigvals(AA)))*b.eps_perc
+                qi[locpoints] = np.linalg.inv(AA + np.linalg.inv(weights)*epsilon).dot(
+                    Al.conj().T).dot(emode)
+            if b.beta < 1 and it > 1:
+                leftpoints = int(round(numpoints*b.beta**(it+1)))
+                idx = np.argsort(abs(qi[locpoints]))[::-1]
+                locpoints = np.delete(locpoints, idx[leftpoints:])
+                weights = np.diag(abs(qi[locpoints])**(2-b.pnorm))
+            else:
+                weights = np.diag(abs(qi)**(2-b.pnorm))
+    else:
+        weights = np.eye(numpoints)
+        for it in range(b.max_iter):
+            wtwi = np.linalg.inv(weights.T.dot(weights))
+            aH = A.conj().T
+            qi[:] = wtwi.dot(aH).dot(np.linalg.inv(A.dot(wtwi).dot(aH)).dot(emode))
+            weights = np.diag(abs(qi)**((2-b.pnorm)/2))
+            weights = weights/abs(weights).sum()
+    return qi, locpoints
+
+class acoular_gib_test(unittest.TestCase):
+
+    def test_mode_equals_dense(self):
+        # the iterations with vector weights and Cholesky solves give the 
+        # results of the dense formulation
+        acoular.config.global_caching = 'none'
+        f2 = PowerSpectra(time_data=t2, block_size=128, cached=False)
+        for method, beta in (('Suzuki', 0.9), ('Suzuki', 0.8), ('InverseIRLS', 1.)):
+            b = BeamformerGIB(freq_data=f2, steer=st2, method=method, beta=beta, n=2)
+            for i in (5, 20, 40):
+                with self.subTest("%s beta = %g, index %i" % (method, beta, i)):
+                    A = st2.transfer(f2.fftfreq()[i]).T
+                    (eva, eve) = np.linalg.eigh(f2.csm[i])
+                    emode = np.sqrt(eva[-1])*eve[:, -1]
+                    (q, locpoints) = b._calc_mode(A, emode)
+                    (q_ref, locpoints_ref) = gib_mode_dense(b, A, emode)
+                    np.testing.assert_array_equal(locpoints, locpoints_ref)
+                    # epsilon is set from an estimate of the largest eigenvalue
+                    np.testing.assert_allclose(q, q_ref, rtol=1e-4, atol=1e-6*abs(q_ref).max())
+
+    def test_gib_results(self):
+        # Suzuki and InverseIRLS results, InverseIRLS also with more channels 
+        # than grid points
+        acoular.config.global_caching = 'none'
+        f2 = PowerSpectra(time_data=t2, block_size=128, cached=False)
+        g3 = RectGrid(x_min=-0.1, x_max=0.1, y_min=-0.1, y_max=0.1, z=0.5, increment=0.2)
+        for name, b in (('Suzuki', BeamformerGIB(freq_data=f2, steer=st2, method='Suzuki', n=2)),
+                        ('InverseIRLS', BeamformerGIB(freq_data=f2, steer=st2, method='InverseIRLS', n=2)),
+                        ('InverseIRLS_overdetermined', 
+                         BeamformerGIB(freq_data=f2, steer=SteeringVector(grid=g3, mics=m2), 
+                                       method='InverseIRLS', n=2))):
+            with self.subTest(name):
+                name = join('reference_data', f'BeamformerGIB_{name}.npy')
+                actual_data = np.array([b.synthetic(cf, 1) for cf in cfreqs], dtype=np.float32)
+                if WRITE_NEW_REFERENCE_DATA:
+                    np.save(name, actual_data)
+                ref_data = np.load(name)
+                np.testing.assert_allclose(actual_data, ref_data, rtol=1e-5, atol=1e-8)
+
 if __name__ == '__main__':
     unittest.main() #exit=False
 
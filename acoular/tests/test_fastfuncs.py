@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#pylint: disable-msg=E0611, E1101, C0103, R0901, R0902, R0903, R0904, W0232
+#------------------------------------------------------------------------------
+# Copyright (c) Acoular Development Team.
+#------------------------------------------------------------------------------
+"""Implements testing of the numba-optimized core functions.
+"""
+
+import unittest
+from os import path
+
+import numpy as np
+from scipy.optimize import nnls
+
+import acoular
+from acoular import config, MicGeom, RectGrid, SteeringVector, PointSpreadFunction
+from acoular.fastFuncs import beamformerFreq, damasSolverGaussSeidel, \
+damasSolverBlockGaussSeidel, cmfSolverFISTA, sodixCostGradient, cleanscCoherentVector, \
+beamformerSteerVectors
+
+NMICS = 8
+NGRID = 20
+NFREQS = 5
+
+rng = np.random.RandomState(1)
+mpos = rng.uniform(-0.5, 0.5, (NMICS, 3))
+mpos[:, 2] = 0.
+gpos = rng.uniform(-0.5, 0.5, (NGRID, 3))
+gpos[:, 2] = 1.
+r0 = np.sqrt((gpos**2).sum(1))
+rm = np.sqrt(((gpos[:, np.newaxis] - mpos[np.newaxis])**2).sum(2))
+k = np.linspace(5., 50., NFREQS)
+spec = rng.standard_normal((NFREQS, NMICS, 3)) + 1j*rng.standard_normal((NFREQS, NMICS, 3))
+csm = np.einsum('fik,fjk->fij', spec, spec.conj())
+eva, eve = np.linalg.eigh(csm)
+csm_noise = csm[0]
+
+
+class Test_BeamformerFreq(unittest.TestCase):
+
+    def test_batch_equals_single(self):
+        """ test that the batched evaluation of several frequencies
+        gives the same results as evaluating one frequency after another"""
+        for steer_type in ('classic', 'inverse', 'true level', 'true location'):
+            for r_diag in (False, True):
+                with self.subTest(steer_type + ' r_diag=%s' % r_diag):
+                    batch = beamformerFreq(steer_type, r_diag, 1.0, (r0, rm, k), csm)
+                    for i in range(NFREQS):
+                        single = beamformerFreq(steer_type, r_diag, 1.0, (r0, rm, k[i]), csm[i])
+                        np.testing.assert_allclose(batch[0][i], single[0], rtol=1e-10)
+                        np.testing.assert_allclose(batch[1][i], single[1], rtol=1e-10)
+                with self.subTest(steer_type + ' eigenvalues r_diag=%s' % r_diag):
+                    batch = beamformerFreq(steer_type, r_diag, 1.0, (r0, rm, k), (eva[:, 1:], eve[:, :, 1:]))
+                    for i in range(NFREQS):
+                        single = beamformerFreq(steer_type, r_diag, 1.0, (r0, rm, k[i]), (eva[i, 1:], eve[i, :, 1:]))
+                        np.testing.assert_allclose(batch[0][i], single[0], rtol=1e-10)
+
+    def test_batch_custom_steer(self):
+        """ test batched evaluation with custom steering vectors"""
+        steer = np.exp(-1j*k[:, np.newaxis, np.newaxis]*rm[np.newaxis]) / NMICS
+        for r_diag in (False, True):
+            with self.subTest('r_diag=%s' % r_diag):
+                batch = beamformerFreq('custom', r_diag, 1.0, steer, csm)
+                for i in range(NFREQS):
+                    single = beamformerFreq('custom', r_diag, 1.0, steer[i], csm[i])
+                    np.testing.assert_allclose(batch[0][i], single[0], rtol=1e-10)
+                    np.testing.assert_allclose(batch[1][i], single[1], rtol=1e-10)
+
+    def test_single_precision(self):
+        """ test that the single precision kernels give float32 results 
+        close to those of the double precision kernels"""
+        steer = np.exp(-1j*k[:, np.newaxis, np.newaxis]*rm[np.newaxis]) / NMICS
+        for steer_type, inp in (('classic', (r0, rm, k)), ('custom', steer)):
+            for r_diag in (False, True):
+                with self.subTest(steer_type + ' r_diag=%s' % r_diag):
+                    ref = beamformerFreq(steer_type, r_diag, 1.0, inp, csm)[0]
+                    res = beamformerFreq(steer_type, r_diag, 1.0, inp, csm.astype(np.complex64))[0]
+                    self.assertEqual(res.dtype, np.float32)
+                    np.testing.assert_allclose(res, ref, rtol=1e-4, atol=1e-5*abs(ref).max())
+                with self.subTest(steer_type + ' eigenvalues r_diag=%s' % r_diag):
+                    ref = beamformerFreq(steer_type, r_diag, 1.0, inp, (eva, eve))[0]
+                    res = beamformerFreq(steer_type, r_diag, 1.0, inp, (eva, eve.astype(np.complex64)))[0]
+                    self.assertEqual(res.dtype, np.float32)
+                    np.testing.assert_allclose(res, ref, rtol=1e-4, atol=1e-5*abs(ref).max())
+
+
+class Test_DamasSolver(unittest.TestCase):
+
+    def setUp(self):
+        # diagonally dominant psf with unit main diagonal as assumed by 
+        # DAMAS, so that both solvers converge
+        psf = rng.uniform(0, 1, (NGRID, NGRID))
+        self.psf = 0.02 * (psf + psf.T)
+        np.fill_diagonal(self.psf, 1.)
+        self.y = self.psf.dot(rng.uniform(0, 1, NGRID))
+
+    def test_block_equals_gauss_seidel(self):
+        """ test that block-wise and plain Gauss-Seidel give the same result"""
+        x_gs = self.y.copy()
+        damasSolverGaussSeidel(self.psf, self.y, 200, 1.0, x_gs)
+        x_bl = self.y.copy()
+        n = damasSolverBlockGaussSeidel(self.psf, self.y, 200, 1.0, 0.0, x_bl, 8)
+        self.assertEqual(n, 200)
+        np.testing.assert_allclose(x_bl, x_gs, rtol=1e-6)
+
+    def test_block_tolerance(self):
+        """ test that the block-wise solver stops early with a tolerance"""
+        x = self.y.copy()
+        n = damasSolverBlockGaussSeidel(self.psf, self.y, 1000, 1.0, 1e-8, x, 8)
+        self.assertLess(n, 1000)
+        np.testing.assert_allclose(self.psf.dot(x), self.y, rtol=1e-5)
+
+    def test_block_deterministic(self):
+        """ test that the parallel block-wise solver gives the same result 
+        in every run"""
+        x0 = self.y.copy()
+        damasSolverBlockGaussSeidel(self.psf, self.y, 50, 1.0, 0.0, x0, 8)
+        for _ in range(5):
+            x = self.y.copy()
+            damasSolverBlockGaussSeidel(self.psf, self.y, 50, 1.0, 0.0, x, 8)
+            np.testing.assert_array_equal(x, x0)
+
+    def test_block_psf(self):
+        """ test that block-wise and plain Gauss-Seidel give the same result 
+        for the dense PSF of a real array"""
+        caching = config.global_caching
+        config.global_caching = 'none'
+        try:
+            m = MicGeom(from_file=path.join(path.split(acoular.__file__)[0], 'xml', 'array_56.xml'))
+            g = RectGrid(x_min=-0.3, x_max=0.3, y_min=-0.3, y_max=0.3, z=0.68, increment=0.02)
+            psf = PointSpreadFunction(steer=SteeringVector(grid=g, mics=m), 
+                                      calcmode='full', freq=2000.).psf[:]
+        finally:
+            config.global_caching = caching
+        q = np.zeros(g.size)
+        q[[100, 480, 800]] = (1., 0.5, 0.25)
+        y = psf.dot(q)
+        x_gs = y.copy()
+        damasSolverGaussSeidel(psf, y, 200, 1.0, x_gs)
+        x_bl = y.copy()
+        damasSolverBlockGaussSeidel(psf, y, 200, 1.0, 0.0, x_bl)
+        np.testing.assert_allclose(x_bl, x_gs, rtol=1e-6, atol=1e-8)
+        self.assertLess(np.linalg.norm(psf.dot(x_bl) - y) / np.linalg.norm(y), 0.1)
+
+
+class Test_CmfSolver(unittest.TestCase):
+
+    def test_fista_equals_nnls(self):
+        """ test that the matrix-free FISTA solver gives the NNLS solution of 
+        the usual CMF formulation with realified Kronecker products"""
+        h = rng.standard_normal((NGRID, NMICS)) + 1j*rng.standard_normal((NGRID, NMICS))
+        csm = np.einsum('g,gm,gn->mn', rng.uniform(0, 1, NGRID), h, h.conj()) + \
+            0.1 * csm_noise
+        iu = np.triu_indices(NMICS, 1)
+        kron = h[:, iu[0]] * h[:, iu[1]].conj()
+        A = np.vstack([kron.real.T, kron.imag.T])
+        R = np.hstack([csm[iu].real, csm[iu].imag])
+        ref = nnls(A, R)[0]
+        weight = np.full((NMICS, NMICS), 0.5)
+        np.fill_diagonal(weight, 0.)
+        x = np.zeros(NGRID)
+        cmfSolverFISTA(h, csm, weight, 0.0, 50000, 1e-14, x)
+        np.testing.assert_allclose(x, ref, rtol=1e-3, atol=1e-4 * ref.max())
+
+
+class Test_SodixKernel(unittest.TestCase):
+
+    def test_cost_gradient_equals_einsum(self):
+        """ test the fused SODIX kernel against the einsum formulation"""
+        h = rng.standard_normal((NGRID, NMICS)) + 1j*rng.standard_normal((NGRID, NMICS))
+        D = rng.uniform(0, 1, (NGRID, NMICS))
+        csmmod = np.einsum('jm,jm,jn,jn->mn', h, D, D, h.conj())
+        inner = csm[1] - csmmod
+        func = np.sum(np.absolute(inner))**2
+        der = -4 * D * np.real(np.einsum('rm,rl,lm->rl', h, h.conj(), inner))
+        grad = np.zeros((NGRID, NMICS))
+        self.assertAlmostEqual(sodixCostGradient(h, D, csm[1], grad) / func, 1.)
+        np.testing.assert_allclose(grad, der, rtol=1e-8, atol=1e-10*abs(der).max())
+
+
+class Test_Cleansc(unittest.TestCase):
+
+    def test_coherent_vector(self):
+        """ test the coherent source vector iteration against numpy"""
+        w = rng.standard_normal(NMICS) + 1j*rng.standard_normal(NMICS)
+        D1 = np.dot(csm[2] - np.diag(np.diag(csm[2])), w) / 10.
+        hh = w.copy()
+        ww = w.conj()*w
+        for m in range(20):
+            H = hh.conj()*hh
+            hh = (D1+H*w)/np.sqrt(1+np.dot(ww, H))
+        np.testing.assert_allclose(cleanscCoherentVector(D1, w, 20), hh, rtol=1e-10)
+
+    def test_rank_one_map(self):
+        """ test the rank-one map update used in CLEAN-SC against beamformerFreq"""
+        hh = spec[1, :, 0]
+        for steer_type in ('custom', 'classic', 'inverse', 'true level', 'true location'):
+            if steer_type == 'custom':
+                steer = W = np.exp(-1j*k[1]*rm) / NMICS
+            else:
+                steer = (r0, rm, k[1])
+                W = beamformerSteerVectors(steer_type, r0, rm, k[1])
+            for r_diag in (False, True):
+                with self.subTest('%s r_diag=%s' % (steer_type, r_diag)):
+                    ref = beamformerFreq(steer_type, r_diag, 1.0, steer, 
+                                         (np.array((2.,)), hh.conj()[:, np.newaxis]))[0]
+                    h1 = np.absolute(np.dot(W, hh))**2
+                    if r_diag:
+                        h1 -= np.dot((W*W.conj()).real, (hh*hh.conj()).real)
+                    np.testing.assert_allclose(2. * h1, ref, rtol=1e-10, atol=1e-14*abs(ref).max())
+
+if __name__ == '__main__':
+    unittest.main()
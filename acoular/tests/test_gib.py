@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#pylint: disable-msg=E0611, E1101, C0103, R0901, R0902, R0903, R0904, W0232
+#------------------------------------------------------------------------------
+# Copyright (c) Acoular Development Team.
+#------------------------------------------------------------------------------
+"""Implements testing of the GIB iterations.
+"""
+
+import unittest
+
+import numpy as np
+#acoular imports
+import acoular
+acoular.config.global_caching = 'none' # to make sure that nothing is cached
+
+from acoular import MicGeom, RectGrid, SteeringVector, BeamformerGIB
+
+m = MicGeom()
+m.mpos_tot = ((0.5,0.5,0),(0,0,0),(-0.5,-0.5,0),(0.3,-0.2,0),(-0.4,0.3,0))
+g = RectGrid(x_min=-0.2, x_max=0.2, y_min=-0.2, y_max=0.2, z=0.5, increment=0.1)
+st = SteeringVector(grid=g, mics=m)
+A = st.transfer(3000.).T
+emode = np.random.RandomState(3).standard_normal(A.shape[0]) + 0j
+
+
+def suzuki_dense(A, emode, max_iter, eps_perc, pnorm):
+    """ Suzuki iterations with dense weight matrices and full eigenvalues."""
+    numchannels, numpoints = A.shape
+    weights = np.eye(numpoints)
+    for it in range(max_iter):
+        AWA = A.dot(weights).dot(A.conj().T)
+        epsilon = max(abs(np.linalg.eigvals(AWA)))*eps_perc
+        qi = weights.dot(A.conj().T).dot(
+            np.linalg.inv(AWA + np.eye(numchannels)*epsilon)).dot(emode)
+        weights = np.diag(abs(qi)**(2-pnorm))
+    return qi
+
+
+class Test_BeamformerGIB(unittest.TestCase):
+
+    def test_suzuki_equals_dense(self):
+        """ test that the Suzuki iterations with vector weights and Cholesky
+        solves give the result of the dense formulation"""
+        b = BeamformerGIB(steer=st, method='Suzuki', beta=1., max_iter=4)
+        qi, locpoints = b._calc_mode(A, emode)
+        np.testing.assert_array_equal(locpoints, np.arange(g.size))
+        np.testing.assert_allclose(qi, suzuki_dense(A, emode, 4, b.eps_perc, b.pnorm),
+                                   rtol=1e-4, atol=1e-8)
+
+    def test_suzuki_reduced_points(self):
+        """ test that the number of source points is reduced with beta < 1"""
+        b = BeamformerGIB(steer=st, method='Suzuki', beta=0.8, max_iter=6)
+        qi, locpoints = b._calc_mode(A, emode)
+        self.assertEqual(len(locpoints), int(round(g.size*0.8**6)))
+        self.assertTrue(np.all(np.isfinite(qi)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+#pylint: disable-msg=E0611, E1101, C0103, R0901, R0902, R0903, R0904, W0232
+#------------------------------------------------------------------------------
+# Copyright (c) Acoular Development Team.
+#------------------------------------------------------------------------------
+"""Implements testing of the cache file handling.
+"""
+
+import gc
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from os import path, utime
+from tempfile import mkdtemp
+from threading import Thread
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import numpy as np
+
+from traits.api import HasPrivateTraits, Instance
+#acoular imports
+from acoular import config, TimeSamples, MicGeom, RectGrid, PowerSpectra, \
+SteeringVector, BeamformerBase
+from acoular.h5cache import H5cache
+from acoular.h5files import H5CacheFileBase, H5CacheDirectory
+
+
+class CacheUser(HasPrivateTraits):
+    h5f = Instance(H5CacheFileBase, transient=True)
+
+
+def write_rows(filename, rows):
+    f = H5CacheDirectory(filename)
+    f.create_compressible_array('shared', (8, 3), 'float64')
+    ac = f.get_data_by_reference('shared')
+    for i in rows:
+        ac[i] = i
+    f.flush()
+
+
+def beamformer_result(cache_dir):
+    # result of a beamformer that is cached in cache_dir with the directory
+    # backend, or not cached if cache_dir is None
+    if cache_dir is None:
+        config.global_caching = 'none'
+    else:
+        config.global_caching = 'individual'
+        config.cache_backend = 'directory'
+        config.cache_dir = cache_dir
+    rs = np.random.RandomState(1)
+    t = TimeSamples(data=rs.standard_normal((4096, 4)), sample_freq=51200., 
+                    numchannels=4, numsamples=4096)
+    m = MicGeom(mpos_tot=rs.uniform(-0.5, 0.5, (3, 4)))
+    g = RectGrid(x_min=-0.2, x_max=0.2, y_min=-0.2, y_max=0.2, z=0.5, increment=0.1)
+    f = PowerSpectra(time_data=t, block_size=128)
+    b = BeamformerBase(freq_data=f, steer=SteeringVector(grid=g, mics=m))
+    return b.result[:]
+
+
+class Test_H5cache(unittest.TestCase):
+
+    def setUp(self):
+        self.caching = config.global_caching
+        config.global_caching = 'individual'
+
+    def tearDown(self):
+        config.global_caching = self.caching
+
+    def test_file_lifecycle(self):
+        """ test that cache files are shared and closed when unused"""
+        a, b = CacheUser(), CacheUser()
+        H5cache.get_cache_file(a, 'test_lifecycle_a')
+        H5cache.get_cache_file(b, 'test_lifecycle_a')
+        self.assertIs(a.h5f, b.h5f)
+        self.assertEqual(H5cache.openFileReferenceCount['test_lifecycle_a_cache.h5'], 2)
+        # switching to another file releases the first one
+        H5cache.get_cache_file(a, 'test_lifecycle_b')
+        self.assertEqual(H5cache.openFileReferenceCount['test_lifecycle_a_cache.h5'], 1)
+        del b
+        gc.collect()
+        H5cache.get_cache_file(a, 'test_lifecycle_b')
+        self.assertNotIn('test_lifecycle_a_cache.h5', H5cache.open_files)
+        del a
+        gc.collect()
+        H5cache.get_cache_file(CacheUser(), 'test_lifecycle_a')
+        self.assertNotIn('test_lifecycle_b_cache.h5', H5cache.open_files)
+
+    def test_threads(self):
+        """ test that cache files can be requested from several threads"""
+        users = [CacheUser() for i in range(40)]
+        def get(objs):
+            for obj in objs:
+                H5cache.get_cache_file(obj, 'test_threads')
+        threads = [Thread(target=get, args=(users[i::4],)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(H5cache.openFileReferenceCount['test_threads_cache.h5'], 40)
+        self.assertTrue(all(obj.h5f is users[0].h5f for obj in users))
+
+    def test_eviction(self):
+        """ test that least recently used cache files are deleted if the 
+        cache size exceeds its limit"""
+        (cache_dir, limit) = (config.cache_dir, config.cache_size_limit)
+        config.cache_dir = mkdtemp()
+        try:
+            for i, name in enumerate(('test_evict_a', 'test_evict_b', 'test_evict_c')):
+                obj = CacheUser()
+                H5cache.get_cache_file(obj, name)
+                obj.h5f.create_compressible_array('data', (1000, 100), 'float64')
+                obj.h5f.get_data_by_reference('data')[:] = np.random.rand(1000, 100)
+                self.assertFalse(obj.h5f.is_cached('other'))
+                obj.h5f.flush()
+                del obj
+                gc.collect()
+                H5cache.close_unreferenced_cachefiles()
+                utime(path.join(config.cache_dir, name + '_cache.h5'), (i, i))
+            stats = H5cache.get_statistics()
+            sizes = dict((name, size) for t, size, name in H5cache.get_cache_entries())
+            self.assertEqual(stats['size'], sum(sizes.values()))
+            self.assertEqual(stats['nodes']['test_evict_a_cache.h5'], (0, 1))
+            # access a, so that b is the least recently used file
+            H5cache.get_cache_file(CacheUser(), 'test_evict_a')
+            gc.collect()
+            config.cache_size_limit = stats['size'] - 1
+            H5cache.close_unreferenced_cachefiles()
+            names = [name for t, size, name in H5cache.get_cache_entries()]
+            self.assertEqual(sorted(names), ['test_evict_a_cache.h5', 'test_evict_c_cache.h5'])
+            self.assertEqual(H5cache.get_statistics()['evictions'] - stats['evictions'], 1)
+        finally:
+            config.cache_size_limit = limit
+            config.cache_dir = cache_dir
+
+    @unittest.skipIf(fcntl is None, "no file locking")
+    def test_eviction_locked(self):
+        """ test that cache files that are in use by another process are 
+        not deleted"""
+        (cache_dir, limit) = (config.cache_dir, config.cache_size_limit)
+        config.cache_dir = mkdtemp()
+        try:
+            for i, name in enumerate(('test_lease_a', 'test_lease_b', 'test_lease_c')):
+                obj = CacheUser()
+                H5cache.get_cache_file(obj, name)
+                self.assertTrue(path.isfile(path.join(config.cache_dir, name + '_cache.h5.lock')))
+                obj.h5f.create_compressible_array('data', (1000, 100), 'float64')
+                obj.h5f.get_data_by_reference('data')[:] = np.random.rand(1000, 100)
+                obj.h5f.flush()
+                del obj
+                gc.collect()
+                H5cache.close_unreferenced_cachefiles()
+                # the lock file is deleted with the last lease
+                self.assertFalse(path.exists(path.join(config.cache_dir, name + '_cache.h5.lock')))
+                utime(path.join(config.cache_dir, name + '_cache.h5'), (i, i))
+            # the least recently used file a is open in another process
+            lock = open(path.join(config.cache_dir, 'test_lease_a_cache.h5.lock'), 'a')
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            config.cache_size_limit = H5cache.get_statistics()['size'] - 1
+            H5cache.enforce_cache_size()
+            names = [name for t, size, name in H5cache.get_cache_entries()]
+            self.assertEqual(sorted(names), ['test_lease_a_cache.h5', 'test_lease_c_cache.h5'])
+            lock.close()
+            config.cache_size_limit = H5cache.get_statistics()['size'] - 1
+            H5cache.enforce_cache_size()
+            names = [name for t, size, name in H5cache.get_cache_entries()]
+            self.assertEqual(names, ['test_lease_c_cache.h5'])
+        finally:
+            config.cache_size_limit = limit
+            config.cache_dir = cache_dir
+
+    def test_directory_nodes(self):
+        """ test storing arrays, attributes and groups in a cache directory"""
+        f = H5CacheDirectory(path.join(mkdtemp(), 'test_cache'))
+        self.assertFalse(f.is_cached('a'))
+        f.create_compressible_array('a', (4, 2), 'complex128')
+        ac = f.get_data_by_reference('a')
+        self.assertEqual(ac.shape, (4, 2))
+        ac[1] = 1+2j
+        f.set_node_attribute(ac, 'num', np.int64(3))
+        ac = f.get_data_by_reference('a')
+        np.testing.assert_array_equal(ac[1], 1+2j)
+        self.assertEqual(f.get_node_attribute(ac, 'num'), 3)
+        self.assertIn('num', ac.attrs)
+        group = f.create_new_group('g')
+        f.create_extendable_array('b', (0, 3), 'float32', group)
+        # the group is only visible when it is complete
+        self.assertFalse(f.is_cached('g'))
+        f.complete_group(group)
+        self.assertTrue(f.is_cached('g') and f.is_cached('b', '/g'))
+        b = f.get_data_by_reference('b', '/g')
+        self.assertEqual(b.shape, (0, 3))
+        f.append_data(b, np.ones((2, 3)))
+        f.append_data(b, np.zeros((1, 3)))
+        np.testing.assert_array_equal(f.get_data_by_reference('b', '/g').sum(1), [3, 3, 0])
+        # rows without elements
+        f.create_extendable_array('c', (0, 0), 'float64')
+        f.append_data(f.get_data_by_reference('c'), np.zeros((2, 0)))
+        self.assertEqual(f.get_data_by_reference('c').shape, (2, 0))
+        f.remove_data('c')
+        f.remove_data('g')
+        f.remove_data('a')
+        self.assertFalse(f.is_cached('g') or f.is_cached('a'))
+
+    def test_directory_processes(self):
+        """ test that several processes can write to the same node"""
+        filename = path.join(mkdtemp(), 'test_cache')
+        with ProcessPoolExecutor(4, mp_context=get_context('spawn')) as ex:
+            list(ex.map(write_rows, [filename]*4, [range(i, 8, 4) for i in range(4)]))
+        ac = H5CacheDirectory(filename, 'r').get_data_by_reference('shared')
+        np.testing.assert_array_equal(ac[:, 0], np.arange(8))
+
+    def test_directory_beamformer_processes(self):
+        """ test that several processes can cache the same beamformer result
+        at the same time"""
+        ref = beamformer_result(None)
+        cache_dirs = [mkdtemp() for i in range(3)]
+        with ProcessPoolExecutor(4, mp_context=get_context('spawn')) as ex:
+            results = list(ex.map(beamformer_result, [d for d in cache_dirs for i in range(4)]))
+        for res in results:
+            np.testing.assert_allclose(res, ref, rtol=1e-10)
+
+    def test_directory_backend(self):
+        """ test that the cache directory is used for cache files"""
+        backend = config.cache_backend
+        config.cache_backend = 'directory'
+        try:
+            obj = CacheUser()
+            H5cache.get_cache_file(obj, 'test_backend')
+            self.assertIsInstance(obj.h5f, H5CacheDirectory)
+            self.assertTrue(path.isdir(obj.h5f.filename))
+        finally:
+            config.cache_backend = backend
+
+
+if __name__ == '__main__':
+    unittest.main()
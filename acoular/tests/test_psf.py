@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#pylint: disable-msg=E0611, E1101, C0103, R0901, R0902, R0903, R0904, W0232
+#------------------------------------------------------------------------------
+# Copyright (c) Acoular Development Team.
+#------------------------------------------------------------------------------
+"""Implements testing of the matrix-free point spread function operator and 
+of the FFT-based DAMAS2 solver.
+"""
+
+import unittest
+
+import numpy as np
+#acoular imports
+import acoular
+acoular.config.global_caching = 'none' # to make sure that nothing is cached
+
+from acoular import MicGeom, RectGrid, SteeringVector, PointSpreadFunction, \
+PointSpreadFunctionOperator, BeamformerBase, BeamformerDamas
+
+m = MicGeom()
+m.mpos_tot = ((0.5,0.5,0),(0,0,0),(-0.5,-0.5,0),(0.3,-0.2,0))
+g = RectGrid(x_min=-0.2, x_max=0.2, y_min=-0.2, y_max=0.2, z=0.5, increment=0.1)
+
+
+class Test_PointSpreadFunctionOperator(unittest.TestCase):
+
+    def test_operator_equals_psf(self):
+        """ test that products with the operator equal those with the full psf"""
+        x = np.random.RandomState(1).rand(g.size)
+        for steer_type in ('classic', 'inverse', 'true level', 'true location'):
+            with self.subTest(steer_type):
+                st = SteeringVector(grid=g, mics=m, steer_type=steer_type)
+                psf = PointSpreadFunction(steer=st, freq=2000., calcmode='full').psf[:]
+                op = PointSpreadFunctionOperator(steer=st, freq=2000.)
+                np.testing.assert_allclose(op.matvec(x), psf.dot(x), rtol=1e-6)
+                np.testing.assert_allclose(op.rmatvec(x), psf.T.dot(x), rtol=1e-6)
+                np.testing.assert_allclose(op.psf([2, 5]), psf[:, [2, 5]], rtol=1e-6,
+                                           atol=1e-6*abs(psf).max())
+                np.testing.assert_allclose(op.norm(100), np.linalg.norm(psf, 2),
+                                           rtol=1e-3)
+
+    def test_linear_operator(self):
+        """ test conversion to a scipy LinearOperator"""
+        op = PointSpreadFunctionOperator(steer=SteeringVector(grid=g, mics=m),
+                                         freq=4000.)
+        lo = op.aslinearoperator()
+        x = np.ones(g.size)
+        self.assertEqual(lo.shape, (g.size, g.size))
+        np.testing.assert_allclose(lo.matvec(x), op.matvec(x))
+        np.testing.assert_allclose(lo.rmatvec(x), op.rmatvec(x))
+
+
+class Test_Damas2(unittest.TestCase):
+
+    def test_fft_convolution(self):
+        """ test one DAMAS2 step against direct convolution with the kernel"""
+        bd = BeamformerDamas(beamformer=BeamformerBase(steer=SteeringVector(grid=g, mics=m)),
+                             solver='damas2', n_iter=2, damp=0.5)
+        kernel = bd._psf_kernel(2000.)
+        (nx, ny) = g.shape
+        y = np.random.RandomState(2).rand(g.size)
+        # reference by direct, zero padded convolution
+        a = abs(kernel).sum()
+        x = np.clip(0.5 * y / a, 0, None).reshape(nx, ny)
+        r = np.zeros((nx, ny))
+        for (k, l) in np.ndindex(nx, ny):
+            for (i, j) in np.ndindex(nx, ny):
+                ki, kj = i - k + nx//2, j - l + ny//2
+                if 0 <= ki < nx and 0 <= kj < ny:
+                    r[i, j] += kernel[ki, kj] * x[k, l]
+        x = np.clip(x + 0.5 * (y.reshape(nx, ny) - r) / a, 0, None)
+        np.testing.assert_allclose(bd._solve_damas2(kernel, y), x.reshape(-1))
+
+    def test_kernel(self):
+        """ test that the kernel is the PSF of a source at the grid centre"""
+        steer = SteeringVector(grid=g, mics=m)
+        bd = BeamformerDamas(beamformer=BeamformerBase(steer=steer), solver='damas2')
+        (nx, ny) = g.shape
+        psf = PointSpreadFunction(steer=steer, calcmode='full', freq=2000.).psf[:]
+        np.testing.assert_allclose(bd._psf_kernel(2000.).reshape(-1),
+                                   psf[:, (nx//2)*ny + ny//2], rtol=1e-10)
+
+    def test_digest(self):
+        """ test that the solver is part of the digest"""
+        bd = BeamformerDamas(beamformer=BeamformerBase())
+        d = bd.digest
+        bd.solver = 'damas2'
+        self.assertNotEqual(d, bd.digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
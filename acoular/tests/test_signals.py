@@ -1,7 +1,10 @@
 import unittest
-from acoular import FiltWNoiseGenerator
+from acoular import FiltWNoiseGenerator, WNoiseGenerator, PNoiseGenerator, \
+SineGenerator, GenericSignalGenerator, TimeSamples
 from numpy.random import RandomState
-from numpy import array
+from numpy import array, concatenate
+from numpy.testing import assert_allclose, assert_array_equal
+from scipy.signal import resample_poly
 #from parameterized import parameterized
 
 # some FIR/MA filter coefficients of a low pass
@@ -55,6 +58,39 @@ class Test_FiltWNoiseGenerator(unittest.TestCase):
             self.fwn.ma=ma
             self.assertEqual(self.fwn.signal().shape[0],expected_length)
 
+
+class Test_SignalGeneratorBlocks(unittest.TestCase):
+
+    def generators(self):
+        ts = TimeSamples(data=RandomState(2).standard_normal((300, 1)), 
+                         numsamples=300, numchannels=1, sample_freq=100)
+        return [WNoiseGenerator(sample_freq=100, numsamples=1000, seed=1),
+                PNoiseGenerator(sample_freq=100, numsamples=1000, seed=1, depth=8),
+                FiltWNoiseGenerator(sample_freq=100, numsamples=1000, seed=1, 
+                                    ma=MA_COEFF, ar=AR_COEFF),
+                SineGenerator(sample_freq=100, numsamples=1000, freq=7., phase=0.3),
+                GenericSignalGenerator(source=ts, numsamples=1000),
+                GenericSignalGenerator(source=ts, numsamples=1000, loop_signal=False)]
+
+    def test_result_equals_signal(self):
+        """test that the blocks of the signal generators form the signal"""
+        for gen in self.generators():
+            with self.subTest(gen.__class__.__name__):
+                blocks = list(gen.result(128))
+                self.assertEqual([len(b) for b in blocks], [128]*7 + [104])
+                assert_allclose(concatenate(blocks), gen.signal(), rtol=1e-12, atol=1e-12)
+
+    def test_uresult_equals_resample_poly(self):
+        """test that the block-wise upsampled signal equals the signal 
+        upsampled at once with a polyphase filter"""
+        for gen in self.generators()[:2]:
+            with self.subTest(gen.__class__.__name__):
+                usignal = concatenate(list(gen.uresult(4, 100)))
+                assert_allclose(usignal, resample_poly(gen.signal(), 4, 1), 
+                                rtol=1e-10, atol=1e-12)
+                assert_array_equal(concatenate(list(gen.uresult(1, 100))), gen.signal())
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -1,7 +1,13 @@
 import unittest
+from unittest import mock
 from os.path import join
 import numpy as np
-from acoular import __file__ as bpath, config, WNoiseGenerator, PointSource, MicGeom
+from scipy.signal import resample_poly
+from traits.api import TraitError
+from acoular import __file__ as bpath, config, WNoiseGenerator, PointSource, MicGeom, \
+MovingPointSource, MovingPointSourceDipole, MovingLineSource, Trajectory, SineGenerator, \
+PointSourceDipole, SphericalHarmonicSource, LineSource
+from acoular.sources import _trajectory_splines, _SignalWindow, SINC_HALF
 
 config.global_caching = "none"
 
@@ -41,6 +47,104 @@ def get_source_result(Source, num=32):
     return next(source.result(num)).astype(np.float32)
 
 
+def per_sample_emission_time(source, t, direction=0):
+    """
+    Newton-Raphson iterations for the emission times of a moving source for
+    one sample at all microphones, as done by the former implementation of 
+    the moving sources.
+    """
+    epslim = 0.1 / source.up / source.sample_freq
+    eps = np.ones(source.mics.num_mics)
+    te = t.copy()
+    j = 0
+    while abs(eps).max() > epslim and j < 100:
+        loc = np.array(source.trajectory.location(te)) + direction
+        rm = loc - source.mics.mpos
+        rm = np.sqrt((rm*rm).sum(0))
+        loc /= np.sqrt((loc*loc).sum(0))
+        der = np.array(source.trajectory.location(te, der=1))
+        Mr = (der*loc).sum(0) / source.env.c
+        eps = (te + rm/source.env.c - t) / (1+Mr)
+        te -= eps
+        j += 1
+    return te, rm, Mr
+
+
+def per_sample_direction(source, direction, te):
+    """
+    Direction vector in the moving coordinate system at the emission time of 
+    the first microphone, as calculated by the former implementation.
+    """
+    if (source.rvec == 0).all():
+        return direction
+    dx = np.array(source.trajectory.location(te, der=1))[:, 0]
+    dy = np.cross(source.rvec, dx)
+    dz = np.cross(dx, dy)
+    RM = np.array((dx, dy, dz)).T
+    RM /= np.sqrt((RM*RM).sum(0))
+    return np.cross(RM.dot(direction)[:, 0], source.rvec)[:, np.newaxis]
+
+
+def per_sample_result(source):
+    """
+    Returns the output of a moving point source, moving dipole or moving line
+    source calculated sample by sample as in the former implementation.
+    """
+    nm = source.mics.num_mics
+    mpos = source.mics.mpos
+    tr = source.trajectory
+    if isinstance(source, MovingLineSource):
+        direc = np.array(source.direction, dtype=float)
+        dist = source.length / source.num_sources
+        dir2 = (direc / np.linalg.norm(direc) * dist).reshape((3, 1))
+        signals = []
+        for s in range(source.num_sources):
+            source.signal.rms = source.signal.rms * source.source_strength[s]
+            signals.append(source.signal.usignal(source.up))
+    else:
+        signal = source.signal.usignal(source.up)
+    if isinstance(source, MovingPointSourceDipole):
+        direc = np.array(source.direction, dtype=float) * 1e-5
+        direc_mag = np.sqrt(direc.dot(direc))
+        dist = source.env.c / source.sample_freq * direc_mag * 2
+        dir2 = (direc / direc_mag * dist / 2.0).reshape((3, 1))
+    t = source.start * np.ones(nm)
+    out = []
+    for n in range(source.numsamples):
+        try:
+            if isinstance(source, MovingLineSource):
+                t = t + 1. / source.sample_freq
+                te1 = per_sample_emission_time(source, t)[0]
+                row = np.zeros(nm)
+                for s in range(source.num_sources):
+                    diff = per_sample_direction(source, dir2, te1)
+                    te, rm, Mr = per_sample_emission_time(source, t, np.tile((diff*s).T, (nm, 1)).T)
+                    loc = np.array(tr.location(te))[:, 0][:, np.newaxis]
+                    diff = per_sample_direction(source, dir2, te)
+                    rms = source.env._r(loc + diff*s, mpos)[0]
+                    ind = (te - source.start_t + source.start) * source.sample_freq
+                    row += signals[s][np.array(0.5 + ind*source.up, dtype=np.int64)] / rms
+                out.append(row)
+                continue
+            te, rm, Mr = per_sample_emission_time(source, t)
+            t = t + 1. / source.sample_freq
+            ind = np.array(0.5 + (te - source.start_t + source.start) * source.sample_freq * source.up,
+                           dtype=np.int64)
+            if source.conv_amp:
+                rm *= (1-Mr)**2
+            if isinstance(source, MovingPointSourceDipole):
+                loc = np.array(tr.location(te))[:, 0][:, np.newaxis]
+                diff = per_sample_direction(source, dir2, te)
+                rm1 = source.env._r(loc + diff, mpos)[0]
+                rm2 = source.env._r(loc - diff, mpos)[0]
+                out.append(rm / dist * (signal[ind] / rm1 - signal[ind] / rm2))
+            else:
+                out.append(signal[ind] / rm)
+        except IndexError: # no more samples available from the signal
+            break
+    return np.array(out)
+
+
 class SourcesTest(unittest.TestCase):
     """
     A simple test case that verifies that the results of sources are not changing across different versions of code.
@@ -61,5 +165,114 @@ class SourcesTest(unittest.TestCase):
                 np.testing.assert_allclose(actual_data, ref_data, rtol=1e-5, atol=1e-8)
 
 
+class MovingSourceTest(unittest.TestCase):
+    """
+    Tests the emission time solver of the moving sources.
+    """
+
+    def test_emission_times(self):
+        """test that the emission times and distances of a block solve the 
+        retarded time equation for the spline trajectory"""
+        traj = Trajectory(points={0.0: (-1.0, 0.0, 1.0), 0.5: (0.0, 0.2, 1.0),
+                                  1.0: (1.0, 0.0, 1.2), 1.5: (2.0, -0.3, 1.2)})
+        mics = MicGeom(mpos_tot=[[0, 0.5, -0.5], [0, 0, 0.3], [0, 0, 0]])
+        source = MovingPointSource(signal=N1, mics=mics, trajectory=traj)
+        t = (0.2 + np.arange(NSAMPLES) / SFREQ)[:, np.newaxis].repeat(3, 1)
+        te, rm, Mr = source._emission_times(t, t[0], _trajectory_splines(traj))
+        loc = np.array(traj.location(te.ravel())).reshape(3, NSAMPLES, 3)
+        r = np.sqrt(((loc - mics.mpos[:, np.newaxis, :])**2).sum(0))
+        # the iterations stop if the last correction is below epslim
+        epslim = 0.1 / source.up / SFREQ
+        np.testing.assert_allclose(te + r / source.env.c, t, rtol=0, atol=epslim)
+        np.testing.assert_allclose(rm, r, rtol=0, atol=1e-4)
+        # single sample interface
+        te1, rm1, Mr1, xs = source.get_emission_time(t[10], 0)
+        np.testing.assert_allclose(te1, te[10], rtol=0, atol=epslim)
+
+    def test_result_equals_per_sample(self):
+        """test that the block-wise results of the moving sources equal
+        those of the former implementation sample by sample"""
+        traj = Trajectory(points={0.0: (-1.0, 0.0, 1.0), 0.05: (-0.5, 0.2, 1.0),
+                                  0.1: (0.0, 0.0, 1.2), 0.15: (0.5, -0.3, 1.2)})
+        mics = MicGeom(mpos_tot=[[0, 0.5, -0.5], [0, 0, 0.3], [0, 0, 0]])
+        def sources():
+            signal = WNoiseGenerator(sample_freq=SFREQ, numsamples=NSAMPLES, seed=SEED)
+            return (MovingPointSource(signal=signal, mics=mics, trajectory=traj),
+                    MovingPointSource(signal=signal, mics=mics, trajectory=traj, conv_amp=True),
+                    MovingPointSourceDipole(signal=signal, mics=mics, trajectory=traj,
+                                            direction=(1.0, 0.0, 0.0), rvec=(0, 0, 1.0)),
+                    MovingLineSource(signal=signal, mics=mics, trajectory=traj, length=0.3,
+                                     num_sources=3, source_strength=np.ones(3),
+                                     direction=(0.0, 1.0, 0.0), rvec=(0, 0, 1.0)))
+        for source, ref_source in zip(sources(), sources()):
+            with self.subTest(source.__class__.__name__ + ' conv_amp=%s' % source.conv_amp):
+                res = np.concatenate(list(source.result(16)))
+                ref = per_sample_result(ref_source)
+                self.assertEqual(res.shape, ref.shape)
+                # the iterations start from different emission times, so the 
+                # distances differ by the source movement within epslim
+                np.testing.assert_allclose(res, ref, rtol=1e-4, atol=1e-12)
+
+
+class UpsamplingTest(unittest.TestCase):
+    """
+    Tests the block-wise upsampling of the signal in the sources.
+    """
+
+    def test_poly_upsampling(self):
+        """test that the sources with block-wise polyphase upsampling of the 
+        signal pick the samples of the signal upsampled at once"""
+        traj = Trajectory(points={0.0: (-1.0, 0.0, 1.0), 0.1: (0.0, 0.2, 1.0),
+                                  0.2: (1.0, 0.0, 1.2)})
+        mics = MicGeom(mpos_tot=[[0, 0.5, -0.5], [0, 0, 0.3], [0, 0, 0]])
+        usignal = resample_poly(N1.signal(), 16, 1)
+        for source in (PointSource(signal=N1, mics=mics, upsampling='poly'),
+                       PointSource(signal=N1, mics=mics, upsampling='poly', prepadding='zeros'),
+                       MovingPointSource(signal=N1, mics=mics, trajectory=traj, upsampling='poly')):
+            with self.subTest(source.__class__.__name__ + source.prepadding):
+                res = np.concatenate(list(source.result(16)))
+                source.upsampling = 'fft'
+                with mock.patch.object(WNoiseGenerator, 'usignal', lambda self, up: usignal):
+                    ref = np.concatenate(list(source.result(16)))
+                np.testing.assert_allclose(res, ref, rtol=1e-10, atol=1e-12)
+
+    def test_unsupported_upsampling(self):
+        """test that the sources that index the upsampled signal directly
+        only allow the 'fft' upsampling method"""
+        for Source in (PointSourceDipole, SphericalHarmonicSource, LineSource, 
+                       MovingPointSourceDipole, MovingLineSource):
+            for upsampling in ('poly', 'sinc'):
+                with self.subTest(Source.__name__ + " " + upsampling):
+                    with self.assertRaises(TraitError):
+                        Source(upsampling=upsampling)
+
+    def test_sinc_delay(self):
+        """test that the windowed-sinc fractional delay gives the delayed
+        signal of a sine source"""
+        # integer delays give the signal itself
+        window = _SignalWindow(N1, 16, 'sinc')
+        x = np.arange(20, 40, dtype=float)[:, np.newaxis]
+        np.testing.assert_allclose(window.interpolate(x), N1.signal()[20:40, np.newaxis],
+                                   rtol=0, atol=1e-12)
+        sine = SineGenerator(sample_freq=SFREQ, numsamples=NSAMPLES, freq=100., phase=0.3)
+        traj = Trajectory(points={0.0: (-1.0, 0.0, 1.0), 0.1: (0.0, 0.2, 1.0),
+                                  0.2: (1.0, 0.0, 1.2)})
+        mics = MicGeom(mpos_tot=[[0, 0.5, -0.5], [0, 0, 0.3], [0, 0, 0]])
+        for source in (PointSource(signal=sine, mics=mics, upsampling='sinc', prepadding='zeros'),
+                       MovingPointSource(signal=sine, mics=mics, trajectory=traj, upsampling='sinc')):
+            with self.subTest(source.__class__.__name__):
+                res = np.concatenate(list(source.result(16)))
+                t = (np.arange(len(res)) / SFREQ)[:, np.newaxis].repeat(3, 1)
+                if isinstance(source, MovingPointSource):
+                    te, rm, _ = source._emission_times(t, t[0], _trajectory_splines(traj))
+                else:
+                    rm = source.env._r(np.array(source.loc).reshape((3, 1)), mics.mpos)
+                    te = t - rm / source.env.c
+                ref = sine.amplitude * np.sin(2*np.pi*sine.freq*te + sine.phase) / rm
+                # samples that need the signal before its start or after its end differ
+                valid = (te*SFREQ > SINC_HALF) & (te*SFREQ < NSAMPLES-1-SINC_HALF)
+                np.testing.assert_allclose(res[valid], ref[valid], rtol=0, atol=2e-3)
+
+
 if __name__ == "__main__":
     unittest.main()
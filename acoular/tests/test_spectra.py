@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#pylint: disable-msg=E0611, E1101, C0103, R0901, R0902, R0903, R0904, W0232
+#------------------------------------------------------------------------------
+# Copyright (c) Acoular Development Team.
+#------------------------------------------------------------------------------
+"""Implements testing of the cross spectral matrix estimation.
+"""
+
+import unittest
+
+from os import path
+from tempfile import mkdtemp
+
+import numpy as np
+import tables
+#acoular imports
+from acoular import config, TimeSamples, MaskedTimeSamples, PowerSpectra
+from acoular.spectra import PackedCSM
+
+NUMSAMPLES = 5000
+NUMCHANNELS = 4
+
+rng = np.random.RandomState(1)
+data = rng.standard_normal((2*NUMSAMPLES+123, NUMCHANNELS))
+
+
+def write_data(name, samples):
+    with tables.open_file(name, mode='w') as f:
+        ac = f.create_earray('/', 'time_data', tables.Float64Atom(), (0, NUMCHANNELS))
+        ac.set_attr('sample_freq', 51200.)
+        ac.append(samples)
+
+
+class Test_PowerSpectra(unittest.TestCase):
+
+    def test_growing_time_data(self):
+        """ test that the cached csm is updated when the time data grows"""
+        name = path.join(mkdtemp(), 'growing_time_data.h5')
+        caching = config.global_caching
+        config.global_caching = 'overwrite'
+        write_data(name, data[:NUMSAMPLES])
+        try:
+            for overlap in ('None', '50%', '87.5%'):
+                with self.subTest(overlap):
+                    # first calculation fills the cache, the following ones
+                    # only add new data
+                    for i, ns in enumerate((NUMSAMPLES, 2*NUMSAMPLES, 2*NUMSAMPLES+123)):
+                        write_data(name, data[:ns])
+                        ts = TimeSamples(name=name)
+                        ps = PowerSpectra(time_data=ts, block_size=256,
+                                          window='Hanning', overlap=overlap)
+                        csm = ps.csm[:]
+                        config.global_caching = 'none'
+                        ps_ref = PowerSpectra(time_data=ts, block_size=256,
+                                              window='Hanning', overlap=overlap)
+                        np.testing.assert_allclose(csm, ps_ref.csm, rtol=1e-10)
+                        config.global_caching = 'all'
+                        ts.h5f.close()
+                config.global_caching = 'overwrite'
+        finally:
+            config.global_caching = caching
+
+    def test_parallel_csm(self):
+        """ test that the csm calculated by several worker processes matches 
+        the serial calculation"""
+        name = path.join(mkdtemp(), 'parallel_time_data.h5')
+        write_data(name, data)
+        caching = config.global_caching
+        config.global_caching = 'none'
+        try:
+            ts = MaskedTimeSamples(name=name, start=100, stop=-200, invalid_channels=[1])
+            ps = PowerSpectra(time_data=ts, block_size=256,
+                              window='Hanning', overlap='75%')
+            csm = ps.csm
+            ps.num_workers = 3
+            np.testing.assert_allclose(ps.calc_csm(), csm, rtol=1e-10)
+            ts.h5f.close()
+        finally:
+            config.global_caching = caching
+
+    def test_packed_csm(self):
+        """ test that the packed csm gives the same results as the full csm"""
+        name = path.join(mkdtemp(), 'packed_time_data.h5')
+        write_data(name, data)
+        caching = config.global_caching
+        config.global_caching = 'none'
+        try:
+            ts = TimeSamples(name=name)
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            csm = ps.csm
+            ps.packed_csm = True
+            self.assertIsInstance(ps.csm, PackedCSM)
+            self.assertEqual(ps.csm.shape, csm.shape)
+            for key in (3, np.int64(3), slice(2, 9, 3), np.array([5, 1, 7]),
+                        csm.real[:, 0, 0] > 0.1, (slice(None), 1),
+                        (4, slice(1, 3), 2)):
+                with self.subTest(str(key)):
+                    np.testing.assert_array_equal(ps.csm[key], csm[key])
+            np.testing.assert_array_equal(np.array(ps.csm), csm)
+            config.global_caching = 'all'
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            self.assertIsInstance(ps.csm, PackedCSM)
+            np.testing.assert_array_equal(ps.csm[:], csm)
+            ts.h5f.close()
+        finally:
+            config.global_caching = caching
+
+    def test_cached_eigenvalues(self):
+        """ test that missing frequencies of cached eigenvalues and 
+        eigenvectors are calculated according to the stored flags"""
+        name = path.join(mkdtemp(), 'eigen_time_data.h5')
+        write_data(name, data)
+        caching = config.global_caching
+        try:
+            config.global_caching = 'none'
+            ts = TimeSamples(name=name)
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            (eva, eve) = (ps.eva, ps.eve)
+            config.global_caching = 'all'
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            np.testing.assert_array_equal(ps.eva[:], eva)
+            # mark some frequencies as missing and remove their data
+            ps.eve[3:6] = 0
+            fr = ps.h5f.get_data_by_reference('evfreqs_' + ps.digest)
+            fr[3:6] = 0
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            np.testing.assert_array_equal(ps.eve[:], eve)
+            self.assertTrue(fr[:].all())
+            ts.h5f.close()
+        finally:
+            config.global_caching = caching
+
+    def test_frequency_chunks(self):
+        """ test that cached spectra are chunked by frequency"""
+        name = path.join(mkdtemp(), 'chunked_time_data.h5')
+        write_data(name, data)
+        (caching, backend) = (config.global_caching, config.cache_backend)
+        config.global_caching = 'individual'
+        config.cache_backend = 'hdf5'
+        try:
+            ts = TimeSamples(name=name)
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            ps.eve
+            for nodename in ('csm_', 'eva_', 'eve_'):
+                node = getattr(ps.h5f.root, nodename + ps.digest)
+                self.assertEqual(node.chunkshape, (1,)+node.shape[1:])
+            ts.h5f.close()
+        finally:
+            (config.global_caching, config.cache_backend) = (caching, backend)
+
+    def test_top_eigenvalues(self):
+        """ test that the k largest eigenpairs equal those of the full 
+        eigendecomposition, in memory and cached"""
+        name = path.join(mkdtemp(), 'top_time_data.h5')
+        write_data(name, data)
+        caching = config.global_caching
+        try:
+            for mode in ('none', 'all', 'all'): # calculate, cache, read from cache
+                config.global_caching = mode
+                ts = TimeSamples(name=name)
+                ps = PowerSpectra(time_data=ts, block_size=128)
+                for k in (1, 2):
+                    with self.subTest("global_caching = %s, k = %i" % (mode, k)):
+                        (eva, eve) = ps.top_ev(k)
+                        self.assertIs(ps.top_ev(k)[0], eva)
+                        np.testing.assert_allclose(eva[:], ps.eva[:][:, -k:], atol=1e-12)
+                        # eigenvectors are unique up to their phase
+                        prod = np.einsum('fmk,fmk->fk', eve[:].conj(), ps.eve[:][:, :, -k:])
+                        np.testing.assert_allclose(abs(prod), 1, rtol=1e-8)
+                self.assertIs(ps.top_ev(NUMCHANNELS)[1], ps.eve)
+                ts.h5f.close()
+        finally:
+            config.global_caching = caching
+
+    def test_top_eigenvalues_subset(self):
+        """ test that the eigenpairs for a smaller k are taken from those
+        for a larger k and that cached eigenpairs are removed when the time
+        data grows"""
+        name = path.join(mkdtemp(), 'subset_time_data.h5')
+        write_data(name, data[:NUMSAMPLES])
+        caching = config.global_caching
+        try:
+            config.global_caching = 'all'
+            ts = TimeSamples(name=name)
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            (eva, eve) = ps.top_ev(3)
+            for k in (2, 1):
+                np.testing.assert_array_equal(ps.top_ev(k)[0], eva[:][:, -k:])
+                np.testing.assert_array_equal(ps.top_ev(k)[1], eve[:][:, :, -k:])
+            # also from the cache file in a new object
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            np.testing.assert_array_equal(ps.top_ev(2)[0], eva[:][:, -2:])
+            self.assertEqual(ps._cached_top_ev_k(), [3])
+            for k in (1, 2):
+                self.assertFalse(ps.h5f.is_cached(ps._top_ev_names(k)[2]))
+            ts.h5f.close()
+            d = ps.digest
+            write_data(name, data)
+            ts = TimeSamples(name=name)
+            ps = PowerSpectra(time_data=ts, block_size=128)
+            ps.csm
+            self.assertEqual(ps.digest, d)
+            self.assertEqual(ps._cached_top_ev_k(), [])
+            self.assertFalse(ps.h5f.is_cached(ps._top_ev_names(3)[2]))
+            ts.h5f.close()
+        finally:
+            config.global_caching = caching
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#pylint: disable-msg=E0611, E1101, C0103, R0901, R0902, R0903, R0904, W0232
+#------------------------------------------------------------------------------
+# Copyright (c) Acoular Development Team.
+#------------------------------------------------------------------------------
+"""Implements testing of steering vectors and the in-memory steering vector cache.
+"""
+
+import unittest
+
+import numpy as np
+#acoular imports
+import acoular
+acoular.config.global_caching = 'none' # to make sure that nothing is cached
+
+from acoular import MicGeom, RectGrid, SteeringVector
+from acoular.fastFuncs import calcTransfer
+from acoular.internal import LRUCache
+
+m = MicGeom()
+m.mpos_tot = ((0.5,0.5,0),(0,0,0),(-0.5,-0.5,0),(0.3,-0.2,0))
+g = RectGrid(x_min=-0.2, x_max=0.2, y_min=-0.2, y_max=0.2, z=0.5, increment=0.1)
+
+
+class Test_SteeringVector(unittest.TestCase):
+
+    def test_cached_transfer(self):
+        """ test that repeated calls return the same, correct transfer matrix"""
+        st = SteeringVector(grid=g, mics=m)
+        trans = st.transfer(1000.)
+        ref = calcTransfer(st.r0, st.rm, np.array(2*np.pi*1000./st.env.c))
+        np.testing.assert_allclose(trans, ref)
+        self.assertIs(st.transfer(1000.), trans)
+        self.assertFalse(trans.flags.writeable)
+        ind = np.array([1, 3, 5])
+        np.testing.assert_allclose(st.transfer(1000., ind), ref[ind])
+        np.testing.assert_allclose(st.transfer(1000., 2), ref[2][np.newaxis])
+
+    def test_cache_invalidation(self):
+        """ test that the cache is keyed by the digest of the steering vector"""
+        st = SteeringVector(grid=g, mics=m, steer_type='classic')
+        sv = st.steer_vector(2000.)
+        st.steer_type = 'true level'
+        sv2 = st.steer_vector(2000.)
+        self.assertIsNot(sv, sv2)
+        np.testing.assert_allclose(
+            sv2, SteeringVector(grid=g, mics=m).steer_vector(2000., np.arange(g.size)))
+
+    def test_cache_disabled(self):
+        """ test that a cache size of zero disables the in-memory cache"""
+        size = acoular.config.steer_cache_size
+        acoular.config.steer_cache_size = 0
+        try:
+            st = SteeringVector(grid=g, mics=m)
+            self.assertIsNot(st.transfer(3000.), st.transfer(3000.))
+        finally:
+            acoular.config.steer_cache_size = size
+
+    def test_lru_eviction(self):
+        """ test that least recently used arrays are discarded first"""
+        cache = LRUCache()
+        a, b, c = np.zeros(10), np.zeros(10), np.zeros(10)
+        cache.put('a', a, 160)
+        cache.put('b', b, 160)
+        cache.get('a')
+        cache.put('c', c, 160)
+        self.assertIs(cache.get('a'), a)
+        self.assertIsNone(cache.get('b'))
+        self.assertIs(cache.get('c'), c)
+        self.assertEqual(cache.nbytes, 160)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,8 +6,12 @@ from acoular import (
     WNoiseGenerator,
     PointSource,
     MicGeom,
+    TimeSamples,
+    Trigger,
+    AngleTracker,
     tools
 )
+from scipy.interpolate import splrep, splev
 
 config.global_caching = "none"
 
@@ -33,6 +37,63 @@ class TprocessTest(unittest.TestCase):
         for i in range(P1.numchannels):
             REF = np.convolve(np.squeeze(KERNEL), np.squeeze(SIG[:,i]))
             np.testing.assert_allclose(np.squeeze(RES[:,i]), REF, rtol=1e-5, atol=1e-8)
+    def test_angletracker(self):
+        """compare block-wise rpm and angle of AngleTracker with a spline 
+        fitted for every single sample"""
+        NSAMPLES = 3000
+        peaks = np.cumsum(200 + 10*np.sin(np.arange(16)))[:14].astype(int)
+        data = np.zeros((NSAMPLES, 1))
+        data[peaks] = 1.0
+        ts = TimeSamples(data=data, numsamples=NSAMPLES, numchannels=1, sample_freq=1000)
+        at = AngleTracker(source=ts, trigger=Trigger(source=ts, threshold=0.5))
+        peakloc = at.trigger.trigger_data[0]
+        np.testing.assert_array_equal(peakloc, peaks)
+        rpm = np.zeros(NSAMPLES)
+        angle = np.zeros(NSAMPLES)
+        ip = at.interp_points
+        for ind in range(NSAMPLES):
+            near = np.abs(peakloc - ind).argmin()
+            if ind < peakloc[ip]:
+                dist = peakloc[near+1] - peakloc[near]
+                x = peakloc[ind//dist:ind//dist+ip]
+            else:
+                dist = peakloc[near] - peakloc[near-1]
+                x = peakloc[ind//dist-ip:ind//dist]
+            spline = splrep(x, np.arange(ip), k=3)
+            rpm[ind] = splev(ind, spline, der=1)*60*1000
+            angle[ind] = (splev(ind, spline)*2*np.pi*at.rot_direction/at.trigger_per_revo) % (2*np.pi)
+        blocks = list(at.rpm_and_angle(256))
+        np.testing.assert_allclose(np.concatenate([b[0] for b in blocks]), rpm, rtol=1e-10)
+        np.testing.assert_allclose(np.concatenate([b[1] for b in blocks]), angle, rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(at.angle, angle, rtol=1e-10, atol=1e-12)
+
+    def test_trigger_indices(self):
+        """compare online merged trigger peaks with the pairwise deletion
+        of peaks within one hunk"""
+        NSAMPLES = 5000
+        data = np.zeros((NSAMPLES, 1))
+        peaks = np.arange(100, NSAMPLES-200, 300)
+        data[peaks] = 1.0
+        data[peaks[::3]+3] = 1.5
+        data[peaks[1::4]+20] = 0.8
+        ts = TimeSamples(data=data, numsamples=NSAMPLES, numchannels=1, sample_freq=1000)
+        for mode in ('extremum', 'first'):
+            with self.subTest(mode):
+                tr = Trigger(source=ts, threshold=0.5, multiple_peaks_in_hunk=mode)
+                loc = np.flatnonzero(data[:, 0] > 0.5)
+                val = data[loc, 0]
+                maxdist = np.diff(loc).max()
+                close = np.flatnonzero(np.diff(loc) < tr.hunk_length*maxdist)
+                while len(close) > 0:
+                    ind = [close[0], close[0]+1]
+                    dele = ind[np.argmin(val[ind])] if mode == 'extremum' else ind[1]
+                    loc, val = np.delete(loc, dele), np.delete(val, dele)
+                    close = np.flatnonzero(np.diff(loc) < tr.hunk_length*maxdist)
+                np.testing.assert_array_equal(list(tr.trigger_indices(256)), loc)
+                np.testing.assert_array_equal(tr.trigger_data[0], loc)
+                tr.max_peak_dist = int(maxdist)
+                np.testing.assert_array_equal(list(tr.trigger_indices(256)), loc)
+
 
 if __name__ == "__main__":
     unittest.main()
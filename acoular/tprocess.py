@@ -39,8 +39,8 @@
 # imports from other packages
 from numpy import array, empty, empty_like, pi, sin, sqrt, zeros, newaxis, unique, \
 int16, nan, concatenate, sum, float64, identity, argsort, interp, arange, append, \
-linspace, flatnonzero, argmin, argmax, delete, mean, inf, asarray, stack, sinc, exp, \
-polymul, arange, cumsum, ceil, split
+linspace, flatnonzero, argmax, mean, inf, asarray, stack, sinc, exp, \
+polymul, arange, cumsum, ceil, split, searchsorted, where, minimum, fromiter
 
 from numpy.linalg import norm
 from numpy.matlib import repmat
@@ -378,6 +378,12 @@ class Trigger(TimeInOut):
     #: Default is to 0.1.
     hunk_length = Float(0.1)
     
+    #: Maximum number of samples between adjacent peaks (maxOncePerRevDuration),
+    #: that defines the length of hunks. Default is 0, in which case it is 
+    #: determined in a separate pass over the trigger signal. If given, 
+    #: :meth:`trigger_indices` needs only a single pass (e.g. for live data).
+    max_peak_dist = Int(0)
+    
     #: Type of trigger.
     #:
     #: 'dirac': a single puls is assumed (sign of  
@@ -407,11 +413,13 @@ class Trigger(TimeInOut):
     #: 
     #: 3.: -minimum of number of samples between adjacent trigger samples
     trigger_data = Property(depends_on=['source.digest', 'threshold', 'max_variation_of_duration', \
-                                        'hunk_length', 'trigger_type', 'multiple_peaks_in_hunk'])
+                                        'hunk_length', 'trigger_type', 'multiple_peaks_in_hunk', \
+                                        'max_peak_dist'])
     
     # internal identifier
     digest = Property(depends_on=['source.digest', 'threshold', 'max_variation_of_duration', \
-                                        'hunk_length', 'trigger_type', 'multiple_peaks_in_hunk'])
+                                        'hunk_length', 'trigger_type', 'multiple_peaks_in_hunk', \
+                                        'max_peak_dist'])
     
     @cached_property
     def _get_digest( self ):
@@ -419,56 +427,91 @@ class Trigger(TimeInOut):
     
     @cached_property
     def _get_trigger_data(self):
-        self._check_trigger_existence()
-        triggerFunc = {'dirac' : self._trigger_dirac,
-                       'rect' : self._trigger_rect}[self.trigger_type]
         nSamples = 2048  # number samples for result-method of source
-        threshold = self._threshold(nSamples)
-        
-        # get all samples which surpasse the threshold
-        peakLoc = array([], dtype='int')  # all indices which surpasse the threshold
-        triggerData = array([])
-        x0 = []
-        dSamples = 0
-        for triggerSignal in self.source.result(nSamples):
-            localTrigger = flatnonzero(triggerFunc(x0, triggerSignal, threshold))
-            if not len(localTrigger) == 0:
-                peakLoc = append(peakLoc, localTrigger + dSamples)
-                triggerData = append(triggerData, triggerSignal[localTrigger])
-            dSamples += nSamples
-            x0 = triggerSignal[-1]
+        peakLoc = fromiter(self.trigger_indices(nSamples), dtype='int')
         if len(peakLoc) <= 1:
             raise Exception('Not enough trigger info. Check *threshold* sign and value!')
-
         peakDist = peakLoc[1:] - peakLoc[:-1]
-        maxPeakDist = max(peakDist)  # approximate distance between the revolutions
-        
-        # if there are hunks which contain multiple peaks -> check for each hunk, 
-        # which peak is the correct one -> delete the other one.
-        # if there are no multiple peaks in any hunk left -> leave the while 
-        # loop and continue with program
-        multiplePeaksWithinHunk = flatnonzero(peakDist < self.hunk_length * maxPeakDist)
-        while len(multiplePeaksWithinHunk) > 0:
-            peakLocHelp = multiplePeaksWithinHunk[0]
-            indHelp = [peakLocHelp, peakLocHelp + 1]
-            if self.multiple_peaks_in_hunk == 'extremum':
-                values = triggerData[indHelp]
-                deleteInd = indHelp[argmin(abs(values))]
-            elif self.multiple_peaks_in_hunk == 'first':
-                deleteInd = indHelp[1]
-            peakLoc = delete(peakLoc, deleteInd)
-            triggerData = delete(triggerData, deleteInd)
-            peakDist = peakLoc[1:] - peakLoc[:-1]
-            multiplePeaksWithinHunk = flatnonzero(peakDist < self.hunk_length * maxPeakDist)
         
         # check whether distances between peaks are evenly distributed
         meanDist = mean(peakDist)
         diffDist = abs(peakDist - meanDist)
         faultyInd = flatnonzero(diffDist > self.max_variation_of_duration * meanDist)
         if faultyInd.size != 0:
-            warn('In Trigger-Identification: The distances between the peaks (and therefor the lengths of the revolutions) vary too much (check samples %s).' % str(peakLoc[faultyInd] + self.source.start), Warning, stacklevel = 2)
+            warn('In Trigger-Identification: The distances between the peaks (and therefor the lengths of the revolutions) vary too much (check samples %s).' % str(peakLoc[faultyInd] + getattr(self.source, 'start', 0)), Warning, stacklevel = 2)
         return peakLoc, max(peakDist), min(peakDist)
     
+    def trigger_indices(self, num=2048):
+        """
+        Python generator that yields the sample indices of the trigger peaks 
+        one by one, as soon as they are confirmed.
+        
+        All samples which surpass the threshold are peaks. If there are 
+        multiple peaks within one hunk, only one of them is kept (see 
+        :attr:`multiple_peaks_in_hunk`). The peaks are merged online: a peak 
+        is yielded as soon as the next peak outside of its hunk is found.
+        Unless :attr:`threshold` and :attr:`max_peak_dist` are given, the 
+        trigger signal is scanned once beforehand to estimate them.
+        
+        Parameters
+        ----------
+        num : integer, defaults to 2048
+            Number of samples per block fetched from :attr:`source`.
+        
+        Returns
+        -------
+        Sample indices of the trigger peaks.
+        """
+        self._check_trigger_existence()
+        threshold = self._threshold(num)
+        maxPeakDist = self.max_peak_dist or self._max_peak_dist(num, threshold)
+        lenHunk = self.hunk_length * maxPeakDist
+        extremum = self.multiple_peaks_in_hunk == 'extremum'
+        peak = None # current peak (location, value), not yet confirmed
+        for peakLoc, triggerData in self._peaks(num, threshold):
+            for loc, value in zip(peakLoc, triggerData):
+                if peak is None:
+                    peak = (loc, value)
+                elif loc - peak[0] < lenHunk:
+                    # multiple peaks in hunk, keep the extremal or the first one
+                    if extremum and abs(value) >= abs(peak[1]):
+                        peak = (loc, value)
+                else:
+                    yield peak[0]
+                    peak = (loc, value)
+        if peak is not None:
+            yield peak[0]
+    
+    def _peaks(self, num, threshold):
+        # generator that yields the locations and values of all samples 
+        # which surpass the threshold block-wise
+        triggerFunc = {'dirac' : self._trigger_dirac,
+                       'rect' : self._trigger_rect}[self.trigger_type]
+        x0 = []
+        dSamples = 0
+        for triggerSignal in self.source.result(num):
+            localTrigger = flatnonzero(triggerFunc(x0, triggerSignal, threshold))
+            yield localTrigger + dSamples, triggerSignal[localTrigger].ravel()
+            dSamples += num
+            x0 = triggerSignal[-1]
+    
+    def _max_peak_dist(self, num, threshold):
+        # maximum number of samples between adjacent samples which surpass
+        # the threshold, approximate distance between the revolutions
+        lastLoc = None
+        maxPeakDist = 0
+        for peakLoc, triggerData in self._peaks(num, threshold):
+            if len(peakLoc) == 0:
+                continue
+            if lastLoc is not None:
+                maxPeakDist = max(maxPeakDist, peakLoc[0] - lastLoc)
+            if len(peakLoc) > 1:
+                maxPeakDist = max(maxPeakDist, (peakLoc[1:] - peakLoc[:-1]).max())
+            lastLoc = peakLoc[-1]
+        if maxPeakDist == 0:
+            raise Exception('Not enough trigger info. Check *threshold* sign and value!')
+        return maxPeakDist
+
     def _trigger_dirac(self, x0, x, threshold):
         # x0 not needed here, but needed in _trigger_rect
         return self._trigger_value_comp(x, threshold)
@@ -522,6 +565,8 @@ class AngleTracker(MaskedTimeInOut):
     using spline interpolation in the time domain. 
     
     Gets samples from :attr:`trigger` and stores the angle and rpm samples in :meth:`angle` and :meth:`rpm`.
+    Alternatively, the generator :meth:`rpm_and_angle` yields rpm and angle
+    block-wise without storing them for all samples.
 
     '''
 
@@ -589,44 +634,81 @@ class AngleTracker(MaskedTimeInOut):
         idx = (abs(peakarray - value)).argmin()
         return idx
     
-    def _to_rpm_and_angle(self):
+    def rpm_and_angle(self, num=128):
         """ 
-        Internal helper function 
-        Calculates angles in radians for one or more instants in time.
+        Python generator that yields rpm and rotation angle in radians 
+        block-wise.
+        
+        For every sample, a spline through :attr:`interp_points` adjacent 
+        trigger positions is evaluated. Each spline is fitted only once and 
+        evaluated for all samples of the block that use it in one call, so 
+        that there is no need to store rpm and angle for all samples.
         
         Current version supports only trigger and sources with the same samplefreq. 
         This behaviour may change in future releases 
+        
+        Parameters
+        ----------
+        num : integer
+            This parameter defines the size of the blocks to be yielded
+            (i.e. the number of samples per block).
+        
+        Returns
+        -------
+        Tuples (rpm, angle) of arrays of shape (num,). 
+            The last block may be shorter than num.
         """
-
-        #init
-        ind=0
         #trigger data
-        peakloc,maxdist,mindist= self.trigger._get_trigger_data()
+        peakloc = self.trigger.trigger_data[0]
         TriggerPerRevo= self.trigger_per_revo
         rotDirection = self.rot_direction
         nSamples =  self.source.numsamples
         samplerate =  self.source.sample_freq
-        self._rpm = zeros(nSamples)
-        self._angle = zeros(nSamples)
         #number of spline points
         InterpPoints=self.interp_points
-        
-        #loop over alle timesamples
-        while ind < nSamples :     
-            #when starting spline forward
-            if ind<peakloc[InterpPoints]:
-                peakdist=peakloc[self._find_nearest_idx(peakarray= peakloc,value=ind)+1] - peakloc[self._find_nearest_idx(peakarray= peakloc,value=ind)]
-                splineData = stack((range(InterpPoints), peakloc[ind//peakdist:ind//peakdist+InterpPoints]), axis=0)
-            #spline backwards    
-            else:
-                peakdist=peakloc[self._find_nearest_idx(peakarray= peakloc,value=ind)] - peakloc[self._find_nearest_idx(peakarray= peakloc,value=ind)-1]
-                splineData = stack((range(InterpPoints), peakloc[ind//peakdist-InterpPoints:ind//peakdist]), axis=0)
-            #calc angles and rpm    
-            Spline = splrep(splineData[:,:][1], splineData[:,:][0], k=3)    
-            self._rpm[ind]=splev(ind, Spline, der=1, ext=0)*60*samplerate
-            self._angle[ind] = (splev(ind, Spline, der=0, ext=0)*2*pi*rotDirection/TriggerPerRevo + self.start_angle) % (2*pi)
-            #next sample
-            ind+=1
+        # splines fitted for the last block, indexed by the slices of peakloc
+        splines = {}
+        for start in range(0, nSamples, num):
+            ind = arange(start, min(start+num, nSamples))
+            # index of the nearest trigger position for each sample
+            i = minimum(searchsorted(peakloc, ind), len(peakloc)-1)
+            i[i==0] = 1
+            nearest = where(ind-peakloc[i-1] <= peakloc[i]-ind, i-1, i)
+            #when starting spline forward, else spline backwards
+            forward = ind < peakloc[InterpPoints]
+            peakdist = where(forward, 
+                             peakloc[minimum(nearest+1, len(peakloc)-1)] - peakloc[nearest],
+                             peakloc[nearest] - peakloc[nearest-1])
+            first = ind // peakdist - where(forward, 0, InterpPoints)
+            rpm = empty(len(ind))
+            angle = empty(len(ind))
+            blocksplines = {}
+            for j in unique(first):
+                j = int(j)
+                Spline = splines.get(j)
+                if Spline is None:
+                    Spline = splrep(peakloc[j:j+InterpPoints], arange(InterpPoints), k=3)
+                blocksplines[j] = Spline
+                #calc angles and rpm    
+                mask = first == j
+                rpm[mask] = splev(ind[mask], Spline, der=1, ext=0)*60*samplerate
+                angle[mask] = (splev(ind[mask], Spline, der=0, ext=0)*2*pi*rotDirection/TriggerPerRevo + self.start_angle) % (2*pi)
+            splines = blocksplines
+            yield rpm, angle
+
+    def _to_rpm_and_angle(self):
+        """ 
+        Internal helper function 
+        Calculates rpm and angles in radians for all samples.
+        """
+        nSamples =  self.source.numsamples
+        self._rpm = zeros(nSamples)
+        self._angle = zeros(nSamples)
+        ind = 0
+        for rpm, angle in self.rpm_and_angle(4096):
+            self._rpm[ind:ind+len(rpm)] = rpm
+            self._angle[ind:ind+len(angle)] = angle
+            ind += len(rpm)
         #calculation complete    
         self._calc_flag = True
     
@@ -1168,15 +1250,11 @@ class SpatialInterpolatorRotation(SpatialInterpolator):
         """
         #period for rotation
         period = 2 * pi
-        #get angle
-        angle = self.angle_source._get_angle()
-        #counter to track angle position in time for each block
-        count=0
-        for timeData in self.source.result(num):
-            phiDelay = angle[count:count+num]
+        #angle is streamed block-wise along with the time data
+        for timeData, (rpm, phiDelay) in zip(self.source.result(num), 
+                                             self.angle_source.rpm_and_angle(num)):
             interpVal = self._result_core_func(timeData, phiDelay, period, self.Q, interp_at_zero = False)
             yield interpVal
-            count += num    
 
 class SpatialInterpolatorConstantRotation(SpatialInterpolator):
     """